@@ -1,13 +1,9 @@
 import logging
 import os
-import threading
 import time
 from datetime import date, datetime
 
-import django
-
 import pandas as pd
-import requests
 import streamlit as st
 
 # Configuração da página (DEVE SER A PRIMEIRA COISA NO SCRIPT)
@@ -40,29 +36,24 @@ if not os.environ.get("SGR_DOCKER_DEPLOY") and st.secrets.load_if_toml_exists():
     except Exception:
         pass  # Em ambiente local, usa variáveis já definidas no ambiente
 
-# Configurar Django
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
-django.setup()
+# Configurar Django e os serviços do processo (apenas na primeira execução;
+# as demais sessões e reexecuções reaproveitam o mesmo runtime)
+from core.runtime import runtime
+
+runtime.start()
 
+# Os módulos de relatório são importados na primeira seleção no menu
+# (core.module_registry), não a cada início do app
 from apps.auth.modules import menu
 from apps.auth.views import login_screen
-from apps.boletos.views import main as boletos_main
-from apps.clientes.views import main as clientes_main
-from apps.comex.views import main as comex_main
-from apps.estoque.views import main as estoque_main
-from apps.extratos.views import main as extratos_main
-from apps.sac.views import main as sac_main
-from apps.vendas.pedidos import main as pedidos_main
-from apps.vendas.recebimentos import main as recebimentos_main
-from apps.vendas.views import main as vendas_main
-
-# Importações após a configuração da página
-from service import DataService as AppDataService
-from service import UserService
+from core.jobs import job_manager, release_connections
+from core.module_registry import module_registry
+from core.session_data import session_data
+from infrastructure.export.excel import export_excel
+from presentation.components.downloads import lazy_download_button
 
 # Importações da aplicação de vendas refatorada
 try:
-    from core.container_vendas import DIContainer
     from core.exceptions import BusinessLogicError, SGRException, ValidationError
     from domain.services.vendas_service import VendasService
     from presentation.components.data_grid_simple import DataGrid
@@ -73,59 +64,21 @@ try:
         ValidationHelper,
     )
     from presentation.styles.theme_simple import apply_theme
+    from utils.numeric import converter_colunas_numericas
 
     VENDAS_REFATORADO_AVAILABLE = True
 except ImportError as e:
     VENDAS_REFATORADO_AVAILABLE = False
 
-# Instanciar DataService e UserService
-data_service = (
-    AppDataService()
-)  # Renomeado para evitar conflito com o DataService de vendas
-user_service = UserService(data_service)
+# Serviços compartilhados pelo processo (core.runtime)
+data_service = runtime.data_service
+user_service = runtime.user_service
 
-# Instanciar serviços de vendas
 if VENDAS_REFATORADO_AVAILABLE:
-    container = DIContainer()
-    vendas_service = container.get_vendas_service()
+    vendas_service = runtime.vendas_service
     logger = logging.getLogger(__name__)
 
 
-# Função para fazer requisições periódicas (keep-alive) - REMOVIDO PROBLEMA DE SCRIPT CONTEXT
-def keep_alive():
-    """
-    Keep-alive em background sem problemas de ScriptRunContext
-    Usa apenas requests, sem interação com Streamlit
-    """
-    import logging
-    import time
-
-    import requests
-
-    # Configurar logger específico para keep-alive
-    keep_alive_logger = logging.getLogger("keep_alive")
-    keep_alive_logger.setLevel(logging.INFO)
-
-    while True:
-        try:
-            # Fazer requisição silenciosa apenas para manter vivo
-            # Não usar st.write aqui para evitar ScriptRunContext warnings
-            response = requests.get("https://oficialsport.streamlit.app/", timeout=10)
-            keep_alive_logger.info(
-                f"Keep-alive enviado - Status: {response.status_code}"
-            )
-        except Exception as e:
-            keep_alive_logger.warning(f"Erro no keep-alive: {e}")
-        time.sleep(300)  # 5 minutos
-
-
-# Verificar se deve inicializar keep-alive (apenas uma vez por sessão)
-if "keep_alive_started" not in st.session_state:
-    thread = threading.Thread(target=keep_alive, daemon=True)
-    thread.start()
-    st.session_state["keep_alive_started"] = True
-
-
 def _show_manual_dialog():
     """
     Exibe o manual em uma janela de diálogo
@@ -245,11 +198,17 @@ def vendas_dashboard():
 
         st.markdown("---")
 
+        # Informações de atualização no topo, preenchidas após a carga abaixo
+        area_atualizacao = st.container()
+
         # Renderizar seções
-        _render_update_info()
-        _render_filters_and_metrics()
+        _render_filters()
+        dados = _load_dashboard_data()
+        with area_atualizacao:
+            _render_update_info(dados)
+        _render_metrics(dados)
         _render_download_section()
-        _render_charts()
+        _render_charts(dados)
         _render_data_grid()
         _render_produtos_detalhados()
 
@@ -261,12 +220,87 @@ def vendas_dashboard():
         st.error("Erro inesperado na aplicação. Verifique os logs.")
 
 
-def _render_update_info():
+def _load_dashboard_data():
+    """
+    Executa em paralelo as consultas independentes do dashboard
+
+    Chamado depois dos filtros (os produtos dependem das vendas filtradas).
+    Cada consulta usa a própria conexão do pool; a página espera apenas pela
+    mais lenta.
+
+    Returns:
+        JobResults: Resultado de cada consulta; o erro de uma consulta é
+            levantado por result() no painel que a usa
+    """
+    consultas = {"informacoes": vendas_service.get_informacoes_atualizacao}
+
+    df_vendas = session_data.get("df_vendas")
+    if df_vendas is not None and not df_vendas.empty:
+        from dateutil.relativedelta import relativedelta
+
+        hoje = datetime.now()
+        inicio_mes = datetime(hoje.year, hoje.month, 1).date()
+
+        # Filtros aplicados (mês atual quando não há filtro de data)
+        data_inicio = st.session_state.get("data_inicio_filtro")
+        data_fim = st.session_state.get("data_fim_filtro")
+        vendedores = st.session_state.get("vendedores_filtro")
+        situacoes = st.session_state.get("situacoes_filtro")
+        periodo_inicio = data_inicio if data_inicio and data_fim else inicio_mes
+        periodo_fim = data_fim if data_inicio and data_fim else hoje.date()
+
+        # IDs das vendas já filtradas (mais eficiente que repetir os filtros)
+        venda_ids = None
+        if "ID_Gestao" in df_vendas.columns:
+            venda_ids = df_vendas["ID_Gestao"].tolist() or None
+
+        consultas.update(
+            {
+                "meta": vendas_service.get_meta_vendas,
+                # Uma query para o gauge de meta (sempre o mês atual, sem as
+                # vendas canceladas) e para os cards de vendedores (mesmo
+                # período filtrado no ano anterior, sem excluir situações)
+                "totais": lambda: vendas_service.get_totais_vendedor_por_periodos(
+                    {
+                        "mes": (inicio_mes, hoje.date()),
+                        "anterior": (
+                            periodo_inicio - relativedelta(years=1),
+                            periodo_fim - relativedelta(years=1),
+                        ),
+                    },
+                    situacoes_excluir=[
+                        "Cancelada (sem financeiro)",
+                        "Não considerar - Excluidos",
+                    ],
+                    excluir_em=["mes"],
+                ),
+                "vendedores_nome_curto": (
+                    vendas_service.venda_repository.get_vendedores_com_nome_curto
+                ),
+                "ranking_produtos": lambda: _get_ranking_produtos(
+                    data_inicio=data_inicio,
+                    data_fim=data_fim,
+                    vendedores=vendedores,
+                    situacoes=situacoes,
+                    venda_ids=venda_ids,
+                    top_n=10,
+                ),
+            }
+        )
+        if venda_ids:
+            consultas["produtos"] = lambda: vendas_service.get_produtos_detalhados(
+                venda_ids=venda_ids
+            )
+
+    return job_manager.gather(consultas, prefix="vendas_dashboard:")
+
+
+def _render_update_info(dados):
     """Renderiza informações de atualização"""
     st.subheader("🔄 Informações de Atualização")
 
     try:
-        info = vendas_service.get_informacoes_atualizacao()
+        info = dados.result("informacoes")
 
         with st.expander("Dados da Última Sincronização", expanded=True):
             col1, col2, col3, col4, col5 = st.columns(5)
@@ -533,15 +567,12 @@ def _render_metrics_cards(metrics):
         )
 
 
-def _render_metrics_produtos():
+def _render_metrics_produtos(dados):
     """Renderiza métricas de produtos (Equipamentos vs Acessórios) em cards - baseado em valor proporcional"""
     try:
         # Verificar se há dados de vendas
-        if "df_vendas" not in st.session_state or st.session_state["df_vendas"] is None:
-            return
-
-        df_vendas = st.session_state["df_vendas"]
-        if df_vendas.empty:
+        df_vendas = session_data.get("df_vendas")
+        if df_vendas is None or df_vendas.empty:
             return
 
         # Obter IDs das vendas filtradas
@@ -549,10 +580,8 @@ def _render_metrics_produtos():
             logger.warning("Campo ID_Gestao não encontrado no dataframe de vendas")
             return
 
-        venda_ids = df_vendas["ID_Gestao"].tolist()
-
-        # Buscar produtos detalhados (para calcular proporção por venda)
-        df_produtos = vendas_service.get_produtos_detalhados(venda_ids=venda_ids)
+        # Produtos detalhados (para calcular proporção por venda)
+        df_produtos = dados.result("produtos")
 
         if df_produtos.empty or "NomeGrupo" not in df_produtos.columns:
             logger.warning(
@@ -565,57 +594,12 @@ def _render_metrics_produtos():
             logger.warning("Campo Venda_ID não encontrado no dataframe de produtos")
             return
 
-        # Criar dicionário com ValorTotal de cada venda
-        vendas_dict = df_vendas.set_index("ID_Gestao")["ValorTotal"].to_dict()
-
-        # Classificar produtos por tipo
-        grupos_acessorios = ["PEÇA DE REPOSIÇÃO", "ACESSÓRIOS"]
-        df_produtos["Tipo"] = df_produtos["NomeGrupo"].apply(
-            lambda x: "Acessório" if x and x in grupos_acessorios else "Equipamento"
-        )
-
-        # Garantir que ValorTotal seja numérico
-        df_produtos["ValorTotal"] = pd.to_numeric(
-            df_produtos["ValorTotal"], errors="coerce"
-        ).fillna(0)
-
-        # Para cada produto, calcular sua proporção dentro da venda e aplicar ao ValorTotal da venda
-        def calcular_valor_proporcional(row):
-            """Calcula valor proporcional do produto baseado no ValorTotal da venda"""
-            venda_id = row["Venda_ID"]
-            valor_produto = row["ValorTotal"]
-
-            # Obter ValorTotal da venda
-            valor_venda = vendas_dict.get(venda_id, 0)
-
-            if valor_venda == 0:
-                return 0
-
-            # Calcular soma de produtos desta venda
-            produtos_venda = df_produtos[df_produtos["Venda_ID"] == venda_id]
-            soma_produtos = produtos_venda["ValorTotal"].sum()
-
-            if soma_produtos == 0:
-                return 0
-
-            # Calcular proporção e aplicar ao valor real da venda
-            proporcao = valor_produto / soma_produtos
-            valor_proporcional = valor_venda * proporcao
-
-            return valor_proporcional
-
-        # Aplicar cálculo proporcional
-        df_produtos["ValorProporcional"] = df_produtos.apply(
-            calcular_valor_proporcional, axis=1
+        # Calcular valores proporcionais por tipo (rateio vetorizado por venda)
+        valores_por_tipo = vendas_service.get_valores_por_tipo_produto(
+            df_produtos, df_vendas
         )
-
-        # Calcular totais por tipo usando valores proporcionais
-        valor_equipamentos = df_produtos[df_produtos["Tipo"] == "Equipamento"][
-            "ValorProporcional"
-        ].sum()
-        valor_acessorios = df_produtos[df_produtos["Tipo"] == "Acessório"][
-            "ValorProporcional"
-        ].sum()
+        valor_equipamentos = valores_por_tipo["Equipamento"]
+        valor_acessorios = valores_por_tipo["Acessório"]
         valor_total = valor_equipamentos + valor_acessorios
 
         # Evitar divisão por zero
@@ -709,39 +693,23 @@ def _render_metrics_produtos():
         # Não exibir erro para o usuário, apenas não mostrar as métricas
 
 
-def _render_gauge_meta():
+def _render_gauge_meta(dados):
     """Renderiza gauge de meta de vendas do mês atual - Estilo circular com tons de azul"""
     try:
         import plotly.graph_objects as go
 
         # Obter meta configurada
-        meta = vendas_service.get_meta_vendas()
+        meta = dados.result("meta")
 
         if not meta or meta <= 0:
             # Meta não configurada, não exibir gauge
             return
 
-        # Obter vendas do mês atual (sempre, independente dos filtros aplicados)
-        hoje = datetime.now()
-        data_inicial = datetime(hoje.year, hoje.month, 1).date()
-        data_final = hoje.date()
-
-        df_mes_atual = vendas_service.venda_repository.get_vendas_filtradas(
-            data_inicial=data_inicial,
-            data_final=data_final,
-            situacoes_excluir=[
-                'Cancelada (sem financeiro)',
-                'Não considerar - Excluidos',
-            ],
-        )
-
-        # Processar dados
-        df_mes_atual = vendas_service._processar_dados_vendas(df_mes_atual)
+        # Vendas do mês atual (sempre, independente dos filtros aplicados)
+        totais_mes = dados.result("totais")["mes"]
 
         # Calcular valor total do mês
-        valor_total_mes = (
-            df_mes_atual["ValorTotal"].sum() if not df_mes_atual.empty else 0
-        )
+        valor_total_mes = sum(totais_mes.values())
 
         # Calcular percentual atingido
         percentual = (valor_total_mes / meta * 100) if meta > 0 else 0
@@ -886,143 +854,12 @@ def _render_gauge_meta():
         # Não exibir erro para o usuário, apenas não mostrar o gauge
 
 
-def _calcular_vendas_periodo_anterior(data_inicio, data_fim, vendedores_nomes):
-    """
-    Calcula as vendas de cada vendedor no mesmo período do ano anterior
-
-    Args:
-        data_inicio: Data inicial do período atual
-        data_fim: Data final do período atual
-        vendedores_nomes: Lista de nomes dos vendedores
-
-    Returns:
-        dict: Dicionário com vendas do período anterior por vendedor
-    """
-    try:
-        from datetime import timedelta
-
-        from dateutil.relativedelta import relativedelta
-
-        # Calcular período anterior (mesmo período do ano anterior)
-        data_inicio_anterior = data_inicio - relativedelta(years=1)
-        data_fim_anterior = data_fim - relativedelta(years=1)
-
-        # Buscar vendas do período anterior
-        df_periodo_anterior = vendas_service.venda_repository.get_vendas_filtradas(
-            data_inicial=data_inicio_anterior,
-            data_final=data_fim_anterior,
-        )
-
-        if df_periodo_anterior.empty:
-            return {}
-
-        # Processar dados
-        df_periodo_anterior = vendas_service._processar_dados_vendas(
-            df_periodo_anterior
-        )
-
-        # Agrupar por vendedor
-        vendas_anteriores = {}
-        if (
-            not df_periodo_anterior.empty
-            and "VendedorNome" in df_periodo_anterior.columns
-        ):
-            df_agrupado = (
-                df_periodo_anterior.groupby("VendedorNome")["ValorTotal"]
-                .sum()
-                .reset_index()
-            )
-            for _, row in df_agrupado.iterrows():
-                vendas_anteriores[row["VendedorNome"]] = float(row["ValorTotal"])
-
-        return vendas_anteriores
-
-    except Exception as e:
-        logger.error(f"Erro ao calcular vendas do período anterior: {str(e)}")
-        return {}
-
-
-def _calcular_vendas_mes_atual_para_gauge(vendedores_nomes):
-    """
-    Calcula as vendas do mês atual (sempre) para os gauges
-
-    Realizado: 01 do mês atual até hoje
-    Meta: 01 do mesmo mês do ano anterior até o mesmo dia
-
-    Args:
-        vendedores_nomes: Lista de nomes dos vendedores
-
-    Returns:
-        tuple: (dict realizado, dict meta) com vendas por vendedor
-    """
-    try:
-        from datetime import datetime
-
-        from dateutil.relativedelta import relativedelta
-
-        # Sempre usar mês atual
-        hoje = datetime.now()
-        data_inicio_atual = datetime(hoje.year, hoje.month, 1).date()
-        data_fim_atual = hoje.date()
-
-        # Calcular mesmo período do ano anterior
-        data_inicio_anterior = data_inicio_atual - relativedelta(years=1)
-        data_fim_anterior = data_fim_atual - relativedelta(years=1)
-
-        # Buscar vendas do período atual (realizado)
-        df_periodo_atual = vendas_service.venda_repository.get_vendas_filtradas(
-            data_inicial=data_inicio_atual,
-            data_final=data_fim_atual,
-        )
-
-        # Buscar vendas do período anterior (meta)
-        df_periodo_anterior = vendas_service.venda_repository.get_vendas_filtradas(
-            data_inicial=data_inicio_anterior,
-            data_final=data_fim_anterior,
-        )
-
-        # Processar realizado
-        vendas_realizadas = {}
-        if not df_periodo_atual.empty:
-            df_periodo_atual = vendas_service._processar_dados_vendas(df_periodo_atual)
-            if "VendedorNome" in df_periodo_atual.columns:
-                df_agrupado = (
-                    df_periodo_atual.groupby("VendedorNome")["ValorTotal"]
-                    .sum()
-                    .reset_index()
-                )
-                for _, row in df_agrupado.iterrows():
-                    vendas_realizadas[row["VendedorNome"]] = float(row["ValorTotal"])
-
-        # Processar meta (período anterior)
-        vendas_meta = {}
-        if not df_periodo_anterior.empty:
-            df_periodo_anterior = vendas_service._processar_dados_vendas(
-                df_periodo_anterior
-            )
-            if "VendedorNome" in df_periodo_anterior.columns:
-                df_agrupado = (
-                    df_periodo_anterior.groupby("VendedorNome")["ValorTotal"]
-                    .sum()
-                    .reset_index()
-                )
-                for _, row in df_agrupado.iterrows():
-                    vendas_meta[row["VendedorNome"]] = float(row["ValorTotal"])
-
-        return vendas_realizadas, vendas_meta
-
-    except Exception as e:
-        logger.error(f"Erro ao calcular vendas do mês atual para gauge: {str(e)}")
-        return {}, {}
-
-
-def _render_vendedores_com_fotos(vendas_por_vendedor):
+def _render_vendedores_com_fotos(vendas_por_vendedor, dados):
     """Renderiza todos os vendedores da tabela com suas fotos em cards 6x2"""
     import base64
     import os
     from io import BytesIO
 
-    import pandas as pd
     from PIL import Image
 
     # Lista completa de vendedores da tabela Vendedores (ordem das fotos)
@@ -1042,7 +879,7 @@ def _render_vendedores_com_fotos(vendas_por_vendedor):
     ]
 
     # Buscar nomes curtos e percentuais do banco de dados
-    dados_vendedores = vendas_service.venda_repository.get_vendedores_com_nome_curto()
+    dados_vendedores = dados.result("vendedores_nome_curto")
 
     # Obter datas do filtro aplicado (ou calcular mês atual)
     from dateutil.relativedelta import relativedelta
@@ -1058,16 +895,17 @@ def _render_vendedores_com_fotos(vendas_por_vendedor):
     # Calcular ano anterior para exibição
     ano_anterior = (data_inicio - relativedelta(years=1)).year
 
-    # Calcular vendas do mesmo período no ano anterior
-    vendedores_nomes = [v["nome"] for v in vendedores_tabela]
-    vendas_anteriores = _calcular_vendas_periodo_anterior(
-        data_inicio, data_fim, vendedores_nomes
-    )
+    # Vendas do mesmo período no ano anterior
+    try:
+        vendas_anteriores = dados.result("totais")["anterior"]
+    except Exception as e:
+        logger.error(f"Erro ao calcular vendas do período anterior: {str(e)}")
+        vendas_anteriores = {}
 
     # Criar dicionário de vendas de TODOS os vendedores (sem limite top_n)
     # Usa df_vendas completo da session_state para não perder vendedores fora do top 10
     vendas_dict = {}
-    df_vendas_completo = st.session_state.get("df_vendas", pd.DataFrame())
+    df_vendas_completo = session_data.get("df_vendas")
 
     if (
         df_vendas_completo is not None
@@ -1075,13 +913,12 @@ def _render_vendedores_com_fotos(vendas_por_vendedor):
         and "VendedorNome" in df_vendas_completo.columns
         and "ValorTotal" in df_vendas_completo.columns
     ):
-        df_agrupado = (
-            df_vendas_completo.groupby("VendedorNome")["ValorTotal"].sum().reset_index()
-        )
-        for _, row in df_agrupado.iterrows():
-            vendas_dict[row["VendedorNome"]] = {
-                "total_valor": float(row["ValorTotal"]),
-            }
+        totais = df_vendas_completo.groupby("VendedorNome", observed=True)[
+            "ValorTotal"
+        ].sum()
+        vendas_dict = {
+            nome: {"total_valor": float(valor)} for nome, valor in totais.items()
+        }
     elif vendas_por_vendedor is not None and not vendas_por_vendedor.empty:
         # Fallback: usar vendas_por_vendedor se df_vendas não estiver disponível
         for _, row in vendas_por_vendedor.iterrows():
@@ -1332,12 +1169,12 @@ def _render_card_vendedor(col, vendedor, get_image_base64, format_currency):
         )
 
 
-def _render_filters_and_metrics():
-    """Renderiza filtros e métricas"""
+def _render_filters():
+    """Renderiza filtros e carrega/filtra as vendas da sessão"""
     st.subheader("🔍 Filtros")
 
     # Inicializar dados do mês atual no primeiro carregamento
-    if "df_vendas" not in st.session_state or st.session_state["df_vendas"] is None:
+    if not session_data.has("df_vendas"):
         _load_initial_data()
 
     # Filtros — widgets dentro do expander, botões fora (sempre visíveis)
@@ -1383,13 +1220,38 @@ def _render_filters_and_metrics():
 
     st.markdown("---")
 
+
+def _excel_vendas_builder(df: pd.DataFrame):
+    """
+    Função que gera o Excel de vendas lendo o banco em blocos
+
+    Os filtros são capturados agora: o builder roda em uma thread de
+    core.jobs, sem acesso ao st.session_state. O arquivo reflete o banco no
+    momento da geração. Sem filtros registrados, exporta o DataFrame da
+    sessão.
+
+    Args:
+        df: Vendas exibidas (usadas se não houver filtros registrados)
+
+    Returns:
+        Callable: Builder para lazy_download_button
+    """
+    filtros = st.session_state.get("vendas_filtros_export")
+    if not filtros:
+        return lambda: export_excel(df, sheet_name="Vendas")
+    filtros = dict(filtros)
+    return lambda: export_excel(
+        vendas_service.iter_vendas_filtradas(**filtros), sheet_name="Vendas"
+    )
+
+
+def _render_metrics(dados):
+    """Renderiza gauge de meta, métricas e botões de exportação"""
     # Renderizar métricas se houver dados
-    if (
-        st.session_state.get("df_vendas") is not None
-        and not st.session_state["df_vendas"].empty
-    ):
+    df_vendas = session_data.get("df_vendas")
+    if df_vendas is not None and not df_vendas.empty:
         # Renderizar gauge de meta PRIMEIRO (sempre com dados do mês atual)
-        _render_gauge_meta()
+        _render_gauge_meta(dados)
 
         # Espaçamento entre Meta de Vendas e Métricas de Vendas
         st.markdown("<br><br>", unsafe_allow_html=True)
@@ -1403,24 +1265,14 @@ def _render_filters_and_metrics():
                 st.subheader("💎 Métricas de Vendas")
 
             with col_excel:
-                df_vendas = st.session_state.get("df_vendas", pd.DataFrame())
                 if not df_vendas.empty:
-                    # Preparar dados para exportação (respeitando filtros aplicados)
-                    df_export = df_vendas.copy()
-
-                    # Formatar dados para exportação Excel
-                    from io import BytesIO
-
-                    buffer_excel = BytesIO()
-                    with pd.ExcelWriter(buffer_excel, engine="openpyxl") as writer:
-                        df_export.to_excel(writer, index=False, sheet_name="Vendas")
-
-                    st.download_button(
+                    # Exportação respeitando os filtros aplicados (gerada ao clicar)
+                    lazy_download_button(
                         label="📊 Exportar Excel",
-                        data=buffer_excel.getvalue(),
+                        name="vendas_excel",
+                        df=df_vendas,
+                        builder=_excel_vendas_builder(df_vendas),
                         file_name=f"vendas_filtradas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        use_container_width=True,
                         key="export_excel_metrics",
                     )
                 else:
@@ -1434,7 +1286,7 @@ def _render_filters_and_metrics():
             with col_csv:
                 if not df_vendas.empty:
                     # Converter para CSV
-                    csv_data = df_export.to_csv(index=False)
+                    csv_data = df_vendas.to_csv(index=False)
 
                     st.download_button(
                         label="📄 Exportar CSV",
@@ -1456,7 +1308,7 @@ def _render_filters_and_metrics():
         _render_metrics_cards(st.session_state.get("metricas", {}))
 
         # Renderizar métricas de produtos (Equipamentos vs Acessórios)
-        _render_metrics_produtos()
+        _render_metrics_produtos(dados)
 
 
 def _load_initial_data():
@@ -1472,10 +1324,22 @@ def _load_initial_data():
         metricas = vendas_service.get_metricas_vendas(df_vendas)
         LoadingHelper.hide_loading(loading)
 
-        # Armazenar dados na sessão para uso posterior
-        st.session_state["df_vendas"] = df_vendas
+        # Armazenar dados na sessão para uso posterior (recarregável via cache)
+        session_data.put(
+            "df_vendas",
+            df_vendas,
+            module="vendas",
+            loader=vendas_service.get_vendas_mes_atual,
+        )
         st.session_state["metricas"] = metricas
 
+        # Exportação lê o mês atual direto do banco, em blocos
+        hoje = datetime.now()
+        st.session_state["vendas_filtros_export"] = dict(
+            data_inicio=datetime(hoje.year, hoje.month, 1).date(),
+            data_fim=hoje.date(),
+        )
+
         # Limpar filtros na sessão (dados do mês atual)
         # Mês atual sem filtro de situação (todas as situações)
         st.session_state["data_inicio_filtro"] = None
@@ -1488,7 +1352,7 @@ def _load_initial_data():
 
     except Exception as e:
         ValidationHelper.show_error(f"Erro ao carregar dados iniciais: {str(e)}")
-        st.session_state["df_vendas"] = pd.DataFrame()
+        session_data.put("df_vendas", pd.DataFrame(), module="vendas")
         st.session_state["metricas"] = {}
 
 
@@ -1518,13 +1382,14 @@ def _apply_filters(filters):
             # Obter dados filtrados
             loading = LoadingHelper.show_loading("Carregando dados de vendas...")
             logger.info("Chamando vendas_service.get_vendas_filtradas...")
-            df_vendas = vendas_service.get_vendas_filtradas(
+            filtros_vendas = dict(
                 data_inicio=filters["data_inicio"],
                 data_fim=filters["data_fim"],
                 vendedores=filters["vendedores"] if filters["vendedores"] else None,
                 situacoes=filters["situacoes"] if filters["situacoes"] else None,
                 origens=filters.get("origens") if filters.get("origens") else None,
             )
+            df_vendas = vendas_service.get_vendas_filtradas(**filtros_vendas)
             LoadingHelper.hide_loading(loading)
 
             # LOG: Dados retornados
@@ -1551,11 +1416,17 @@ def _apply_filters(filters):
         metricas = vendas_service.get_metricas_vendas(df_vendas)
         LoadingHelper.hide_loading(loading)
 
-        # Armazenar dados na sessão para uso posterior
-        st.session_state["df_vendas"] = df_vendas
+        # Armazenar dados na sessão para uso posterior (recarregável via cache)
+        session_data.put(
+            "df_vendas",
+            df_vendas,
+            module="vendas",
+            loader=lambda: vendas_service.get_vendas_filtradas(**filtros_vendas),
+        )
         st.session_state["metricas"] = metricas
 
         # Armazenar filtros aplicados na sessão
+        st.session_state["vendas_filtros_export"] = filtros_vendas
         st.session_state["data_inicio_filtro"] = filters["data_inicio"]
         st.session_state["data_fim_filtro"] = filters["data_fim"]
         st.session_state["vendedores_filtro"] = (
@@ -1589,31 +1460,22 @@ def _render_download_section():
     st.subheader("📥 Download dos Dados")
 
     # Verificar se há dados disponíveis
-    has_data = (
-        "df_vendas" in st.session_state
-        and st.session_state["df_vendas"] is not None
-        and not st.session_state["df_vendas"].empty
-    )
+    df = session_data.get("df_vendas")
+    has_data = df is not None and not df.empty
 
     col1, col2, col3 = st.columns(3)
 
     if has_data:
-        df = st.session_state["df_vendas"]
 
         with col1:
-            # Download Excel
-            from io import BytesIO
-
-            buffer = BytesIO()
-            with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-                df.to_excel(writer, sheet_name="Vendas", index=False)
-
-            st.download_button(
+            # Download Excel (mesmo arquivo do botão das métricas)
+            lazy_download_button(
                 label="📊 Download Excel",
-                data=buffer.getvalue(),
+                name="vendas_excel",
+                df=df,
+                builder=_excel_vendas_builder(df),
                 file_name=f"vendas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True,
+                key="download_excel_section",
             )
 
         with col2:
@@ -1677,13 +1539,12 @@ def _render_download_section():
     st.markdown("---")
 
 
-def _render_charts():
+def _render_charts(dados):
     """Renderiza gráficos de análise"""
-    if "df_vendas" not in st.session_state or st.session_state["df_vendas"] is None:
+    df_vendas = session_data.get("df_vendas")
+    if df_vendas is None:
         return
 
-    df_vendas = st.session_state["df_vendas"]
-
     if df_vendas.empty:
         st.warning("Não há dados para exibir gráficos")
         return
@@ -1712,7 +1573,7 @@ def _render_charts():
         st.subheader("🏆 Ranking de Vendedores")
 
         try:
-            _render_vendedores_com_fotos(vendas_por_vendedor)
+            _render_vendedores_com_fotos(vendas_por_vendedor, dados)
         except Exception as e:
             logger.error(f"Erro ao renderizar vendedores com fotos: {str(e)}")
             st.error(f"Erro ao exibir vendedores: {str(e)}")
@@ -1723,29 +1584,8 @@ def _render_charts():
     st.subheader("🏆 Ranking de Produtos")
 
     try:
-        # Obter IDs de vendas do DataFrame já carregado (mais eficiente)
-        venda_ids = None
-        if "ID_Gestao" in df_vendas.columns and not df_vendas.empty:
-            venda_ids = df_vendas["ID_Gestao"].tolist()
-            # Só usar venda_ids se a lista não estiver vazia
-            if not venda_ids:
-                venda_ids = None
-
-        # Obter filtros aplicados da sessão (para fallback)
-        data_inicio = st.session_state.get("data_inicio_filtro")
-        data_fim = st.session_state.get("data_fim_filtro")
-        vendedores = st.session_state.get("vendedores_filtro")
-        situacoes = st.session_state.get("situacoes_filtro")
-
-        # Obter ranking de produtos
-        ranking_produtos = _get_ranking_produtos(
-            data_inicio=data_inicio,
-            data_fim=data_fim,
-            vendedores=vendedores,
-            situacoes=situacoes,
-            venda_ids=venda_ids,
-            top_n=10,
-        )
+        # Ranking calculado na carga paralela do dashboard
+        ranking_produtos = dados.result("ranking_produtos")
 
         # Renderizar cards do ranking
         _render_ranking_produtos(ranking_produtos)
@@ -1861,11 +1701,10 @@ def _render_manual_fullscreen():
 
 def _render_data_grid():
     """Renderiza grid de vendas detalhadas com AgGrid avançado"""
-    if "df_vendas" not in st.session_state or st.session_state["df_vendas"] is None:
+    df_vendas = session_data.get("df_vendas")
+    if df_vendas is None:
         return
 
-    df_vendas = st.session_state["df_vendas"]
-
     if df_vendas.empty:
         st.info("Nenhum dado disponível para exibição")
         return
@@ -1886,34 +1725,10 @@ def _render_data_grid():
 
     df_display = df_vendas[colunas_display].copy()
 
-    # Função para limpar e converter valores monetários
-    def clean_monetary_value(val):
-        """Remove formatação monetária e converte para float"""
-        if pd.isna(val):
-            return 0.0
-        if isinstance(val, (int, float)):
-            return float(val)
-        # Converter para string e limpar
-        val_str = str(val).replace("R$", "").strip()
-
-        # Se tem vírgula, é formato brasileiro (1.500,00)
-        if "," in val_str:
-            # Remover pontos (separador de milhares) e trocar vírgula por ponto
-            val_clean = val_str.replace(".", "").replace(",", ".")
-        else:
-            # Formato americano ou já limpo (1500.00 ou 1500)
-            val_clean = val_str
-
-        val_clean = val_clean.strip()
-        try:
-            return float(val_clean) if val_clean else 0.0
-        except:
-            return 0.0
-
     # Garantir que valores monetários sejam float (sem formatação - AgGrid fará a formatação visual)
-    for col in ["ValorProdutos", "ValorDesconto", "ValorTotal"]:
-        if col in df_display.columns:
-            df_display[col] = df_display[col].apply(clean_monetary_value)
+    converter_colunas_numericas(
+        df_display, ["ValorProdutos", "ValorDesconto", "ValorTotal"]
+    )
 
     # Formatar coluna Data para exibir apenas dd/mm/yyyy (sem horário)
     def format_date(val):
@@ -1961,36 +1776,9 @@ def _render_data_grid():
 
     # Armazenar IDs das vendas filtradas na grid para uso no painel de Produtos
     if df_filtered is not None and not df_filtered.empty:
-        # Mapear vendas filtradas de volta ao df original para pegar os IDs
-        # Criar chave única para matching
-        df_vendas_with_key = df_vendas.copy()
-        df_vendas_with_key["_match_key"] = (
-            df_vendas_with_key["ClienteNome"].astype(str)
-            + "|"
-            + df_vendas_with_key["VendedorNome"].astype(str)
-            + "|"
-            + df_vendas_with_key["ValorTotal"].astype(str)
-            + "|"
-            + df_vendas_with_key["Data"].astype(str)
-        )
-
-        df_filtered_with_key = df_filtered.copy()
-        df_filtered_with_key["_match_key"] = (
-            df_filtered_with_key["Cliente"].astype(str)
-            + "|"
-            + df_filtered_with_key["Vendedor"].astype(str)
-            + "|"
-            + df_filtered_with_key["Valor Total"]
-            .apply(lambda x: str(x) if isinstance(x, (int, float)) else str(x))
-            .astype(str)
-            + "|"
-            + df_filtered_with_key["Data"].astype(str)
-        )
-
-        # Encontrar IDs das vendas filtradas
-        vendas_filtradas = df_vendas_with_key[
-            df_vendas_with_key["_match_key"].isin(df_filtered_with_key["_match_key"])
-        ]
+        # O grid preserva o índice de df_vendas: as linhas filtradas são
+        # mapeadas de volta às vendas originais pelo índice
+        vendas_filtradas = df_vendas[df_vendas.index.isin(df_filtered.index)]
 
         if "Id" in vendas_filtradas.columns:
             ids_vendas_filtradas = vendas_filtradas["Id"].tolist()
@@ -2006,7 +1794,9 @@ def _render_data_grid():
 
 def _render_advanced_sales_grid(df_display, df_original):
     """Renderiza grid avançada de vendas usando AgGrid com funcionalidades completas"""
-    from st_aggrid import AgGrid, GridOptionsBuilder
+    from st_aggrid import GridOptionsBuilder
+
+    from presentation.components.data_grid import PagedDataGrid
 
     # Interface para seleção de colunas visíveis
     st.markdown("#### 👁️ Colunas Visíveis")
@@ -2101,27 +1891,23 @@ def _render_advanced_sales_grid(df_display, df_original):
 
         return gb.build()
 
-    # Calcular totalizadores
-    def calculate_sales_totals(data):
-        totals = {"total_vendas": len(data)}
+    # Calcular totalizadores das linhas filtradas (servidor, cache por filtro)
+    def calculate_sales_totals(resultado):
+        colunas = [
+            col
+            for col in resultado.source.columns
+            if "Valor" in col or col == "Desconto"
+        ]
+        totais = resultado.totals(colunas)
 
-        # Calcular totais de valores monetários
-        for col in data.columns:
-            if "Valor" in col or col == "Desconto":
-                try:
-                    # Valores já são numéricos, apenas somar
-                    totals[f"total_{col.lower().replace(' ', '_')}"] = (
-                        pd.to_numeric(data[col], errors="coerce").fillna(0).sum()
-                    )
-                except:
-                    totals[f"total_{col.lower().replace(' ', '_')}"] = 0
+        totals = {"total_vendas": totais.count}
+        for col in colunas:
+            totals[f"total_{col.lower().replace(' ', '_')}"] = totais.sums[col]
 
         return totals
 
     # Exibir totalizadores
     def display_sales_totals(totals, df_filtered):
-        from io import BytesIO
-
         container = st.container()
         with container:
             # Dividindo em colunas para totalizadores e botões
@@ -2169,18 +1955,14 @@ def _render_advanced_sales_grid(df_display, df_original):
             with cols[3]:
                 st.write("")  # Espaço para alinhar
                 if not df_filtered.empty:
-                    buffer = BytesIO()
-                    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-                        df_filtered.to_excel(
-                            writer, index=False, sheet_name="Vendas_Detalhadas"
-                        )
-
-                    if st.download_button(
+                    if lazy_download_button(
                         label="📊 Excel",
-                        data=buffer.getvalue(),
+                        name="vendas_detalhadas_excel",
+                        df=df_filtered,
+                        builder=lambda: export_excel(
+                            df_filtered, sheet_name="Vendas_Detalhadas"
+                        ),
                         file_name=f"vendas_detalhadas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        use_container_width=True,
                         key="download_excel_vendas",
                     ):
                         st.success("Excel baixado!")
@@ -2217,43 +1999,28 @@ def _render_advanced_sales_grid(df_display, df_original):
     # Container para os totalizadores
     totals_container = st.container()
 
-    # Renderizar o grid com colunas filtradas
+    # Renderizar o grid com colunas filtradas (paginado no servidor: só a
+    # página visível vai ao navegador; filtros e ordenação ficam no Python)
     with st.spinner("Carregando grid..."):
-        # IMPORTANTE: Criar key dinâmica para forçar re-renderização quando filtros mudarem
-        # Usar hash dos filtros aplicados + timestamp para garantir atualização
-        import hashlib
-
-        filtros_str = f"{st.session_state.get('data_inicio_filtro')}_{st.session_state.get('data_fim_filtro')}_{st.session_state.get('vendedores_filtro')}_{st.session_state.get('situacoes_filtro')}_{len(df_display_filtered)}"
-        grid_key = f"vendas_grid_{hashlib.md5(filtros_str.encode()).hexdigest()}"
-
-        grid_options = create_sales_grid_options(df_display_filtered)
-        grid_response = AgGrid(
+        resultado = PagedDataGrid(height=800).render(
             df_display_filtered,
-            gridOptions=grid_options,
-            height=800,
-            fit_columns_on_grid_load=True,
-            theme="alpine",
-            allow_unsafe_jscode=True,
-            reload_data=True,
-            key=grid_key,  # Key dinâmica que muda com os filtros
+            key="vendas_grid",
+            grid_options=create_sales_grid_options(df_display_filtered),
             columns_auto_size_mode="FIT_CONTENTS",
         )
 
-    # Calcular e exibir totalizadores - usando dados filtrados da grid
-    df_filtered_sales = pd.DataFrame(grid_response["data"])
-
-    # Como estamos usando multiselect para controlar colunas visíveis,
-    # os dados da grid já contêm apenas as colunas selecionadas
+    # Totalizadores e exportação com todas as linhas filtradas (não só a página)
+    df_filtered_sales = resultado.data
     df_export_sales = df_filtered_sales
 
-    totals = calculate_sales_totals(df_filtered_sales)
+    totals = calculate_sales_totals(resultado)
 
     with totals_container:
         display_sales_totals(totals, df_export_sales)
 
     st.markdown("---")
 
-    return grid_response["data"]
+    return df_filtered_sales
 
 
 def _create_pie_chart(df):
@@ -2636,7 +2403,9 @@ def _render_ranking_produtos(ranking_df):
 
 def _render_advanced_products_grid(df_display):
     """Renderiza grid avançada usando AgGrid com funcionalidades completas"""
-    from st_aggrid import AgGrid, GridOptionsBuilder
+    from st_aggrid import GridOptionsBuilder
+
+    from presentation.components.data_grid import PagedDataGrid
 
     # Interface para seleção de colunas visíveis
     st.markdown("#### 👁️ Colunas Visíveis")
@@ -2717,36 +2486,21 @@ def _render_advanced_products_grid(df_display):
 
         return gb.build()
 
-    # Calcular totalizadores
-    def calculate_products_totals(data):
-        totals = {"total_produtos": len(data)}
+    # Calcular totalizadores das linhas filtradas (servidor, cache por filtro)
+    def calculate_products_totals(resultado):
+        colunas = [col for col in resultado.source.columns if "Valor" in col]
+        if "Quantidade" in resultado.source.columns:
+            colunas.insert(0, "Quantidade")
+        totais = resultado.totals(colunas)
 
-        if "Quantidade" in data.columns:
-            try:
-                # Valores já são numéricos, apenas somar
-                totals["total_quantidade"] = (
-                    pd.to_numeric(data["Quantidade"], errors="coerce").fillna(0).sum()
-                )
-            except:
-                totals["total_quantidade"] = 0
-
-        # Calcular totais de valores monetários
-        for col in data.columns:
-            if "Valor" in col:
-                try:
-                    # Valores já são numéricos, apenas somar
-                    totals[f"total_{col.lower().replace(' ', '_')}"] = (
-                        pd.to_numeric(data[col], errors="coerce").fillna(0).sum()
-                    )
-                except:
-                    totals[f"total_{col.lower().replace(' ', '_')}"] = 0
+        totals = {"total_produtos": totais.count}
+        for col in colunas:
+            totals[f"total_{col.lower().replace(' ', '_')}"] = totais.sums[col]
 
         return totals
 
     # Exibir totalizadores
     def display_products_totals(totals, df_filtered):
-        from io import BytesIO
-
         container = st.container()
         with container:
             # Dividindo em colunas para totalizadores e botões
@@ -2800,18 +2554,14 @@ def _render_advanced_products_grid(df_display):
             with cols[3]:
                 st.write("")  # Espaço para alinhar
                 if not df_filtered.empty:
-                    buffer = BytesIO()
-                    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-                        df_filtered.to_excel(
-                            writer, index=False, sheet_name="Produtos_Detalhados"
-                        )
-
-                    if st.download_button(
+                    if lazy_download_button(
                         label="📊 Excel",
-                        data=buffer.getvalue(),
+                        name="produtos_detalhados_excel",
+                        df=df_filtered,
+                        builder=lambda: export_excel(
+                            df_filtered, sheet_name="Produtos_Detalhados"
+                        ),
                         file_name=f"produtos_detalhados_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        use_container_width=True,
                         key="download_excel_produtos",
                     ):
                         st.success("Excel baixado!")
@@ -2848,50 +2598,34 @@ def _render_advanced_products_grid(df_display):
     # Container para os totalizadores
     totals_container = st.container()
 
-    # Renderizar o grid com colunas filtradas
+    # Renderizar o grid com colunas filtradas (paginado no servidor)
     with st.spinner("Carregando grid..."):
-        # IMPORTANTE: Criar key dinâmica para forçar re-renderização quando filtros mudarem
-        import hashlib
-
-        filtros_str = f"{st.session_state.get('data_inicio_filtro')}_{st.session_state.get('data_fim_filtro')}_{st.session_state.get('vendedores_filtro')}_{st.session_state.get('situacoes_filtro')}_{len(df_display_filtered)}"
-        grid_key = f"produtos_grid_{hashlib.md5(filtros_str.encode()).hexdigest()}"
-
-        grid_options = create_products_grid_options(df_display_filtered)
-        grid_response = AgGrid(
+        resultado = PagedDataGrid(height=800).render(
             df_display_filtered,
-            gridOptions=grid_options,
-            height=800,
-            fit_columns_on_grid_load=True,
-            theme="alpine",
-            allow_unsafe_jscode=True,
-            reload_data=True,
-            key=grid_key,  # Key dinâmica que muda com os filtros
+            key="produtos_grid",
+            grid_options=create_products_grid_options(df_display_filtered),
         )
 
-    # Calcular e exibir totalizadores - usando dados filtrados da grid
-    df_filtered_products = pd.DataFrame(grid_response["data"])
-
-    # Como estamos usando multiselect para controlar colunas visíveis,
-    # os dados da grid já contêm apenas as colunas selecionadas
+    # Totalizadores e exportação com todas as linhas filtradas (não só a página)
+    df_filtered_products = resultado.data
     df_export_products = df_filtered_products
 
-    totals = calculate_products_totals(df_filtered_products)
+    totals = calculate_products_totals(resultado)
 
     with totals_container:
         display_products_totals(totals, df_export_products)
 
     st.markdown("---")
 
-    return grid_response["data"]
+    return df_filtered_products
 
 
 def _render_produtos_detalhados():
     """Renderiza painel de produtos detalhados"""
-    if "df_vendas" not in st.session_state or st.session_state["df_vendas"] is None:
+    df_vendas = session_data.get("df_vendas")
+    if df_vendas is None:
         return
 
-    df_vendas = st.session_state["df_vendas"]
-
     if df_vendas.empty:
         st.info("Nenhum dado disponível para produtos")
         return
@@ -2970,6 +2704,16 @@ def _render_produtos_detalhados():
         st.error(f"Erro ao carregar produtos: {str(e)}")
 
 
+# Módulo do menu -> módulo usado ao guardar DataFrames em session_data
+MODULOS_SESSAO = {
+    "Relatório de Vendas": "vendas",
+    "Relatório de Recebimentos": "recebimentos",
+    "Comex Produtos": "comex",
+    "Relatório de Pedidos": "pedidos",
+    "Ordem de Serviço": "sac",
+}
+
+
 def main():
     """
     Função principal do aplicativo
@@ -2980,37 +2724,43 @@ def main():
     if "current_module" not in st.session_state:
         st.session_state.current_module = None
 
+    try:
+        _executar()
+    finally:
+        # Cada execução do script roda em uma thread própria; devolve a
+        # conexão ao pool, como fazem as tarefas e o agendador
+        release_connections()
+
+
+def _executar():
+    """
+    Direciona para o login ou para o módulo selecionado
+    """
     # Redirecionar para a tela de login se não estiver logado
     if not st.session_state.logged_in:
         login_screen(user_service)
     else:
+        # Após o login, importa em segundo plano os módulos ainda não usados
+        module_registry.preload()
+
         selected_module = menu()
 
         if selected_module:
             st.session_state.current_module = selected_module
 
+        # Dados guardados por módulos fora de uso podem ser descartados
+        session_data.activate(
+            MODULOS_SESSAO.get(
+                st.session_state.current_module, st.session_state.current_module
+            )
+        )
+
         # Redirecionar para o módulo selecionado
-        if st.session_state.current_module == "Estoque":
-            estoque_main(key="estoque")
-        elif st.session_state.current_module == "Cobrança":
-            boletos_main(key="boletos")
-        elif st.session_state.current_module == "Financeiro":
-            extratos_main(key="extratos")
-        elif st.session_state.current_module == "Relatório de Vendas":
-            if VENDAS_REFATORADO_AVAILABLE:
-                vendas_dashboard()  # Versão de produção com cards visuais
-            else:
-                vendas_main(key="vendas")
-        elif st.session_state.current_module == "Relatório de Recebimentos":
-            recebimentos_main(key="recebimentos")
-        elif st.session_state.current_module == "Relatório de Clientes":
-            clientes_main(key="clientes")
-        elif st.session_state.current_module == "Comex Produtos":
-            comex_main(key="comex")
-        elif st.session_state.current_module == "Relatório de Pedidos":
-            pedidos_main(key="pedidos")
-        elif st.session_state.current_module == "Ordem de Serviço":
-            sac_main(key="sac")
+        modulo = st.session_state.current_module
+        if modulo == "Relatório de Vendas" and VENDAS_REFATORADO_AVAILABLE:
+            vendas_dashboard()  # Versão de produção com cards visuais
+        elif modulo in module_registry:
+            module_registry.render(modulo)
 
 
 if __name__ == "__main__":
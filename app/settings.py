@@ -81,14 +81,19 @@ WSGI_APPLICATION = "app.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Conexões emprestadas do pool do processo (infrastructure/database/pool.py):
+# o Streamlit usa uma thread por interação e o backend padrão abriria uma
+# conexão nova em cada uma. Com o pool, fechar a conexão ao fim de uma
+# requisição (CONN_MAX_AGE=0) apenas a devolve. Tamanho e pre-ping em DB_POOL_*.
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "infrastructure.database.pooled_backend",
         "NAME": os.environ.get("DB_NAME", "sga"),
         "USER": os.environ.get("DB_USER", "postgres"),
         "PASSWORD": os.environ.get("DB_PASSWORD", ""),
         "HOST": os.environ.get("DB_HOST", "195.200.1.244"),
         "PORT": os.environ.get("DB_PORT", "5432"),
+        "OPTIONS": {"connect_timeout": 5},
     }
 }
 
@@ -1,15 +1,20 @@
 import locale
+import logging
 from datetime import date, datetime
-from io import BytesIO
 
-import openpyxl
 import pandas as pd
 import streamlit as st
 from dateutil import parser
 from dateutil.relativedelta import relativedelta
-from st_aggrid import AgGrid, GridOptionsBuilder
+from st_aggrid import GridOptionsBuilder
 
-from service import DataService
+from core.runtime import runtime
+from infrastructure.database.freshness import freshness_monitor
+from infrastructure.export.excel import ExcelColumn, export_excel
+from presentation.components.data_grid import PagedDataGrid
+from presentation.components.downloads import lazy_download_button
+
+logger = logging.getLogger(__name__)
 
 
 class BoletosReport:
@@ -22,7 +27,7 @@ class BoletosReport:
         """Inicializa a classe com configurações básicas"""
         self.configure_locale()
         self.configure_page()
-        self.data_service = DataService()
+        self.data_service = runtime.data_service
 
     def configure_locale(self):
         """Configura localização para formato brasileiro"""
@@ -45,13 +50,15 @@ class BoletosReport:
         st.markdown(hide_st_style, unsafe_allow_html=True)
 
     @staticmethod
-    @st.cache_data(ttl=300)
-    def load_data(data_inicial=None, data_final=None):
+    @st.cache_data(max_entries=32)
+    def load_data(data_inicial=None, data_final=None, versao=None):
         """
         Carrega dados dos Boletos com cache
         Args:
             data_inicial (str): Data inicial no formato YYYY-MM-DD
             data_final (str): Data final no formato YYYY-MM-DD
+            versao (str): Versão dos dados; o cache só é revalidado quando
+                o RPA de boletos executa (ver freshness_monitor)
         Returns:
             pd.DataFrame: DataFrame com os dados dos boletos
         """
@@ -66,7 +73,7 @@ class BoletosReport:
                         "%Y-%m-%d"
                     )
 
-                return DataService().get_boletos_filtrados(
+                return runtime.data_service.get_boletos_filtrados(
                     data_inicial=data_inicial, data_final=data_final
                 )
         except Exception as e:
@@ -99,21 +106,22 @@ class BoletosReport:
             st.error(f"Erro ao formatar data: {str(e)}")
             return str(value)
 
-    def calculate_totals(self, data):
+    def calculate_totals(self, resultado):
         """
         Calcula totalizadores dos Boletos
         Args:
-            data (pd.DataFrame): DataFrame com os dados dos boletos
+            resultado (PagedGridResult): Grade com os boletos filtrados
         Returns:
             dict: Dicionário com os totais calculados
         """
         try:
-            if data.empty or "Status" not in data.columns:
+            if resultado.data.empty or "Status" not in resultado.source.columns:
                 return {"total_enviados": 0, "total_errados": 0, "total_geral": 0}
 
-            status_counts = data["Status"].value_counts()
-            total_enviados = int(status_counts.get("Enviado", 0))
-            total_errados = int(status_counts.get("Errado", 0))
+            # Contagem por status com cache por filtro (grid_totals)
+            totais = resultado.totals(by="Status")
+            total_enviados = totais.group("Enviado").count
+            total_errados = totais.group("Errado").count
             total_geral = total_enviados + total_errados
 
             return {
@@ -227,16 +235,14 @@ class BoletosReport:
                 with col_button:
                     st.write("")
                     if not df.empty:
-                        excel_data = self.generate_excel(df)
-                        if excel_data:
-                            if st.download_button(
-                                label="📥 Baixar Excel",
-                                data=excel_data,
-                                file_name=f"boletos_{date.today().strftime('%d%m%Y')}.xlsx",
-                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                use_container_width=True,
-                            ):
-                                st.success("Download iniciado!")
+                        if lazy_download_button(
+                            label="📥 Baixar Excel",
+                            name="boletos_excel",
+                            df=df,
+                            builder=lambda: self.generate_excel(df),
+                            file_name=f"boletos_{date.today().strftime('%d%m%Y')}.xlsx",
+                        ):
+                            st.success("Download iniciado!")
                     else:
                         st.warning("Não há dados para exportar.")
         except Exception as e:
@@ -254,47 +260,17 @@ class BoletosReport:
             return None
 
         try:
-            output = BytesIO()
-            workbook = openpyxl.Workbook()
-            worksheet = workbook.active
-            worksheet.title = "Boletos"
-
-            df_formatted = df.copy()
-
-            for index, row in df_formatted.iterrows():
-                if "envio" in df_formatted.columns:
-                    df_formatted.at[index, "envio"] = self.format_date(row["envio"])
-                if "Vencimento" in df_formatted.columns:
-                    df_formatted.at[index, "Vencimento"] = self.format_date(
-                        row["Vencimento"]
-                    )
-
-            for col_idx, column in enumerate(df_formatted.columns, start=1):
-                cell = worksheet.cell(row=1, column=col_idx)
-                cell.value = column
-
-            for row_idx, row in enumerate(df_formatted.values, start=2):
-                for col_idx, value in enumerate(row, start=1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    cell.value = str(value) if pd.notnull(value) else ""
-
-            for col_idx, column in enumerate(df_formatted.columns, start=1):
-                max_length = (
-                    max(
-                        df_formatted[column].astype(str).apply(len).max(),
-                        len(str(column)),
-                    )
-                    + 2
-                )
-                worksheet.column_dimensions[
-                    openpyxl.utils.get_column_letter(col_idx)
-                ].width = max_length
-
-            workbook.save(output)
-            return output.getvalue()
+            tipos = {"envio": "datahora", "Vencimento": "data"}
+            colunas = [
+                ExcelColumn(str(col), kind=tipos.get(col, "texto"))
+                for col in df.columns
+            ]
+            return export_excel(df, colunas, sheet_name="Boletos")
 
         except Exception as e:
-            st.error(f"Erro ao gerar arquivo Excel: {str(e)}")
+            # Builder de lazy_download_button: roda em thread de core.jobs,
+            # sem Streamlit; sem arquivo, o botão de download mostra a falha
+            logger.error(f"Error generating Excel file: {str(e)}")
             return None
 
     def run(self, key=None):
@@ -305,12 +281,21 @@ class BoletosReport:
             # Renderiza os filtros e obtém as datas selecionadas
             filtros = self.render_filters()
 
-            # Verifica se os filtros foram alterados
-            if "filtros" not in st.session_state or st.session_state.filtros != filtros:
+            # Versão dos dados: muda apenas após nova ingestão do RPA
+            versao = freshness_monitor.get_version("boletos")
+
+            # Verifica se os filtros ou os dados de origem foram alterados
+            if (
+                "filtros" not in st.session_state
+                or st.session_state.filtros != filtros
+                or st.session_state.get("boletos_versao") != versao
+            ):
                 st.session_state.filtros = filtros
+                st.session_state.boletos_versao = versao
                 st.session_state.df = self.load_data(
                     data_inicial=filtros["data_inicial"],
                     data_final=filtros["data_final"],
+                    versao=versao,
                 )
 
             # Obtém os dados filtrados
@@ -326,29 +311,18 @@ class BoletosReport:
             # Configura as opções do grid
             grid_options = self.create_grid_options(df)
 
-            # Placeholder para o grid
-            grid_placeholder = st.empty()
-
             with st.spinner("Carregando grid..."):
-                # Renderiza o grid dentro do placeholder
-                with grid_placeholder:
-                    grid_response = AgGrid(
-                        df,
-                        gridOptions=grid_options,
-                        height=800,
-                        fit_columns_on_grid_load=True,
-                        theme="alpine",
-                        allow_unsafe_jscode=True,
-                        reload_data=True,
-                        key=f"grid_{filtros['data_inicial']}_{filtros['data_final']}",  # Chave única baseada nas datas
-                    )
+                # Paginado no servidor: só a página visível vai ao navegador
+                resultado = PagedDataGrid(height=800).render(
+                    df, key=f"grid_{key or 'boletos'}", grid_options=grid_options
+                )
 
             # Calcula os totais
-            totals = self.calculate_totals(grid_response["data"])
+            totals = self.calculate_totals(resultado)
 
             # Renderiza os totais
             with totals_container:
-                self.render_totals(totals, grid_response["data"])
+                self.render_totals(totals, resultado.data)
 
             st.markdown("---")
 
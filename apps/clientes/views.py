@@ -1,14 +1,18 @@
 import locale
+import logging
 from datetime import date, datetime
-from io import BytesIO
 from typing import Any, Dict, Optional, cast
 
-import openpyxl
 import pandas as pd
 import streamlit as st
-from st_aggrid import AgGrid, GridOptionsBuilder
+from st_aggrid import GridOptionsBuilder
 
-from service import DataService
+from core.runtime import runtime
+from infrastructure.export.excel import ExcelColumn, export_excel
+from presentation.components.data_grid import PagedDataGrid
+from presentation.components.downloads import lazy_download_button
+
+logger = logging.getLogger(__name__)
 
 
 class ClientesReport:
@@ -21,7 +25,7 @@ class ClientesReport:
         """Inicializa a classe com configurações básicas"""
         self.configure_locale()
         self.configure_page()
-        self.data_service = DataService()
+        self.data_service = runtime.data_service
 
     def configure_locale(self) -> None:
         """Configura localização para formato brasileiro"""
@@ -53,7 +57,7 @@ class ClientesReport:
         """
         try:
             with st.spinner("Carregando dados de clientes..."):
-                return DataService().get_clientes()
+                return runtime.data_service.get_clientes()
         except Exception as e:
             st.error(f"Erro ao carregar dados: {str(e)}")
             return pd.DataFrame()
@@ -142,11 +146,6 @@ class ClientesReport:
             return None
 
         try:
-            output = BytesIO()
-            workbook = openpyxl.Workbook()
-            worksheet = workbook.active
-            worksheet.title = "Clientes"
-
             # Formatar dados antes de exportar
             df_formatted = df.copy()
 
@@ -160,32 +159,14 @@ class ClientesReport:
             # if 'Celular' in df_formatted.columns:
             #     df_formatted['Celular'] = df_formatted['Celular'].apply(self.format_phone)
 
-            # Escrever cabeçalhos
-            for col_idx, column in enumerate(df_formatted.columns, start=1):
-                cell = worksheet.cell(row=1, column=col_idx)
-                cell.value = column
-                cell.font = openpyxl.styles.Font(bold=True)
-
-            # Escrever dados
-            for row_idx, row in enumerate(df_formatted.values, start=2):
-                for col_idx, value in enumerate(row, start=1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    cell.value = str(value) if pd.notnull(value) else ""
-
-            # Ajustar largura das colunas
-            for col_idx, column in enumerate(df_formatted.columns, start=1):
-                max_length = max(
-                    df_formatted[column].astype(str).apply(len).max(), len(str(column))
-                )
-                worksheet.column_dimensions[
-                    openpyxl.utils.get_column_letter(col_idx)
-                ].width = min(max_length + 2, 50)
-
-            workbook.save(output)
-            return output.getvalue()
+            # Documentos, telefones e CEPs continuam como texto
+            colunas = [ExcelColumn(str(col), kind="texto") for col in df.columns]
+            return export_excel(df_formatted, colunas, sheet_name="Clientes")
 
         except Exception as e:
-            st.error(f"Erro ao gerar arquivo Excel: {str(e)}")
+            # Builder de lazy_download_button: roda em thread de core.jobs,
+            # sem Streamlit; sem arquivo, o botão de download mostra a falha
+            logger.error(f"Error generating Excel file: {str(e)}")
             return None
 
     def run(self, key: Optional[str] = None) -> None:
@@ -214,33 +195,26 @@ class ClientesReport:
             # Configura as opções do grid
             grid_options = self.create_grid_options(df_display)
 
-            # Renderiza o grid
+            # Renderiza o grid (paginado no servidor: só a página vai ao navegador)
             with st.spinner("Carregando dados..."):
-                grid_response = AgGrid(
-                    df_display,
-                    gridOptions=grid_options,
-                    height=600,
-                    fit_columns_on_grid_load=False,
-                    theme="alpine",
-                    allow_unsafe_jscode=True,
-                    reload_data=True,
-                    key="clientes_grid",
-                )
+                resultado = PagedDataGrid(
+                    height=600, fit_columns_on_grid_load=False
+                ).render(df_display, key="clientes_grid", grid_options=grid_options)
 
-            # Obtém os dados filtrados da grid
-            filtered_data = pd.DataFrame(grid_response["data"])
+            # Todas as linhas que atendem aos filtros ativos (não só a página)
+            filtered_data = resultado.data
 
             # Botão de download do Excel - versão simplificada com download automático
             if not filtered_data.empty:
-                excel_bytes = self.generate_excel(filtered_data)
-                if excel_bytes:
-                    st.download_button(
-                        label="📥 Exportar para Excel",
-                        data=excel_bytes,
-                        file_name=f"relatorio_clientes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        key="export_excel",
-                    )
+                lazy_download_button(
+                    label="📥 Exportar para Excel",
+                    name="clientes_excel",
+                    df=filtered_data,
+                    builder=lambda: self.generate_excel(filtered_data),
+                    file_name=f"relatorio_clientes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                    key="export_excel",
+                    use_container_width=False,
+                )
             else:
                 st.warning("Não há dados filtrados para exportar.")
 
@@ -4,7 +4,6 @@ Exibe produtos vendidos com filtros de data
 """
 
 import calendar
-import io
 import logging
 import traceback
 from datetime import date, datetime
@@ -14,14 +13,21 @@ import streamlit as st
 
 # Imports da aplicação refatorada
 try:
-    from core.container_vendas import DIContainer
     from core.exceptions import BusinessLogicError, SGRException, ValidationError
+    from core.runtime import runtime
+    from core.session_data import session_data
     from domain.services.vendas_service import VendasService
+    from infrastructure.export.excel import export_excel
+    from presentation.components.downloads import lazy_download_button
     from presentation.components.forms_vendas import ValidationHelper
     from presentation.styles.theme_simple import apply_theme
+    from utils.numeric import converter_colunas_numericas, converter_para_numerico
 except ImportError as e:
     st.error(f"❌ Erro crítico de importação: {e}")
     st.stop()
+    # Sem contexto do script (pré-carregamento em core.jobs) st.stop() não
+    # interrompe: a falha volta para o registro de módulos
+    raise
 
 
 class ComexProdutosController:
@@ -38,8 +44,9 @@ class ComexProdutosController:
     def _initialize_services(self):
         """Inicializa serviços com tratamento de erro"""
         try:
-            self.container = DIContainer()
-            self.vendas_service = self.container.get_vendas_service()
+            # Runtime do processo: container e serviço criados uma única vez
+            self.container = runtime.vendas_container
+            self.vendas_service = runtime.vendas_service
             self.logger.info("Serviços de vendas (Comex) inicializados com sucesso")
 
         except Exception as e:
@@ -66,9 +73,8 @@ class ComexProdutosController:
                 st.error("❌ Erro ao conectar com o banco de dados")
                 return
 
-            # Inicializar dados na sessão
-            if "comex_produtos_df" not in st.session_state:
-                st.session_state.comex_produtos_df = None
+            # Inicializar dados na sessão (guardados em session_data)
+            if not session_data.has("comex_produtos_df"):
                 # Carregar dados do mês atual automaticamente
                 self._auto_load_current_month()
 
@@ -120,11 +126,9 @@ class ComexProdutosController:
             self._render_filters()
 
         # Exibir dados
-        if (
-            st.session_state.comex_produtos_df is not None
-            and not st.session_state.comex_produtos_df.empty
-        ):
-            self._render_data_table()
+        df = session_data.get("comex_produtos_df")
+        if df is not None and not df.empty:
+            self._render_data_table(df)
         else:
             # Mensagem se não houver dados
             st.info(
@@ -211,6 +215,8 @@ class ComexProdutosController:
                     data_fim=data_fim,
                     vendedores=None,
                     situacoes=None,
+                    # Apenas IDs (e o valor, que descarta vendas sem total)
+                    colunas=["ID_Gestao", "ValorTotal"],
                 )
 
                 if df_vendas.empty:
@@ -218,7 +224,9 @@ class ComexProdutosController:
                         st.warning(
                             "⚠️ Nenhuma venda encontrada para o período selecionado"
                         )
-                    st.session_state.comex_produtos_df = pd.DataFrame()
+                    session_data.put(
+                        "comex_produtos_df", pd.DataFrame(), module="comex"
+                    )
                     return
 
                 self.logger.info(f"✓ Encontradas {len(df_vendas)} vendas")
@@ -254,7 +262,9 @@ class ComexProdutosController:
                             f"⚠️ IDs de vendas não disponíveis\n\n"
                             f"Colunas disponíveis: {', '.join(df_vendas.columns.tolist())}"
                         )
-                    st.session_state.comex_produtos_df = pd.DataFrame()
+                    session_data.put(
+                        "comex_produtos_df", pd.DataFrame(), module="comex"
+                    )
                     return
 
                 self.logger.info(
@@ -283,7 +293,9 @@ class ComexProdutosController:
                         st.warning(
                             "⚠️ Nenhum produto encontrado para as vendas do período"
                         )
-                    st.session_state.comex_produtos_df = pd.DataFrame()
+                    session_data.put(
+                        "comex_produtos_df", pd.DataFrame(), module="comex"
+                    )
                     return
 
                 # PASSO 3.5: Agregar produtos manualmente
@@ -293,8 +305,15 @@ class ComexProdutosController:
 
                 self.logger.info(f"✓ {len(produtos_df)} produtos únicos após agregação")
 
-                # PASSO 4: Armazenar e exibir
-                st.session_state.comex_produtos_df = produtos_df
+                # PASSO 4: Armazenar e exibir (recarregável pelos mesmos IDs)
+                session_data.put(
+                    "comex_produtos_df",
+                    produtos_df,
+                    module="comex",
+                    loader=lambda: self._agregar_produtos(
+                        self._buscar_produtos_direto(venda_ids)
+                    ),
+                )
 
                 if not auto:
                     st.success(
@@ -336,8 +355,8 @@ class ComexProdutosController:
 
             # Query SQL direta - SIMPLES, sem filtro de vendedores ativos
             # VendaProdutos.Venda_ID = Vendas.ID_Gestao
-            placeholders = ",".join(["%s"] * len(venda_ids))
-            query = f"""
+            # IDs em um único parâmetro array: texto da query de tamanho constante
+            query = """
                 SELECT
                     vp."Nome",
                     vp."Quantidade",
@@ -350,14 +369,14 @@ class ComexProdutosController:
                     p."EstoqueGalpao"
                 FROM "VendaProdutos" vp
                 LEFT JOIN "Produtos" p ON vp."Nome" = p."Nome"
-                WHERE vp."Venda_ID" IN ({placeholders})
+                WHERE vp."Venda_ID" = ANY(%s)
                 ORDER BY vp."Nome"
             """
 
-            self.logger.info(f"Executando query com {len(venda_ids)} parâmetros")
+            self.logger.info(f"Executando query com {len(venda_ids)} IDs")
 
             with connection.cursor() as cursor:
-                cursor.execute(query, venda_ids)
+                cursor.execute(query, [list(venda_ids)])
                 columns = [col[0] for col in cursor.description]
                 data = cursor.fetchall()
 
@@ -388,42 +407,17 @@ class ComexProdutosController:
             if df_detalhado.empty:
                 return pd.DataFrame()
 
-            # Função para limpar valores monetários
-            def clean_value(val):
-                """Limpa valores que podem estar no formato ('10.00',)"""
-                if pd.isna(val) or not val or str(val).strip() == "":
-                    return 0.0
-
-                # Se já é número, retornar
-                if isinstance(val, (int, float)):
-                    return float(val)
-
-                # Converter para string e limpar
-                val_str = str(val)
-                val_str = (
-                    val_str.replace("(", "")
-                    .replace(")", "")
-                    .replace("'", "")
-                    .replace(",", ".")
-                )
-                val_str = val_str.strip()
-
-                try:
-                    return float(val_str) if val_str else 0.0
-                except:
-                    return 0.0
-
-            # Aplicar limpeza aos campos numéricos
-            numeric_columns = [
-                "Quantidade",
-                "ValorCusto",
-                "ValorVenda",
-                "ValorDesconto",
-                "ValorTotal",
-            ]
-            for col in numeric_columns:
-                if col in df_detalhado.columns:
-                    df_detalhado[col] = df_detalhado[col].apply(clean_value)
+            # Limpar valores monetários (aceita Decimal e formato ('10.00',))
+            converter_colunas_numericas(
+                df_detalhado,
+                [
+                    "Quantidade",
+                    "ValorCusto",
+                    "ValorVenda",
+                    "ValorDesconto",
+                    "ValorTotal",
+                ],
+            )
 
             # Definir colunas para agrupamento
             group_cols = ["Nome"]
@@ -471,10 +465,8 @@ class ComexProdutosController:
             self.logger.error(f"Erro ao agregar produtos: {str(e)}")
             return pd.DataFrame()
 
-    def _render_data_table(self):
+    def _render_data_table(self, df: pd.DataFrame):
         """Renderiza tabela de produtos usando AgGrid"""
-        df = st.session_state.comex_produtos_df
-
         if df is None or df.empty:
             return
 
@@ -487,34 +479,10 @@ class ComexProdutosController:
             # Criar cópia para exibição
             df_display = df.copy()
 
-            # Função para limpar e converter valores monetários
-            def clean_monetary_value(val):
-                """Remove formatação monetária e converte para float"""
-                if pd.isna(val):
-                    return 0.0
-                if isinstance(val, (int, float)):
-                    return float(val)
-                # Converter para string e limpar
-                val_str = str(val).replace("R$", "").strip()
-
-                # Se tem vírgula, é formato brasileiro (1.500,00)
-                if "," in val_str:
-                    # Remover pontos (separador de milhares) e trocar vírgula por ponto
-                    val_clean = val_str.replace(".", "").replace(",", ".")
-                else:
-                    # Formato americano ou já limpo (1500.00 ou 1500)
-                    val_clean = val_str
-
-                val_clean = val_clean.strip()
-                try:
-                    return float(val_clean) if val_clean else 0.0
-                except:
-                    return 0.0
-
             # Garantir que valores monetários sejam float (sem formatação)
             for col in df_display.columns:
                 if "Valor" in col or "Preco" in col or "Custo" in col:
-                    df_display[col] = df_display[col].apply(clean_monetary_value)
+                    df_display[col] = converter_para_numerico(df_display[col])
 
             # Reordenar colunas para que Estoque fique entre Quantidade e Custo
             cols = df_display.columns.tolist()
@@ -566,16 +534,12 @@ class ComexProdutosController:
                 st.metric("💰 Valor Total", f"R$ {format_br_number(total_valor, 2)}")
             with col4:
                 # Botão Excel
-                buffer_excel = io.BytesIO()
-                with pd.ExcelWriter(buffer_excel, engine="xlsxwriter") as writer:
-                    df_display.to_excel(writer, index=False, sheet_name="Produtos")
-
-                st.download_button(
+                lazy_download_button(
                     label="📊 Excel",
-                    data=buffer_excel.getvalue(),
+                    name="comex_produtos_excel",
+                    df=df_display,
+                    builder=lambda: export_excel(df_display, sheet_name="Produtos"),
                     file_name=f"comex_produtos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True,
                 )
             with col5:
                 # Botão CSV
@@ -1,24 +1,41 @@
 # estoque.py
 import locale
-from io import BytesIO
 
 import pandas as pd
 import streamlit as st
-from st_aggrid import AgGrid, GridOptionsBuilder
+from st_aggrid import GridOptionsBuilder
 
-from service import DataService
+from core.runtime import runtime
+from infrastructure.database.freshness import freshness_monitor
+from infrastructure.export.excel import ExcelColumn, export_excel
+from presentation.components.data_grid import PagedDataGrid
+from presentation.components.downloads import lazy_download_button
 from utils.style_utils import apply_default_style
 
-# Tentar configurar a localidade
-try:
-    locale.setlocale(locale.LC_ALL, "pt_BR.UTF-8")
-except locale.Error:
-    # st.warning("A localidade 'pt_BR.UTF-8' não está disponível. Usando a localidade padrão.")
-    locale.setlocale(locale.LC_ALL, "C")  # ou 'en_US.UTF-8'
+
+def configure_locale():
+    """
+    Configura localização para formato brasileiro
+
+    Chamada em main(), não na importação: o módulo pode ser importado pelo
+    pré-carregamento em uma thread de core.jobs, e setlocale vale para o
+    processo inteiro.
+    """
+    try:
+        locale.setlocale(locale.LC_ALL, "pt_BR.UTF-8")
+    except locale.Error:
+        # st.warning("A localidade 'pt_BR.UTF-8' não está disponível. Usando a localidade padrão.")
+        locale.setlocale(locale.LC_ALL, "C")  # ou 'en_US.UTF-8'
 
 
-@st.cache_data
-def load_data(_service, table_name, fields):
+@st.cache_data(max_entries=8)
+def load_data(_service, table_name, fields, versao=None):
+    """
+    Carrega dados do estoque com cache
+
+    O cache é revalidado apenas quando `versao` muda, ou seja, quando o RPA
+    de estoque executa (ver freshness_monitor)
+    """
     with st.spinner("Carregando dados..."):
         return _service.get_data(table_name, fields)
 
@@ -27,34 +44,10 @@ def download_excel(df):
     """
     Função para gerar arquivo Excel com formatação adequada
     """
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        # Formatar números antes de exportar
-        df_formatted = df.copy()
-        if "ValorCusto" in df.columns:
-            df_formatted["ValorCusto"] = df_formatted["ValorCusto"].apply(
-                lambda x: format_currency(x) if pd.notnull(x) else ""
-            )
-        if "ValorVenda" in df.columns:
-            df_formatted["ValorVenda"] = df_formatted["ValorVenda"].apply(
-                lambda x: format_currency(x) if pd.notnull(x) else ""
-            )
-        if "EstoqueGalpao" in df.columns:
-            df_formatted["EstoqueGalpao"] = df_formatted["EstoqueGalpao"].apply(
-                lambda x: format_number(x) if pd.notnull(x) else ""
-            )
-
-        df_formatted.to_excel(writer, index=False, sheet_name="Relatório")
-
-        # Ajustar largura das colunas
-        worksheet = writer.sheets["Relatório"]
-        for idx, col in enumerate(df_formatted.columns):
-            max_length = (
-                max(df_formatted[col].astype(str).apply(len).max(), len(str(col))) + 2
-            )
-            worksheet.column_dimensions[chr(65 + idx)].width = max_length
-
-    return output.getvalue()
+    # Valores como números com formato do Excel, sem formatar célula a célula
+    tipos = {"ValorCusto": "moeda", "ValorVenda": "moeda", "EstoqueGalpao": "inteiro"}
+    colunas = [ExcelColumn(str(col), kind=tipos.get(col, "auto")) for col in df.columns]
+    return export_excel(df, colunas, sheet_name="Relatório")
 
 
 def format_currency(value):
@@ -71,16 +64,14 @@ def format_number(value):
     return locale.format_string("%.0f", value, grouping=True)
 
 
-def calculate_totals(data):
-    # Converter valores para numérico antes de somar
-    estoque = pd.to_numeric(data["EstoqueGalpao"], errors="coerce")
-    valor_custo = pd.to_numeric(data["ValorCusto"], errors="coerce")
-    valor_venda = pd.to_numeric(data["ValorVenda"], errors="coerce")
+def calculate_totals(resultado):
+    # Somas das linhas filtradas no servidor (cache por filtro em grid_totals)
+    totais = resultado.totals(["EstoqueGalpao", "ValorCusto", "ValorVenda"])
 
     return {
-        "total_produtos": float(estoque.sum()),
-        "total_custo": float(valor_custo.sum()),
-        "total_venda": float(valor_venda.sum()),
+        "total_produtos": totais.sums["EstoqueGalpao"],
+        "total_custo": totais.sums["ValorCusto"],
+        "total_venda": totais.sums["ValorVenda"],
     }
 
 
@@ -102,12 +93,12 @@ def display_totals(totals, df):
             st.metric(label="Total Venda", value=format_currency(totals["total_venda"]))
         with col_button:
             st.write("")  # Espaço para alinhar verticalmente com as métricas
-            if st.download_button(
+            if lazy_download_button(
                 label="📥 Baixar Excel",
-                data=download_excel(df),
+                name="estoque_excel",
+                df=df,
+                builder=lambda: download_excel(df),
                 file_name="relatorio_estoque.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True,  # Faz o botão usar a largura total da coluna
             ):
                 st.success("Download iniciado!")
 
@@ -166,6 +157,8 @@ def create_grid_options(df):
 
 
 def main(key=None):
+    configure_locale()
+
     # Aplica o estilo padrão
     apply_default_style()
 
@@ -178,7 +171,7 @@ def main(key=None):
             st.session_state.totals = None
 
         # Carregar dados com indicador de progresso
-        data_service = DataService()
+        data_service = runtime.data_service
         table_name = "Produtos"
         campos = [
             "CodigoInterno",
@@ -192,12 +185,13 @@ def main(key=None):
             "Localizacao",
         ]
 
-        # Adicionar cache com TTL de 5 minutos
-        @st.cache_data(ttl=300)
-        def get_cached_data():
-            return load_data(data_service, table_name, campos)
-
-        df = get_cached_data()
+        # Cache revalidado somente após nova ingestão do RPA de estoque
+        df = load_data(
+            data_service,
+            table_name,
+            campos,
+            versao=freshness_monitor.get_version("estoque"),
+        )
 
         # Converter colunas numéricas
         df["EstoqueGalpao"] = pd.to_numeric(df["EstoqueGalpao"], errors="coerce")
@@ -207,27 +201,19 @@ def main(key=None):
         # Container para os totalizadores
         totals_container = st.container()
 
-        # Renderizar o grid
+        # Renderizar o grid (paginado no servidor: só a página vai ao navegador)
         with st.spinner("Carregando grid..."):
-            grid_options = create_grid_options(df)
-            grid_response = AgGrid(
-                df,
-                gridOptions=grid_options,
-                height=800,
-                fit_columns_on_grid_load=True,
-                theme="alpine",
-                allow_unsafe_jscode=True,
-                reload_data=True,
-                key=f"grid_{key}",  # Chave única para o grid
+            resultado = PagedDataGrid(height=800).render(
+                df, key=f"grid_{key}", grid_options=create_grid_options(df)
             )
 
-        # Atualizar totalizadores
-        st.session_state.totals = calculate_totals(grid_response["data"])
+        # Atualizar totalizadores com todas as linhas filtradas
+        st.session_state.totals = calculate_totals(resultado)
 
         # Exibir totalizadores no container do topo
         with totals_container:
             if st.session_state.totals:
-                display_totals(st.session_state.totals, grid_response["data"])
+                display_totals(st.session_state.totals, resultado.data)
         st.markdown("---")
 
     except Exception as e:
@@ -1,16 +1,21 @@
 import locale
+import logging
 from datetime import date, datetime
-from io import BytesIO
 
-import openpyxl
 import pandas as pd
 import streamlit as st
 from dateutil.relativedelta import relativedelta
-from st_aggrid import AgGrid, GridOptionsBuilder
+from st_aggrid import GridOptionsBuilder
 
-from service import DataService
+from core.runtime import runtime
+from infrastructure.database.freshness import freshness_monitor
+from infrastructure.export.excel import ExcelColumn, export_excel
+from presentation.components.data_grid import PagedDataGrid
+from presentation.components.downloads import lazy_download_button
 from utils.style_utils import apply_default_style
 
+logger = logging.getLogger(__name__)
+
 
 class ExtratosReport:
     """
@@ -21,7 +26,7 @@ class ExtratosReport:
     def __init__(self):
         self.configure_locale()
         self.configure_page()
-        self.data_service = DataService()
+        self.data_service = runtime.data_service
 
     def configure_locale(self):
         """Configura localização para formato brasileiro"""
@@ -45,13 +50,20 @@ class ExtratosReport:
         st.markdown(hide_st_style, unsafe_allow_html=True)
 
     @staticmethod
-    @st.cache_data(ttl=300)
+    @st.cache_data(max_entries=32)
     def load_data(
-        data_inicial=None, data_final=None, empresas=None, centros_custo=None
+        data_inicial=None,
+        data_final=None,
+        empresas=None,
+        centros_custo=None,
+        versao=None,
     ):
         """
         Carrega dados dos extratos com cache
         Implementa filtros dinâmicos
+
+        O cache é revalidado apenas quando `versao` muda, ou seja, quando o
+        RPA de extratos executa (ver freshness_monitor)
         """
         with st.spinner("Carregando dados..."):
             if not data_inicial:
@@ -61,7 +73,7 @@ class ExtratosReport:
             if not data_final:
                 data_final = date.today().strftime("%Y-%m-%d")
 
-            return DataService().get_extratos_filtrados(
+            return runtime.data_service.get_extratos_filtrados(
                 data_inicial=data_inicial,
                 data_final=data_final,
                 empresas=empresas,
@@ -100,32 +112,21 @@ class ExtratosReport:
         except (ValueError, TypeError, AttributeError):
             return str(value)
 
-    def calculate_totals(self, data):
-        """Calcula totalizadores dos extratos"""
-        if data.empty or "valor" not in data.columns or "D/C" not in data.columns:
+    def calculate_totals(self, resultado):
+        """Calcula totalizadores das linhas filtradas na grade (servidor)"""
+        colunas = resultado.source.columns
+        if resultado.data.empty or "valor" not in colunas or "D/C" not in colunas:
             return {"total_credito": 0, "total_debito": 0, "total_geral": 0}
 
-        # Converte valores para numérico, tratando strings formatadas
-        def convert_to_numeric(x):
-            if isinstance(x, str):
-                try:
-                    return float(
-                        x.replace("R$", "").replace(".", "").replace(",", ".").strip()
-                    )
-                except ValueError:
-                    return 0
-            return x
-
-        valor = data["valor"].apply(convert_to_numeric)
-        debitos = valor[data["D/C"] == "D"].sum()
-        creditos = valor[data["D/C"] == "C"].sum()
-
-        total_geral = creditos - debitos
+        # Somas por D/C vetorizadas, com cache por filtro (grid_totals)
+        totais = resultado.totals(["valor"], by="D/C")
+        creditos = totais.group("C").sums["valor"]
+        debitos = totais.group("D").sums["valor"]
 
         return {
-            "total_credito": float(creditos) if not pd.isna(creditos) else 0,
-            "total_debito": float(debitos) if not pd.isna(debitos) else 0,
-            "total_geral": float(total_geral) if not pd.isna(total_geral) else 0,
+            "total_credito": creditos,
+            "total_debito": debitos,
+            "total_geral": creditos - debitos,
         }
 
     def create_grid_options(self, df):
@@ -227,16 +228,14 @@ class ExtratosReport:
             with col_button:
                 st.write("")
                 if not df.empty:
-                    excel_data = self.generate_excel(df)
-                    if excel_data:
-                        if st.download_button(
-                            label="📥 Baixar Excel",
-                            data=excel_data,
-                            file_name=f"extratos_{date.today().strftime('%d%m%Y')}.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                            use_container_width=True,
-                        ):
-                            st.success("Download iniciado!")
+                    if lazy_download_button(
+                        label="📥 Baixar Excel",
+                        name="extratos_excel",
+                        df=df,
+                        builder=lambda: self.generate_excel(df),
+                        file_name=f"extratos_{date.today().strftime('%d%m%Y')}.xlsx",
+                    ):
+                        st.success("Download iniciado!")
                 else:
                     st.warning("Não há dados para exportar.")
 
@@ -246,56 +245,18 @@ class ExtratosReport:
             return None
 
         try:
-            output = BytesIO()
-
-            # Criar um novo workbook e selecionar a planilha ativa
-            workbook = openpyxl.Workbook()
-            worksheet = workbook.active
-            worksheet.title = "Extratos"
-
-            # Preparar dados formatados
-            df_formatted = df.copy()
-
-            # Formatação dos valores e datas
-            for index, row in df_formatted.iterrows():
-                # Formata valor
-                if "valor" in df_formatted.columns:
-                    df_formatted.at[index, "valor"] = self.format_currency(row["valor"])
-
-                # Formata data
-                if "data" in df_formatted.columns:
-                    df_formatted.at[index, "data"] = self.format_date(row["data"])
-
-            # Escrever cabeçalhos
-            for col_idx, column in enumerate(df_formatted.columns, start=1):
-                cell = worksheet.cell(row=1, column=col_idx)
-                cell.value = column
-
-            # Escrever dados
-            for row_idx, row in enumerate(df_formatted.values, start=2):
-                for col_idx, value in enumerate(row, start=1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    cell.value = str(value) if pd.notnull(value) else ""
-
-            # Ajustar largura das colunas
-            for col_idx, column in enumerate(df_formatted.columns, start=1):
-                max_length = (
-                    max(
-                        df_formatted[column].astype(str).apply(len).max(),
-                        len(str(column)),
-                    )
-                    + 2
-                )
-                worksheet.column_dimensions[
-                    openpyxl.utils.get_column_letter(col_idx)
-                ].width = max_length
-
-            # Salvar o workbook
-            workbook.save(output)
-            return output.getvalue()
+            # Valor e data vão como números com formato brasileiro do Excel
+            tipos = {"valor": "moeda", "data": "data"}
+            colunas = [
+                ExcelColumn(str(col), kind=tipos.get(col, "texto"))
+                for col in df.columns
+            ]
+            return export_excel(df, colunas, sheet_name="Extratos")
 
         except Exception as e:
-            st.error(f"Erro ao gerar arquivo Excel: {str(e)}")
+            # Builder de lazy_download_button: roda em thread de core.jobs,
+            # sem Streamlit; sem arquivo, o botão de download mostra a falha
+            logger.error(f"Error generating Excel file: {str(e)}")
             return None
 
     def run(self, key=None):
@@ -306,12 +267,21 @@ class ExtratosReport:
             # Renderizar filtros
             filtros = self.render_filters()
 
-            # Verifica se os filtros foram alterados
-            if "filtros" not in st.session_state or st.session_state.filtros != filtros:
+            # Versão dos dados: muda apenas após nova ingestão do RPA
+            versao = freshness_monitor.get_version("extratos")
+
+            # Verifica se os filtros ou os dados de origem foram alterados
+            if (
+                "filtros" not in st.session_state
+                or st.session_state.filtros != filtros
+                or st.session_state.get("extratos_versao") != versao
+            ):
                 st.session_state.filtros = filtros
+                st.session_state.extratos_versao = versao
                 st.session_state.df = self.load_data(
                     data_inicial=filtros["data_inicial"],
                     data_final=filtros["data_final"],
+                    versao=versao,
                 )
 
             # Obtém os dados filtrados
@@ -333,28 +303,17 @@ class ExtratosReport:
             # Configura as opções do grid
             grid_options = self.create_grid_options(df)
 
-            # Placeholder para o grid
-            grid_placeholder = st.empty()
-
             with st.spinner("Carregando grid..."):
-                # Renderiza o grid dentro do placeholder
-                with grid_placeholder:
-                    grid_response = AgGrid(
-                        df,
-                        gridOptions=grid_options,
-                        height=800,
-                        fit_columns_on_grid_load=True,
-                        theme="alpine",
-                        allow_unsafe_jscode=True,
-                        reload_data=True,
-                        key=f"grid_{filtros['data_inicial']}_{filtros['data_final']}",  # Chave única baseada nas datas
-                    )
+                # Paginado no servidor: só a página visível vai ao navegador
+                resultado = PagedDataGrid(height=800).render(
+                    df, key=f"grid_{key or 'extratos'}", grid_options=grid_options
+                )
 
             # Calcular e exibir totalizadores
-            totals = self.calculate_totals(grid_response["data"])
+            totals = self.calculate_totals(resultado)
 
             with totals_container:
-                self.render_totals(totals, grid_response["data"])
+                self.render_totals(totals, resultado.data)
 
             st.markdown("---")
 
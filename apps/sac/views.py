@@ -3,7 +3,6 @@ SGR - Módulo SAC - Ordem de Serviço
 Dashboard para visualização e gestão de Ordens de Serviço
 """
 
-import io
 import logging
 from datetime import datetime
 
@@ -11,7 +10,15 @@ import pandas as pd
 import streamlit as st
 from st_aggrid import AgGrid, GridOptionsBuilder
 
-from infrastructure.database.repositories_sac import SacAtualizacaoRepository
+from core.session_data import session_data
+from infrastructure.database.repositories_sac import (
+    OSRepository,
+    SacAtualizacaoRepository,
+)
+from infrastructure.export.excel import export_excel
+from presentation.components.data_grid import PagedDataGrid
+from presentation.components.downloads import lazy_download_button
+from utils.memory import compactar_dataframe
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +29,7 @@ class OSController:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.atualizacao_repository = SacAtualizacaoRepository()
+        self.os_repository = OSRepository()
 
     def render_dashboard(self):
         """Renderiza dashboard principal de OS"""
@@ -33,11 +41,7 @@ class OSController:
             )
             st.markdown("---")
 
-            # Inicializar dados na sessão
-            if "os_df" not in st.session_state:
-                st.session_state.os_df = None
-            if "os_df_total" not in st.session_state:
-                st.session_state.os_df_total = None
+            # Inicializar dados na sessão (os_df fica em session_data)
             if "os_selected_ids" not in st.session_state:
                 st.session_state.os_selected_ids = None
 
@@ -157,14 +161,9 @@ class OSController:
     def _get_situacoes_disponiveis(self):
         """Retorna lista de situações disponíveis"""
         try:
-            from app.models import OS
-
-            situacoes = (
-                OS.objects.values_list("SituacaoNome", flat=True)
-                .distinct()
-                .order_by("SituacaoNome")
-            )
-            return list(situacoes)
+            # Mesma agregação (cacheada) usada no resumo
+            contagem = self.os_repository.get_contagem_por_situacao()
+            return contagem["SituacaoNome"].dropna().tolist()
         except Exception as e:
             self.logger.error(f"Erro ao carregar situações: {str(e)}")
             return []
@@ -195,13 +194,8 @@ class OSController:
             # Converter para DataFrame
             df = self._queryset_to_dataframe(queryset)
 
-            # Carregar dados totais (sem filtro) para métricas
-            queryset_total = OS.objects.all()
-            df_total = self._queryset_to_dataframe(queryset_total)
-
             # Limpar TODOS os dados antigos para forçar atualização
-            st.session_state.os_df = df.copy()
-            st.session_state.os_df_total = df_total.copy()
+            self._guardar_os(df, lambda: self._queryset_to_dataframe(queryset))
             st.session_state.os_selected_ids = None  # Limpar seleção anterior
 
             # Forçar limpeza de cache da grid
@@ -229,9 +223,9 @@ class OSController:
                 queryset = OS.objects.all()
                 df = self._queryset_to_dataframe(queryset)
 
-                # Dados totais são os mesmos quando carrega tudo
-                st.session_state.os_df = df.copy()
-                st.session_state.os_df_total = df.copy()
+                self._guardar_os(
+                    df, lambda: self._queryset_to_dataframe(OS.objects.all())
+                )
                 st.session_state.os_selected_ids = None
 
                 # Limpar cache da grid
@@ -260,12 +254,13 @@ class OSController:
                 queryset = OS.objects.filter(Data__gte=primeiro_dia, Data__lte=hoje)
                 df = self._queryset_to_dataframe(queryset)
 
-                # Carregar dados totais (sem filtro) para métricas
-                queryset_total = OS.objects.all()
-                df_total = self._queryset_to_dataframe(queryset_total)
-
-                st.session_state.os_df = df
-                st.session_state.os_df_total = df_total
+                # Métricas totais vêm de agregações no banco (_render_metrics)
+                self._guardar_os(
+                    df,
+                    lambda: self._queryset_to_dataframe(
+                        OS.objects.filter(Data__gte=primeiro_dia, Data__lte=hoje)
+                    ),
+                )
 
                 if show_message and not df.empty:
                     st.success(
@@ -276,6 +271,10 @@ class OSController:
             st.error(f"❌ Erro ao carregar dados do mês atual: {str(e)}")
             self.logger.error(f"Erro ao carregar mês atual: {str(e)}")
 
+    def _guardar_os(self, df, carregar):
+        """Guarda as OS na sessão com a função que as recarrega se descartadas"""
+        session_data.put("os_df", df, module="sac", loader=carregar)
+
     def _queryset_to_dataframe(self, queryset):
         """Converte queryset para DataFrame"""
         try:
@@ -304,17 +303,29 @@ class OSController:
                 df["Referencia"] = df["Referencia"].fillna("").astype(str).str.strip()
                 df["Referencia"] = df["Referencia"].replace("None", "")
 
-            return df
+            # Situação, cliente e data se repetem entre as OS
+            return compactar_dataframe(
+                df, colunas_categoricas=["SituacaoNome", "ClienteNome", "Data"]
+            )
 
         except Exception as e:
             self.logger.error(f"Erro ao converter queryset: {str(e)}")
             return pd.DataFrame()
 
     def _render_metrics(self):
-        """Renderiza métricas resumidas - sempre com dados totais"""
-        df_total = st.session_state.os_df_total
+        """Renderiza métricas resumidas - sempre sobre todas as OS
 
-        if df_total is None or df_total.empty:
+        Os totais são agregados no banco (COUNT/GROUP BY) e compartilhados
+        pelo cache de queries, sem trazer o histórico de OS para a sessão.
+        """
+        try:
+            resumo = self.os_repository.get_resumo_os()
+            contagem = self.os_repository.get_contagem_por_situacao()
+        except Exception as e:
+            self.logger.error(f"Erro ao carregar resumo das OS: {str(e)}")
+            return
+
+        if not resumo.get("total"):
             return
 
         st.markdown("---")
@@ -323,33 +334,35 @@ class OSController:
         col1, col2, col3, col4 = st.columns(4)
 
         with col1:
-            st.metric("Total de OS", len(df_total))
+            st.metric("Total de OS", int(resumo["total"]))
 
         with col2:
-            if "SituacaoNome" in df_total.columns:
-                situacoes_unicas = df_total["SituacaoNome"].nunique()
-                st.metric("Situações Diferentes", situacoes_unicas)
+            st.metric("Situações Diferentes", int(resumo["situacoes"]))
 
         with col3:
-            if "ClienteNome" in df_total.columns:
-                clientes_unicos = df_total["ClienteNome"].nunique()
-                st.metric("Clientes Únicos", clientes_unicos)
+            st.metric("Clientes Únicos", int(resumo["clientes"]))
 
         with col4:
-            if "Data" in df_total.columns:
-                # Calcular período
-                try:
-                    datas = pd.to_datetime(df_total["Data"], format="%d/%m/%Y")
-                    periodo_dias = (datas.max() - datas.min()).days
-                    st.metric("Período (dias)", periodo_dias)
-                except:
-                    st.metric("Período", "N/A")
+            data_inicial = resumo.get("data_inicial")
+            data_final = resumo.get("data_final")
+            if data_inicial and data_final:
+                st.metric("Período (dias)", (data_final - data_inicial).days)
+            else:
+                st.metric("Período", "N/A")
+
+        if not contagem.empty:
+            with st.expander("Quantidade de OS por Situação"):
+                st.dataframe(
+                    contagem.rename(columns={"SituacaoNome": "Situação"}),
+                    hide_index=True,
+                    use_container_width=True,
+                )
 
         st.markdown("---")
 
     def _render_data_table(self):
         """Renderiza tabela de dados usando AgGrid"""
-        df = st.session_state.os_df
+        df = session_data.get("os_df")
 
         if df is None or df.empty:
             st.info(
@@ -445,33 +458,17 @@ class OSController:
 
             grid_options = gb.build()
 
-            # Gerar chave única baseada nos dados para forçar atualização
-            import hashlib
-
-            grid_key = hashlib.md5(
-                str(df_display.values.tolist()).encode()
-            ).hexdigest()[:8]
-
-            # Renderizar AgGrid com chave dinâmica
-            grid_response = AgGrid(
-                df_display,
-                gridOptions=grid_options,
-                height=400,
-                fit_columns_on_grid_load=True,
-                theme="alpine",
-                update_mode="MODEL_CHANGED",
-                key=f"os_grid_{grid_key}",
+            # Paginado no servidor: só a página visível vai ao navegador
+            resultado = PagedDataGrid(height=400).render(
+                df_display, key="os_grid", grid_options=grid_options
             )
+            filtered_df = resultado.data
 
-            # Capturar OS_Codigo das OS filtradas na grid (usa "OS Código" que contém o OS_Codigo)
-            if grid_response and "data" in grid_response:
-                filtered_df = pd.DataFrame(grid_response["data"])
-                if not filtered_df.empty and "OS Código" in filtered_df.columns:
-                    st.session_state.os_selected_ids = filtered_df["OS Código"].tolist()
-                else:
-                    # Se não houver filtro aplicado, usar todos os OS_Codigo
-                    if "OS_Codigo" in df.columns:
-                        st.session_state.os_selected_ids = df["OS_Codigo"].tolist()
+            # OS_Codigo de todas as OS que atendem aos filtros (usa "OS Código")
+            if "OS Código" in filtered_df.columns:
+                st.session_state.os_selected_ids = filtered_df["OS Código"].tolist()
+            elif "OS_Codigo" in df.columns:
+                st.session_state.os_selected_ids = df["OS_Codigo"].tolist()
 
             # Seção de download
             st.markdown("---")
@@ -480,7 +477,7 @@ class OSController:
 
             with col1:
                 # Download CSV
-                csv_data = df_display.to_csv(index=False)
+                csv_data = filtered_df.to_csv(index=False)
                 st.download_button(
                     label="📄 Download CSV",
                     data=csv_data,
@@ -491,16 +488,12 @@ class OSController:
 
             with col2:
                 # Download Excel
-                buffer = io.BytesIO()
-                with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-                    df_display.to_excel(writer, index=False, sheet_name="OS")
-
-                st.download_button(
+                lazy_download_button(
                     label="📊 Download Excel",
-                    data=buffer.getvalue(),
+                    name="sac_os_excel",
+                    df=filtered_df,
+                    builder=lambda: export_excel(filtered_df, sheet_name="OS"),
                     file_name=f"os_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                    mime="application/vnd.ms-excel",
-                    use_container_width=True,
                 )
 
         except ImportError:
@@ -694,16 +687,12 @@ class OSController:
 
             with col2:
                 # Download Excel
-                buffer = io.BytesIO()
-                with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-                    df_produtos.to_excel(writer, index=False, sheet_name="Produtos")
-
-                st.download_button(
+                lazy_download_button(
                     label="📊 Download Excel",
-                    data=buffer.getvalue(),
+                    name="sac_produtos_excel",
+                    df=df_produtos,
+                    builder=lambda: export_excel(df_produtos, sheet_name="Produtos"),
                     file_name=f"produtos_os_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                    mime="application/vnd.ms-excel",
-                    use_container_width=True,
                 )
 
         except ImportError:
@@ -3,22 +3,33 @@ SGR - Módulo Vendas - Relatório de Pedidos
 Exibe pedidos de vendas com filtros de data, prazo de entrega, situação e vendedor
 """
 
-import io
 import logging
 import traceback
 from datetime import date, datetime
+from typing import Optional
 
 import pandas as pd
 import streamlit as st
 
 # Imports da aplicação
 try:
-    from core.container_vendas import DIContainer
     from core.exceptions import BusinessLogicError, SGRException, ValidationError
+    from core.runtime import runtime
+    from core.session_data import session_data
+    from infrastructure.database.query_cache import query_cache
+    from infrastructure.export.excel import (
+        CABECALHO_DESTAQUE,
+        ExcelColumn,
+        export_excel,
+    )
+    from presentation.components.downloads import lazy_download_button
     from presentation.styles.theme_simple import apply_theme
 except ImportError as e:
     st.error(f"❌ Erro crítico de importação: {e}")
     st.stop()
+    # Sem contexto do script (pré-carregamento em core.jobs) st.stop() não
+    # interrompe: a falha volta para o registro de módulos
+    raise
 
 
 class PedidosController:
@@ -32,7 +43,8 @@ class PedidosController:
     def _initialize_services(self):
         """Inicializa serviços com tratamento de erro"""
         try:
-            self.container = DIContainer()
+            # Runtime do processo: container e serviço criados uma única vez
+            self.container = runtime.vendas_container
             self.container.get_vendas_service()
             self.logger.info("Serviços de vendas (Pedidos) inicializados com sucesso")
         except Exception as e:
@@ -55,9 +67,8 @@ class PedidosController:
                 st.error("❌ Erro ao conectar com o banco de dados")
                 return
 
-            # Inicializar estado da sessão
-            if "pedidos_df" not in st.session_state:
-                st.session_state.pedidos_df = None
+            # Inicializar estado da sessão (pedidos_df fica em session_data)
+            if "pedidos_load_count" not in st.session_state:
                 st.session_state.pedidos_load_count = 0
                 self._auto_load_current_month()
 
@@ -145,9 +156,9 @@ class PedidosController:
         with st.expander("Configurar Filtros", expanded=True):
             self._render_filters()
 
-        df = st.session_state.get("pedidos_df")
+        df = session_data.get("pedidos_df")
         if df is not None and not df.empty:
-            self._render_data_table()
+            self._render_data_table(df)
         elif df is not None and df.empty:
             st.warning("⚠️ Nenhum pedido encontrado para os filtros selecionados.")
         else:
@@ -287,6 +298,64 @@ class PedidosController:
         if _should_rerun:
             st.rerun()
 
+    def _build_query(
+        self,
+        data_inicio: date,
+        data_fim: date,
+        prazo_inicio,
+        prazo_fim,
+        situacao,
+        vendedor,
+        condicao_pagamento=None,
+    ):
+        """Monta a query de pedidos com os filtros informados
+
+        Returns:
+            tuple: (query, params)
+        """
+        query = """
+            SELECT
+                "Codigo",
+                "ClienteNome",
+                "VendedorNome",
+                "Data",
+                "PrazoEntrega",
+                "SituacaoNome",
+                "ValorTotal"
+            FROM "Vendas"
+            WHERE "Data"::DATE BETWEEN %s AND %s
+            AND TRIM("VendedorNome") IN (SELECT "Nome" FROM "Vendedores")
+        """
+        params = [data_inicio, data_fim]
+
+        # Filtro de Prazo de Entrega
+        # NULLIF trata strings vazias ("") como NULL, evitando erro de cast
+        if prazo_inicio:
+            query += " AND NULLIF(TRIM(\"PrazoEntrega\"), '')::DATE >= %s"
+            params.append(prazo_inicio)
+        if prazo_fim:
+            query += " AND NULLIF(TRIM(\"PrazoEntrega\"), '')::DATE <= %s"
+            params.append(prazo_fim)
+
+        # Filtro de Situação
+        if situacao:
+            query += ' AND "SituacaoNome" = %s'
+            params.append(situacao)
+
+        # Filtro de Vendedor
+        if vendedor:
+            query += ' AND "VendedorNome" = %s'
+            params.append(vendedor)
+
+        # Filtro de Condição de Pagamento
+        if condicao_pagamento:
+            query += ' AND "CondicaoPagamento" = %s'
+            params.append(condicao_pagamento)
+
+        query += ' ORDER BY "Data" DESC, "Codigo" ASC'
+
+        return query, tuple(params)
+
     def _load_pedidos_data(
         self,
         data_inicio: date,
@@ -306,79 +375,53 @@ class PedidosController:
         a atualização da tela.
         """
         try:
-            from django.db import connection
-
-            query = """
-                SELECT
-                    "Codigo",
-                    "ClienteNome",
-                    "VendedorNome",
-                    "Data",
-                    "PrazoEntrega",
-                    "SituacaoNome",
-                    "ValorTotal"
-                FROM "Vendas"
-                WHERE "Data"::DATE BETWEEN %s AND %s
-                AND TRIM("VendedorNome") IN (SELECT "Nome" FROM "Vendedores")
-            """
-            params = [data_inicio, data_fim]
-
-            # Filtro de Prazo de Entrega
-            # NULLIF trata strings vazias ("") como NULL, evitando erro de cast
-            if prazo_inicio:
-                query += " AND NULLIF(TRIM(\"PrazoEntrega\"), '')::DATE >= %s"
-                params.append(prazo_inicio)
-            if prazo_fim:
-                query += " AND NULLIF(TRIM(\"PrazoEntrega\"), '')::DATE <= %s"
-                params.append(prazo_fim)
-
-            # Filtro de Situação
-            if situacao:
-                query += ' AND "SituacaoNome" = %s'
-                params.append(situacao)
-
-            # Filtro de Vendedor
-            if vendedor:
-                query += ' AND "VendedorNome" = %s'
-                params.append(vendedor)
-
-            # Filtro de Condição de Pagamento
-            if condicao_pagamento:
-                query += ' AND "CondicaoPagamento" = %s'
-                params.append(condicao_pagamento)
-
-            query += ' ORDER BY "Data" DESC, "Codigo" ASC'
+            from infrastructure.database.streaming import read_query_frame
+
+            query, params = self._build_query(
+                data_inicio,
+                data_fim,
+                prazo_inicio,
+                prazo_fim,
+                situacao,
+                vendedor,
+                condicao_pagamento,
+            )
 
-            with connection.cursor() as cursor:
-                cursor.execute(query, params)
-                columns = [col[0] for col in cursor.description]
-                data = cursor.fetchall()
+            def _executar_query() -> pd.DataFrame:
+                return read_query_frame(query, params)
+
+            def _carregar() -> pd.DataFrame:
+                # Resultado compartilhado entre sessões (invalidado pela ingestão do RPA)
+                df = query_cache.get_or_load(
+                    "pedidos",
+                    {
+                        "data_inicio": data_inicio,
+                        "data_fim": data_fim,
+                        "prazo_inicio": prazo_inicio,
+                        "prazo_fim": prazo_fim,
+                        "situacao": situacao,
+                        "vendedor": vendedor,
+                        "condicao_pagamento": condicao_pagamento,
+                    },
+                    _executar_query,
+                )
+                return self._formatar_pedidos(df)
 
-            df = pd.DataFrame(data, columns=columns)
+            df = _carregar()
 
             if df.empty:
-                st.session_state.pedidos_df = pd.DataFrame()
+                session_data.put("pedidos_df", pd.DataFrame(), module="pedidos")
+                st.session_state.pop("pedidos_consulta", None)
                 if not auto:
                     st.warning(
                         "⚠️ Nenhum pedido encontrado para os filtros selecionados."
                     )
                 return
 
-            # Formatar datas para DD/MM/YYYY
-            for col_data in ["Data", "PrazoEntrega"]:
-                if col_data in df.columns:
-                    df[col_data] = pd.to_datetime(
-                        df[col_data], errors="coerce"
-                    ).dt.strftime("%d/%m/%Y")
-                    df[col_data] = df[col_data].fillna("")
-
-            # Garantir ValorTotal como float
-            if "ValorTotal" in df.columns:
-                df["ValorTotal"] = pd.to_numeric(
-                    df["ValorTotal"], errors="coerce"
-                ).fillna(0.0)
-
-            st.session_state.pedidos_df = df
+            # Se descartado por falta de memória, é recarregado do cache de queries
+            session_data.put("pedidos_df", df, module="pedidos", loader=_carregar)
+            # Exportação Excel relê a mesma consulta em blocos
+            st.session_state["pedidos_consulta"] = (query, params)
             # Incrementa contador para forçar recriação do AgGrid com nova key
             st.session_state.pedidos_load_count = (
                 st.session_state.get("pedidos_load_count", 0) + 1
@@ -394,6 +437,34 @@ class PedidosController:
             self.logger.error(f"Erro ao carregar pedidos: {str(e)}")
             self.logger.error(traceback.format_exc())
 
+    @staticmethod
+    def _formatar_pedidos(df: pd.DataFrame) -> pd.DataFrame:
+        """Formata datas como DD/MM/YYYY e ValorTotal como float"""
+        for col_data in ["Data", "PrazoEntrega"]:
+            if col_data in df.columns:
+                df[col_data] = pd.to_datetime(
+                    df[col_data], errors="coerce"
+                ).dt.strftime("%d/%m/%Y")
+                df[col_data] = df[col_data].fillna("")
+
+        # Garantir ValorTotal como float
+        if "ValorTotal" in df.columns:
+            valores = pd.to_numeric(df["ValorTotal"], errors="coerce")
+            df["ValorTotal"] = valores.fillna(0.0)
+
+        return df
+
+    def _iter_pedidos(self, query: str, params: tuple):
+        """Relê os pedidos em blocos (cursor nomeado), já formatados
+
+        Usado pela exportação, que roda em uma thread de core.jobs: o
+        resultado vai para o arquivo sem montar o DataFrame completo.
+        """
+        from infrastructure.database.repositories import DatabaseRepository
+
+        for bloco in DatabaseRepository().execute_query_chunks(query, params):
+            yield self._formatar_pedidos(bloco)
+
     def _format_br(self, valor: float, decimals: int = 2) -> str:
         """Formata número no padrão brasileiro (ponto como milhar, vírgula como decimal)"""
         if decimals == 0:
@@ -401,7 +472,7 @@ class PedidosController:
         formatted = f"{valor:,.{decimals}f}"
         return formatted.replace(",", "X").replace(".", ",").replace("X", ".")
 
-    def _generate_excel(self, df: pd.DataFrame) -> bytes:
+    def _generate_excel(self, df: pd.DataFrame, consulta=None) -> Optional[bytes]:
         """Gera Excel formatado no mesmo padrão visual do PDF:
         - Título e data de geração no topo
         - Cabeçalho azul (#1E88E5), texto branco, bold
@@ -410,326 +481,102 @@ class PedidosController:
         - ValorTotal alinhado à direita, formato moeda
         - Datas centralizadas
         - Grade com bordas cinzas
+
+        Com consulta (query, params), as linhas são relidas do banco em blocos
+        e escritas à medida que chegam; df fica para o Excel simples de
+        contingência.
         """
-        buffer = io.BytesIO()
+        colunas = [
+            ExcelColumn("Codigo", "Código", kind="texto", width=12),
+            ExcelColumn("ClienteNome", "Cliente", kind="texto", width=40),
+            ExcelColumn("VendedorNome", "Vendedor", kind="texto", width=25),
+            ExcelColumn("Data", "Data", kind="data", width=14),
+            ExcelColumn("PrazoEntrega", "Prazo Entrega", kind="data", width=16),
+            ExcelColumn(
+                "SituacaoNome", "Situação", kind="texto", width=22, total="TOTAL:"
+            ),
+            ExcelColumn(
+                "ValorTotal", "Valor Total", kind="moeda", width=16, total="soma"
+            ),
+        ]
         try:
-            import xlsxwriter
-
-            workbook = xlsxwriter.Workbook(buffer)
-            worksheet = workbook.add_worksheet("Pedidos")
-
-            NUM_COLS = 7
-            HEADER_ROW = 2
-            DATA_START = 3
-            DATE_COLS = {3, 4}  # Data, PrazoEntrega
-            VALOR_COL = 6  # ValorTotal
-
-            # ── Formatos ────────────────────────────────────────────────────────
-            fmt_title = workbook.add_format(
-                {
-                    "bold": True,
-                    "font_size": 14,
-                    "font_color": "#1E88E5",
-                    "align": "center",
-                    "valign": "vcenter",
-                }
-            )
-            fmt_subtitle = workbook.add_format(
-                {
-                    "italic": True,
-                    "font_size": 9,
-                    "font_color": "#757575",
-                    "align": "left",
-                    "valign": "vcenter",
-                }
-            )
-            # Cabeçalho de coluna — azul sólido, branco, bold
-            fmt_hdr = workbook.add_format(
-                {
-                    "bold": True,
-                    "font_size": 10,
-                    "font_color": "#FFFFFF",
-                    "bg_color": "#1E88E5",
-                    "align": "center",
-                    "valign": "vcenter",
-                    "border": 1,
-                    "border_color": "#BDBDBD",
-                }
-            )
-
-            def _make_fmt(bg, align="left", bold=False, num_format=None):
-                props = {
-                    "font_size": 9,
-                    "bg_color": bg,
-                    "border": 1,
-                    "border_color": "#BDBDBD",
-                    "align": align,
-                    "valign": "vcenter",
-                }
-                if bold:
-                    props["bold"] = True
-                if num_format:
-                    props["num_format"] = num_format
-                return workbook.add_format(props)
-
-            # Par (branco) / ímpar (cinza) — texto
-            fd0 = _make_fmt("#FFFFFF")
-            fd1 = _make_fmt("#F5F5F5")
-            # Par / ímpar — datas (centralizado)
-            fdate0 = _make_fmt("#FFFFFF", align="center")
-            fdate1 = _make_fmt("#F5F5F5", align="center")
-            # Par / ímpar — ValorTotal (moeda, direita)
-            MOEDA = '"R$ "#,##0.00'
-            fval0 = _make_fmt("#FFFFFF", align="right", num_format=MOEDA)
-            fval1 = _make_fmt("#F5F5F5", align="right", num_format=MOEDA)
-            # Linha de total
-            ftot_empty = _make_fmt("#E3F2FD", bold=True)
-            ftot_label = _make_fmt("#E3F2FD", align="right", bold=True)
-            ftot_valor = _make_fmt(
-                "#E3F2FD", align="right", bold=True, num_format=MOEDA
+            dados = self._iter_pedidos(*consulta) if consulta else df
+            return export_excel(
+                dados,
+                colunas,
+                sheet_name="Pedidos",
+                title="SGR - Relatório de Pedidos",
+                subtitle=f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M')}",
+                header_format=CABECALHO_DESTAQUE,
+                zebra=True,
+                borders=True,
+                freeze_header=False,
             )
 
-            # ── Larguras das colunas ─────────────────────────────────────────────
-            for col_idx, width in enumerate([12, 40, 25, 14, 16, 22, 16]):
-                worksheet.set_column(col_idx, col_idx, width)
-
-            # ── Título e data ────────────────────────────────────────────────────
-            worksheet.merge_range(
-                0, 0, 0, NUM_COLS - 1, "SGR - Relatório de Pedidos", fmt_title
-            )
-            worksheet.set_row(0, 24)
-
-            worksheet.merge_range(
-                1,
-                0,
-                1,
-                NUM_COLS - 1,
-                f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M')}",
-                fmt_subtitle,
-            )
-            worksheet.set_row(1, 16)
-
-            # ── Cabeçalhos ───────────────────────────────────────────────────────
-            headers = [
-                "Código",
-                "Cliente",
-                "Vendedor",
-                "Data",
-                "Prazo Entrega",
-                "Situação",
-                "Valor Total",
-            ]
-            col_keys = [
-                "Codigo",
-                "ClienteNome",
-                "VendedorNome",
-                "Data",
-                "PrazoEntrega",
-                "SituacaoNome",
-                "ValorTotal",
-            ]
-            for col_idx, header in enumerate(headers):
-                worksheet.write(HEADER_ROW, col_idx, header, fmt_hdr)
-            worksheet.set_row(HEADER_ROW, 20)
-
-            # ── Linhas de dados ──────────────────────────────────────────────────
-            for i, (_, row) in enumerate(df.iterrows()):
-                excel_row = DATA_START + i
-                alt = i % 2 == 1
-
-                for col_idx, col_key in enumerate(col_keys):
-                    value = row.get(col_key, "")
-
-                    if col_idx == VALOR_COL:
-                        fmt = fval1 if alt else fval0
-                        try:
-                            worksheet.write_number(
-                                excel_row, col_idx, float(value), fmt
-                            )
-                        except (ValueError, TypeError):
-                            worksheet.write_number(excel_row, col_idx, 0.0, fmt)
-                    elif col_idx in DATE_COLS:
-                        fmt = fdate1 if alt else fdate0
-                        worksheet.write(
-                            excel_row, col_idx, str(value) if value else "", fmt
-                        )
-                    else:
-                        fmt = fd1 if alt else fd0
-                        worksheet.write(
-                            excel_row, col_idx, str(value) if value else "", fmt
-                        )
-
-                worksheet.set_row(excel_row, 16)
-
-            # ── Linha de total ───────────────────────────────────────────────────
-            total_row = DATA_START + len(df)
-            total_valor = (
-                float(df["ValorTotal"].sum()) if "ValorTotal" in df.columns else 0.0
-            )
-            for col_idx in range(NUM_COLS):
-                if col_idx < NUM_COLS - 2:
-                    worksheet.write(total_row, col_idx, "", ftot_empty)
-                elif col_idx == NUM_COLS - 2:
-                    worksheet.write(total_row, col_idx, "TOTAL:", ftot_label)
-                else:
-                    worksheet.write_number(total_row, col_idx, total_valor, ftot_valor)
-            worksheet.set_row(total_row, 18)
-
-            workbook.close()
-            return buffer.getvalue()
-
         except Exception as e:
-            st.error(f"❌ Erro ao gerar Excel: {str(e)}")
+            # Roda em thread de core.jobs: sem Streamlit; sem arquivo, o botão
+            # de download mostra a falha
             self.logger.error(f"Erro ao gerar Excel: {str(e)}")
             self.logger.error(traceback.format_exc())
             # Fallback: Excel simples sem formatação
             try:
-                buffer = io.BytesIO()
-                with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-                    df.to_excel(writer, index=False, sheet_name="Pedidos")
-                return buffer.getvalue()
-            except Exception:
+                return export_excel(df, sheet_name="Pedidos")
+            except Exception as e:
+                self.logger.error(f"Erro ao gerar Excel simples: {str(e)}")
                 return None
 
-    def _generate_pdf(self, df: pd.DataFrame) -> bytes:
-        """Gera PDF do relatório de pedidos usando reportlab"""
+    def _generate_pdf(self, df: pd.DataFrame) -> Optional[bytes]:
+        """Gera PDF do relatório de pedidos usando reportlab
+
+        A formatação e a paginação ficam no export_pdf, que não usa Streamlit
+        e pode rodar fora da thread do script. Erros vão para o log e o
+        retorno é None: o botão de download mostra a falha.
+        """
         try:
-            from reportlab.lib import colors
-            from reportlab.lib.pagesizes import A4, landscape
-            from reportlab.lib.styles import getSampleStyleSheet
             from reportlab.lib.units import cm
-            from reportlab.platypus import (
-                Paragraph,
-                SimpleDocTemplate,
-                Spacer,
-                Table,
-                TableStyle,
-            )
-
-            buffer = io.BytesIO()
-
-            doc = SimpleDocTemplate(
-                buffer,
-                pagesize=landscape(A4),
-                rightMargin=1 * cm,
-                leftMargin=1 * cm,
-                topMargin=1.5 * cm,
-                bottomMargin=1 * cm,
-            )
 
-            styles = getSampleStyleSheet()
-            elements = []
-
-            # Título e data de geração
-            elements.append(Paragraph("SGR - Relatório de Pedidos", styles["Title"]))
-            elements.append(
-                Paragraph(
-                    f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M')}",
-                    styles["Normal"],
-                )
-            )
-            elements.append(Spacer(1, 0.5 * cm))
-
-            # Cabeçalho da tabela
-            headers = [
-                "Código",
-                "Cliente",
-                "Vendedor",
-                "Data",
-                "Prazo Entrega",
-                "Situação",
-                "Valor Total",
-            ]
-            table_data = [headers]
-
-            # Linhas de dados
-            for _, row in df.iterrows():
-                valor_fmt = f"R$ {self._format_br(float(row.get('ValorTotal', 0)))}"
-                table_row = [
-                    str(row.get("Codigo", "")),
-                    str(row.get("ClienteNome", ""))[:45],
-                    str(row.get("VendedorNome", ""))[:25],
-                    str(row.get("Data", "")),
-                    str(row.get("PrazoEntrega", "")),
-                    str(row.get("SituacaoNome", ""))[:22],
-                    valor_fmt,
-                ]
-                table_data.append(table_row)
-
-            # Linha de total
-            total_valor = df["ValorTotal"].sum() if "ValorTotal" in df.columns else 0.0
-            total_fmt = f"R$ {self._format_br(total_valor)}"
-            table_data.append(["", "", "", "", "", "TOTAL:", total_fmt])
+            from infrastructure.export.pdf import PdfColumn, export_pdf
 
             # Larguras das colunas (paisagem A4 ≈ 27,7 cm útil)
-            col_widths = [
-                2.5 * cm,
-                6.5 * cm,
-                4.5 * cm,
-                2.5 * cm,
-                3 * cm,
-                3.5 * cm,
-                3.2 * cm,
+            colunas = [
+                PdfColumn("Codigo", "Código", width=2.5 * cm),
+                PdfColumn("ClienteNome", "Cliente", width=6.5 * cm, max_chars=45),
+                PdfColumn("VendedorNome", "Vendedor", width=4.5 * cm, max_chars=25),
+                PdfColumn("Data", "Data", width=2.5 * cm, align="CENTER"),
+                PdfColumn(
+                    "PrazoEntrega", "Prazo Entrega", width=3 * cm, align="CENTER"
+                ),
+                PdfColumn(
+                    "SituacaoNome",
+                    "Situação",
+                    width=3.5 * cm,
+                    max_chars=22,
+                    total="TOTAL:",
+                ),
+                PdfColumn(
+                    "ValorTotal",
+                    "Valor Total",
+                    kind="moeda",
+                    width=3.2 * cm,
+                    align="RIGHT",
+                    total="soma",
+                ),
             ]
-
-            table = Table(table_data, colWidths=col_widths, repeatRows=1)
-            table.setStyle(
-                TableStyle(
-                    [
-                        # Cabeçalho
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1E88E5")),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, 0), (-1, 0), 9),
-                        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
-                        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                        # Dados
-                        ("FONTSIZE", (0, 1), (-1, -2), 8),
-                        (
-                            "ROWBACKGROUNDS",
-                            (0, 1),
-                            (-1, -2),
-                            [colors.white, colors.HexColor("#F5F5F5")],
-                        ),
-                        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                        ("TOPPADDING", (0, 0), (-1, -1), 4),
-                        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-                        # Linha de total
-                        (
-                            "BACKGROUND",
-                            (0, -1),
-                            (-1, -1),
-                            colors.HexColor("#E3F2FD"),
-                        ),
-                        ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, -1), (-1, -1), 8),
-                        # Alinhamento numérico
-                        ("ALIGN", (6, 0), (6, -1), "RIGHT"),
-                        ("ALIGN", (3, 1), (4, -1), "CENTER"),
-                    ]
-                )
-            )
-
-            elements.append(table)
-            doc.build(elements)
-            return buffer.getvalue()
+            return export_pdf(df, colunas, title="SGR - Relatório de Pedidos")
 
         except ImportError:
-            st.warning(
-                "⚠️ Biblioteca 'reportlab' não encontrada. "
+            self.logger.warning(
+                "Biblioteca 'reportlab' não encontrada. "
                 "Instale com: pip install reportlab"
             )
             return None
         except Exception as e:
-            st.error(f"❌ Erro ao gerar PDF: {str(e)}")
             self.logger.error(f"Erro ao gerar PDF: {str(e)}")
             self.logger.error(traceback.format_exc())
             return None
 
-    def _render_data_table(self):
+    def _render_data_table(self, df: pd.DataFrame):
         """Renderiza tabela de pedidos com AgGrid e botões de exportação"""
-        df = st.session_state.pedidos_df
-
         if df is None or df.empty:
             return
 
@@ -745,29 +592,27 @@ class PedidosController:
         with col2:
             st.metric("💰 Valor Total", f"R$ {self._format_br(total_valor)}")
         with col3:
-            # Exportar para Excel (formatado no mesmo padrão do PDF)
-            excel_data = self._generate_excel(df)
-            if excel_data:
-                st.download_button(
-                    label="📊 Excel",
-                    data=excel_data,
-                    file_name=f"pedidos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True,
-                    help="Exportar relatório para Excel",
-                )
+            # Exportar para Excel (formatado no mesmo padrão do PDF), gerado ao clicar
+            consulta = st.session_state.get("pedidos_consulta")
+            lazy_download_button(
+                label="📊 Excel",
+                name="pedidos_excel",
+                df=df,
+                builder=lambda: self._generate_excel(df, consulta),
+                file_name=f"pedidos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                help="Exportar relatório para Excel",
+            )
         with col4:
-            # Exportar para PDF
-            pdf_data = self._generate_pdf(df)
-            if pdf_data:
-                st.download_button(
-                    label="📄 PDF",
-                    data=pdf_data,
-                    file_name=f"pedidos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-                    mime="application/pdf",
-                    use_container_width=True,
-                    help="Exportar relatório para PDF",
-                )
+            # Exportar para PDF, gerado ao clicar
+            lazy_download_button(
+                label="📄 PDF",
+                name="pedidos_pdf",
+                df=df,
+                builder=lambda: self._generate_pdf(df),
+                file_name=f"pedidos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                mime="application/pdf",
+                help="Exportar relatório para PDF",
+            )
 
         st.markdown("---")
 
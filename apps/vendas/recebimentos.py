@@ -3,7 +3,6 @@ SGR - Módulo de Recebimentos
 Relatório de Recebimentos a Vencer
 """
 
-import io
 import logging
 import traceback
 from datetime import date, datetime
@@ -13,12 +12,23 @@ import streamlit as st
 
 # Imports da aplicação
 try:
-    from core.container_recebimentos import DIContainerRecebimentos
     from core.exceptions import BusinessLogicError, SGRException, ValidationError
+    from core.runtime import runtime
+    from core.session_data import session_data
+    from infrastructure.export.excel import (
+        CABECALHO_DESTAQUE,
+        ExcelColumn,
+        export_excel,
+    )
+    from presentation.components.downloads import lazy_download_button
     from presentation.styles.theme_simple import apply_theme
+    from utils.numeric import converter_colunas_numericas
 except ImportError as e:
     st.error(f"❌ Erro crítico de importação: {e}")
     st.stop()
+    # Sem contexto do script (pré-carregamento em core.jobs) st.stop() não
+    # interrompe: a falha volta para o registro de módulos
+    raise
 
 
 class RecebimentosController:
@@ -35,8 +45,9 @@ class RecebimentosController:
     def _initialize_services(self):
         """Inicializa serviços com tratamento de erro"""
         try:
-            self.container = DIContainerRecebimentos()
-            self.recebimentos_service = self.container.get_recebimentos_service()
+            # Runtime do processo: container e serviço criados uma única vez
+            self.container = runtime.recebimentos_container
+            self.recebimentos_service = runtime.recebimentos_service
             self.logger.info("Serviços de recebimentos inicializados com sucesso")
 
         except Exception as e:
@@ -224,18 +235,15 @@ class RecebimentosController:
         """Renderiza filtros e dados"""
         st.subheader("🔍 Filtros e Dados")
 
-        # Inicializar dados na sessão
-        if "recebimentos_df" not in st.session_state:
-            st.session_state.recebimentos_df = None
+        # Inicializar dados na sessão (recebimentos_df fica em session_data)
         if "recebimentos_metricas" not in st.session_state:
             st.session_state.recebimentos_metricas = None
         if "recebimentos_auto_loaded" not in st.session_state:
             st.session_state.recebimentos_auto_loaded = False
 
         # Carregar dados do mês atual automaticamente na primeira vez
-        if (
-            not st.session_state.recebimentos_auto_loaded
-            and st.session_state.recebimentos_df is None
+        if not st.session_state.recebimentos_auto_loaded and not session_data.has(
+            "recebimentos_df"
         ):
             try:
                 with st.spinner("Carregando dados do mês atual..."):
@@ -253,7 +261,12 @@ class RecebimentosController:
                         "periodo_filtrado"
                     ] = f"{primeiro_dia_mes.strftime('%d/%m/%Y')} a {hoje.strftime('%d/%m/%Y')}"
 
-                st.session_state.recebimentos_df = df_recebimentos
+                session_data.put(
+                    "recebimentos_df",
+                    df_recebimentos,
+                    module="recebimentos",
+                    loader=self.recebimentos_service.get_recebimentos_mes_atual,
+                )
                 st.session_state.recebimentos_metricas = metricas
                 st.session_state.recebimentos_filtro_key = (
                     f"{primeiro_dia_mes}_{hoje}_{len(df_recebimentos)}"
@@ -271,7 +284,7 @@ class RecebimentosController:
             self._render_filters()
 
         # Exibir métricas e dados
-        if st.session_state.recebimentos_df is not None:
+        if session_data.has("recebimentos_df"):
             self._render_metrics()
             self._render_data_table()
         else:
@@ -363,7 +376,14 @@ class RecebimentosController:
                 ] = f"{data_inicio.strftime('%d/%m/%Y')} a {data_fim.strftime('%d/%m/%Y')}"
 
             # Armazenar na sessão
-            st.session_state.recebimentos_df = df_recebimentos
+            session_data.put(
+                "recebimentos_df",
+                df_recebimentos,
+                module="recebimentos",
+                loader=lambda: self.recebimentos_service.get_recebimentos_filtrados(
+                    data_inicio=data_inicio, data_fim=data_fim
+                ),
+            )
             st.session_state.recebimentos_metricas = metricas
             # Chave única para forçar atualização da grid
             st.session_state.recebimentos_filtro_key = (
@@ -400,7 +420,12 @@ class RecebimentosController:
                     "periodo_filtrado"
                 ] = f"{primeiro_dia_mes.strftime('%d/%m/%Y')} a {hoje.strftime('%d/%m/%Y')}"
 
-            st.session_state.recebimentos_df = df_recebimentos
+            session_data.put(
+                "recebimentos_df",
+                df_recebimentos,
+                module="recebimentos",
+                loader=self.recebimentos_service.get_recebimentos_mes_atual,
+            )
             st.session_state.recebimentos_metricas = metricas
             # Chave única para forçar atualização da grid
             st.session_state.recebimentos_filtro_key = (
@@ -449,7 +474,7 @@ class RecebimentosController:
 
             st.markdown("---")
 
-    def _create_formatted_excel(self, df: pd.DataFrame) -> io.BytesIO:
+    def _create_formatted_excel(self, df: pd.DataFrame) -> bytes:
         """
         Cria arquivo Excel formatado de forma elegante
 
@@ -457,135 +482,27 @@ class RecebimentosController:
             df: DataFrame com os dados a exportar
 
         Returns:
-            BytesIO: Buffer com o arquivo Excel formatado
+            bytes: Conteúdo do arquivo Excel formatado
         """
-        buffer = io.BytesIO()
-
-        with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-            df.to_excel(writer, index=False, sheet_name="Recebimentos", startrow=1)
-
-            workbook = writer.book
-            worksheet = writer.sheets["Recebimentos"]
-
-            # Definir formatos
-            # Formato do cabeçalho
-            header_format = workbook.add_format(
-                {
-                    'bold': True,
-                    'text_wrap': True,
-                    'valign': 'vcenter',
-                    'align': 'center',
-                    'fg_color': '#1E88E5',
-                    'font_color': 'white',
-                    'border': 1,
-                    'font_size': 11,
-                }
-            )
-
-            # Formato de data
-            date_format = workbook.add_format(
-                {'num_format': 'dd/mm/yyyy', 'align': 'center', 'border': 1}
-            )
-
-            # Formato monetário (R$)
-            money_format = workbook.add_format(
-                {'num_format': 'R$ #,##0.00', 'border': 1}
-            )
-
-            # Formato de texto normal
-            text_format = workbook.add_format({'border': 1, 'valign': 'vcenter'})
-
-            # Formato de célula alternada (zebra)
-            alt_format = workbook.add_format(
-                {'bg_color': '#F5F5F5', 'border': 1, 'valign': 'vcenter'}
-            )
-
-            # Formato de totais
-            total_format = workbook.add_format(
-                {'bold': True, 'bg_color': '#E3F2FD', 'border': 1, 'font_size': 11}
-            )
-
-            total_money_format = workbook.add_format(
-                {
-                    'bold': True,
-                    'bg_color': '#E3F2FD',
-                    'num_format': 'R$ #,##0.00',
-                    'border': 1,
-                    'font_size': 11,
-                }
-            )
-
-            # Adicionar título
-            title_format = workbook.add_format(
-                {
-                    'bold': True,
-                    'font_size': 14,
-                    'fg_color': '#1976D2',
-                    'font_color': 'white',
-                    'align': 'center',
-                    'valign': 'vcenter',
-                    'border': 1,
-                }
-            )
-
-            # Mesclar células para o título
-            worksheet.merge_range(
-                'A1:D1', '💰 Relatório de Recebimentos - SGR', title_format
-            )
-
-            # Escrever cabeçalhos com formatação
-            for col_num, value in enumerate(df.columns.values):
-                worksheet.write(1, col_num, value, header_format)
-
-            # Aplicar formatos às colunas
-            num_rows = len(df)
-
-            for row_num in range(num_rows):
-                row_data = df.iloc[row_num]
-
-                # Formato alternado (zebra)
-                row_format = alt_format if row_num % 2 == 0 else text_format
-
-                for col_num, col_name in enumerate(df.columns):
-                    value = row_data[col_name]
-
-                    if col_name == "Vencimento":
-                        # Formatação de data
-                        worksheet.write(row_num + 2, col_num, value, date_format)
-                    elif col_name == "Valor":
-                        # Formatação monetária
-                        worksheet.write(row_num + 2, col_num, value, money_format)
-                    elif col_name == "FormaPagamento":
-                        # Texto normal
-                        worksheet.write(row_num + 2, col_num, value, row_format)
-                    elif col_name == "Cliente":
-                        # Texto normal
-                        worksheet.write(row_num + 2, col_num, value, row_format)
-
-            # Adicionar linha de totais
-            total_row = num_rows + 2
-            worksheet.write(total_row, 0, "TOTAL", total_format)
-            worksheet.write(total_row, 1, df["Valor"].sum(), total_money_format)
-            worksheet.write(
-                total_row, 2, "", total_format
-            )  # FormaPagamento vazio no total
-            worksheet.write(total_row, 3, f"{len(df)} recebimentos", total_format)
-
-            # Ajustar largura das colunas
-            worksheet.set_column('A:A', 15)  # Vencimento
-            worksheet.set_column('B:B', 18)  # Valor
-            worksheet.set_column('C:C', 25)  # FormaPagamento
-            worksheet.set_column('D:D', 50)  # Cliente
-
-            # Congelar painéis (cabeçalho fixo)
-            worksheet.freeze_panes(2, 0)
-
-        buffer.seek(0)
-        return buffer
+        colunas = [
+            ExcelColumn("Vencimento", kind="data", width=15, total="TOTAL"),
+            ExcelColumn("Valor", kind="moeda", width=18, total="soma"),
+            ExcelColumn("FormaPagamento", kind="texto", width=25),
+            ExcelColumn("Cliente", kind="texto", width=50, total="{n} recebimentos"),
+        ]
+        return export_excel(
+            df,
+            colunas,
+            sheet_name="Recebimentos",
+            title="💰 Relatório de Recebimentos - SGR",
+            header_format=CABECALHO_DESTAQUE,
+            zebra=True,
+            borders=True,
+        )
 
     def _render_data_table(self):
         """Renderiza tabela de dados usando AgGrid"""
-        df = st.session_state.recebimentos_df
+        df = session_data.get("recebimentos_df")
 
         if df is None or df.empty:
             return
@@ -598,31 +515,8 @@ class RecebimentosController:
 
             df_display = df.copy()
 
-            # Função para limpar e converter valores monetários
-            def clean_monetary_value(val):
-                """Remove formatação monetária e converte para float"""
-                if pd.isna(val):
-                    return 0.0
-                if isinstance(val, (int, float)):
-                    return float(val)
-                # Converter para string e limpar
-                val_str = str(val).replace("R$", "").strip()
-
-                # Se tem vírgula, é formato brasileiro (1.500,00)
-                if "," in val_str:
-                    val_clean = val_str.replace(".", "").replace(",", ".")
-                else:
-                    val_clean = val_str
-
-                val_clean = val_clean.strip()
-                try:
-                    return float(val_clean) if val_clean else 0.0
-                except:
-                    return 0.0
-
             # Garantir que valores monetários sejam float
-            if "Valor" in df_display.columns:
-                df_display["Valor"] = df_display["Valor"].apply(clean_monetary_value)
+            converter_colunas_numericas(df_display, ["Valor"])
 
             # Configurar AgGrid
             gb = GridOptionsBuilder.from_dataframe(df_display)
@@ -701,14 +595,13 @@ class RecebimentosController:
                 )
 
             with col2:
-                # Download Excel formatado
-                buffer = self._create_formatted_excel(df_display)
-                st.download_button(
+                # Download Excel formatado (gerado ao clicar)
+                lazy_download_button(
                     label="📊 Download Excel",
-                    data=buffer.getvalue(),
+                    name="recebimentos_excel",
+                    df=df_display,
+                    builder=lambda: self._create_formatted_excel(df_display),
                     file_name=f"recebimentos_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                    mime="application/vnd.ms-excel",
-                    use_container_width=True,
                 )
 
         except ImportError:
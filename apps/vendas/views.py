@@ -3,26 +3,23 @@ SGR - Módulo de Vendas
 Compatível com o sistema principal de login e menu
 """
 
-import io
 import logging
 import os
 import traceback
 from datetime import date, datetime
 
-import django
-from django.conf import settings
-
-import pandas as pd
 import streamlit as st
 
 # Django já configurado pelo app.py principal
 
 # Imports da aplicação refatorada
 try:
-    from core.container_vendas import DIContainer
     from core.exceptions import BusinessLogicError, SGRException, ValidationError
+    from core.runtime import runtime
     from domain.services.vendas_service import VendasService
+    from infrastructure.export.excel import export_excel
     from presentation.components.data_grid_simple import DataGrid
+    from presentation.components.downloads import lazy_download_button
     from presentation.components.forms_vendas import (
         FilterForm,
         LoadingHelper,
@@ -30,9 +27,13 @@ try:
         ValidationHelper,
     )
     from presentation.styles.theme_simple import apply_theme
+    from utils.numeric import converter_colunas_numericas
 except ImportError as e:
     st.error(f"❌ Erro crítico de importação: {e}")
     st.stop()
+    # Sem contexto do script (pré-carregamento em core.jobs) st.stop() não
+    # interrompe: a falha volta para o registro de módulos
+    raise
 
 
 class VendasControllerIntegrado:
@@ -49,8 +50,9 @@ class VendasControllerIntegrado:
     def _initialize_services(self):
         """Inicializa serviços com tratamento de erro"""
         try:
-            self.container = DIContainer()
-            self.vendas_service = self.container.get_vendas_service()
+            # Runtime do processo: container e serviço criados uma única vez
+            self.container = runtime.vendas_container
+            self.vendas_service = runtime.vendas_service
             self.logger.info("Serviços de vendas inicializados com sucesso")
 
         except Exception as e:
@@ -308,34 +310,10 @@ class VendasControllerIntegrado:
             colunas_exibir = [c for c in colunas_exibir if c in df.columns]
             df_display = df[colunas_exibir].copy()
 
-            # Função para limpar e converter valores monetários
-            def clean_monetary_value(val):
-                """Remove formatação monetária e converte para float"""
-                if pd.isna(val):
-                    return 0.0
-                if isinstance(val, (int, float)):
-                    return float(val)
-                # Converter para string e limpar
-                val_str = str(val).replace("R$", "").strip()
-
-                # Se tem vírgula, é formato brasileiro (1.500,00)
-                if "," in val_str:
-                    # Remover pontos (separador de milhares) e trocar vírgula por ponto
-                    val_clean = val_str.replace(".", "").replace(",", ".")
-                else:
-                    # Formato americano ou já limpo (1500.00 ou 1500)
-                    val_clean = val_str
-
-                val_clean = val_clean.strip()
-                try:
-                    return float(val_clean) if val_clean else 0.0
-                except:
-                    return 0.0
-
             # Garantir que valores monetários sejam float (sem formatação)
-            for col in ["ValorProdutos", "ValorDesconto", "ValorTotal"]:
-                if col in df_display.columns:
-                    df_display[col] = df_display[col].apply(clean_monetary_value)
+            converter_colunas_numericas(
+                df_display, ["ValorProdutos", "ValorDesconto", "ValorTotal"]
+            )
 
             # Renomear colunas conforme as que estão presentes
             rename_map = {
@@ -445,16 +423,12 @@ class VendasControllerIntegrado:
 
             with col2:
                 # Download Excel
-                buffer = io.BytesIO()
-                with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-                    df_display.to_excel(writer, index=False, sheet_name="Vendas")
-
-                st.download_button(
+                lazy_download_button(
                     label="📊 Download Excel",
-                    data=buffer.getvalue(),
+                    name="vendas_view_excel",
+                    df=df_display,
+                    builder=lambda: export_excel(df_display, sheet_name="Vendas"),
                     file_name=f"vendas_detalhadas_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                    mime="application/vnd.ms-excel",
-                    use_container_width=True,
                 )
 
         except ImportError:
@@ -6,13 +6,20 @@ Implementa padrão Singleton para configurações globais
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from dotenv import load_dotenv
 
 load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 
 
+def _optional_int(value: Optional[str]) -> Optional[int]:
+    """Converte variável de ambiente para int, retornando None se vazia"""
+    if value is None or not value.strip():
+        return None
+    return int(value)
+
+
 @dataclass
 class DatabaseConfig:
     """Configurações do banco de dados PostgreSQL"""
@@ -25,6 +32,26 @@ class DatabaseConfig:
     username: str = field(default_factory=lambda: os.environ.get("DB_USER", "postgres"))
     password: str = field(default_factory=lambda: os.environ.get("DB_PASSWORD", ""))
 
+    # Pool de conexões compartilhado pelo processo. Comporta JOB_WORKERS (8)
+    # + SCHEDULER_WORKERS (2) conexões de fundo e deixa 10 para as sessões
+    pool_max_size: int = field(
+        default_factory=lambda: int(os.environ.get("DB_POOL_MAX_SIZE", "20"))
+    )
+    pool_timeout: float = field(
+        default_factory=lambda: float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+    )
+    pool_ping_interval: float = field(
+        default_factory=lambda: float(os.environ.get("DB_POOL_PING_INTERVAL", "30"))
+    )
+    pool_max_lifetime: float = field(
+        default_factory=lambda: float(os.environ.get("DB_POOL_MAX_LIFETIME", "1800"))
+    )
+
+    # Linhas por bloco na leitura com cursor nomeado (streaming)
+    stream_chunk_size: int = field(
+        default_factory=lambda: int(os.environ.get("DB_STREAM_CHUNK_SIZE", "5000"))
+    )
+
     def get_connection_dict(self) -> dict:
         """Retorna dicionário de configuração para conexão"""
         return {
@@ -56,15 +83,86 @@ class AppConfig:
     )
     session_timeout: int = 3600
 
+    # Tarefas em segundo plano (core.jobs), compartilhadas pelo processo
+    job_workers: int = field(
+        default_factory=lambda: int(os.environ.get("JOB_WORKERS", "8"))
+    )
+    job_retention_seconds: int = field(
+        default_factory=lambda: int(os.environ.get("JOB_RETENTION_SECONDS", "600"))
+    )
+
+    # Tarefas periódicas (core.scheduler), compartilhadas pelo processo
+    scheduler_workers: int = field(
+        default_factory=lambda: int(os.environ.get("SCHEDULER_WORKERS", "2"))
+    )
+    keep_alive_url: str = field(
+        default_factory=lambda: os.environ.get(
+            "KEEP_ALIVE_URL", "https://oficialsport.streamlit.app/"
+        )
+    )
+    keep_alive_interval: int = field(
+        default_factory=lambda: int(os.environ.get("KEEP_ALIVE_INTERVAL", "300"))
+    )
+
 
 @dataclass
 class CacheConfig:
-    """Configurações de cache Redis"""
+    """Configurações de cache (Redis e cache de queries em memória)"""
 
     host: str = "localhost"
     port: int = 6379
     db: int = 0
 
+    # Cache de resultados de queries em memória do processo
+    query_ttl: int = field(
+        default_factory=lambda: int(os.environ.get("QUERY_CACHE_TTL", "300"))
+    )
+    query_max_mb: int = field(
+        default_factory=lambda: int(os.environ.get("QUERY_CACHE_MAX_MB", "256"))
+    )
+    watermark_poll_interval: int = field(
+        default_factory=lambda: int(os.environ.get("WATERMARK_POLL_INTERVAL", "30"))
+    )
+
+    # DataFrames guardados por sessão (core.session_data)
+    session_max_mb: int = field(
+        default_factory=lambda: int(os.environ.get("SESSION_DATA_MAX_MB", "200"))
+    )
+    session_total_max_mb: int = field(
+        default_factory=lambda: int(os.environ.get("SESSION_DATA_TOTAL_MAX_MB", "1024"))
+    )
+    session_idle_seconds: int = field(
+        default_factory=lambda: int(os.environ.get("SESSION_DATA_IDLE_SECONDS", "900"))
+    )
+
+    # Arquivos exportados (Excel/PDF) guardados pelo fingerprint dos dados
+    export_ttl: int = field(
+        default_factory=lambda: int(os.environ.get("EXPORT_CACHE_TTL", "1800"))
+    )
+    export_max_mb: int = field(
+        default_factory=lambda: int(os.environ.get("EXPORT_CACHE_MAX_MB", "128"))
+    )
+
+    # Máscaras de filtro e totais das grades paginadas (presentation.components)
+    grid_ttl: int = field(
+        default_factory=lambda: int(os.environ.get("GRID_CACHE_TTL", "1800"))
+    )
+    grid_max_mb: int = field(
+        default_factory=lambda: int(os.environ.get("GRID_CACHE_MAX_MB", "64"))
+    )
+
+    # RPA que alimenta cada conjunto de dados (RPA_Atualizacao."RPA_id").
+    # Conjuntos sem RPA configurado expiram por tempo (AppConfig.cache_ttl).
+    dataset_rpa_ids: Dict[str, Optional[int]] = field(
+        default_factory=lambda: {
+            "vendas": 7,
+            "sac": 9,
+            "extratos": _optional_int(os.environ.get("RPA_EXTRATOS_ID")),
+            "boletos": _optional_int(os.environ.get("RPA_BOLETOS_ID")),
+            "estoque": _optional_int(os.environ.get("RPA_ESTOQUE_ID")),
+        }
+    )
+
 
 class Settings:
     """Classe Singleton para gerenciar todas as configurações"""
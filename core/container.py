@@ -174,6 +174,8 @@ def configure_container() -> DIContainer:
     Returns:
         Container configurado
     """
+    from core.jobs import JobManager, job_manager
+    from core.scheduler import Scheduler, scheduler
     from domain.repositories.interfaces import (
         BoletoRepositoryInterface,
         ClienteRepositoryInterface,
@@ -197,6 +199,10 @@ def configure_container() -> DIContainer:
     # Configurações
     container.register_instance(type(settings), settings)
 
+    # Tarefas em segundo plano e periódicas (threads do processo)
+    container.register_instance(JobManager, job_manager)
+    container.register_instance(Scheduler, scheduler)
+
     # Repositórios como singletons
     container.register_singleton(DatabaseRepositoryInterface, DatabaseRepository)
     container.register_singleton(UserRepositoryInterface, UserRepository)
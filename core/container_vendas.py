@@ -14,6 +14,7 @@ from infrastructure.database.repositories_vendas import (
     VendaProdutosRepository,
     VendaRepository,
 )
+from infrastructure.database.vendas_snapshot import vendas_snapshot
 
 
 class DIContainer:
@@ -43,6 +44,7 @@ class DIContainer:
                     pagamento_repository=pagamento_repo,
                     produtos_repository=produtos_repo,
                     atualizacao_repository=atualizacao_repo,
+                    snapshot_store=vendas_snapshot,
                 )
 
                 # Incrementar contador e logar apenas na primeira vez
@@ -0,0 +1,390 @@
+"""
+Tarefas em segundo plano compartilhadas pelo processo
+Relatórios, exportações e consultas pesadas rodam em um pool de threads fora
+da thread do script Streamlit; a view guarda o id da tarefa e consulta o
+status nas execuções seguintes em vez de ficar bloqueada esperando
+"""
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Tarefa executada pela thread atual (para cancelamento cooperativo)
+_atual = threading.local()
+
+
+class JobStatus(str, Enum):
+    """Situação de uma tarefa"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class Job:
+    """
+    Tarefa submetida ao JobManager
+
+    Funciona como handle para a view: status, erro, resultado e cancelamento.
+    Uma tarefa ainda na fila é cancelada de imediato; uma tarefa em execução
+    só é interrompida se a função consultar cancel_requested(), mas o
+    resultado dela é descartado.
+    """
+
+    def __init__(self, name: str, key: Optional[Hashable] = None):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.key = key
+        self.status = JobStatus.PENDING
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._future: Optional[Future] = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def active(self) -> bool:
+        """Indica se a tarefa está na fila ou em execução"""
+        return self.status in (JobStatus.PENDING, JobStatus.RUNNING)
+
+    @property
+    def cancel_requested(self) -> bool:
+        """Indica se o cancelamento foi pedido"""
+        return self._cancel_event.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        """Segundos desde a submissão (até o fim, se concluída)"""
+        return (self.finished_at or time.time()) - self.submitted_at
+
+    def cancel(self) -> bool:
+        """
+        Pede o cancelamento da tarefa
+
+        Returns:
+            bool: False se a tarefa já tinha terminado
+        """
+        if not self.active:
+            return False
+        self._cancel_event.set()
+        if self._future is not None and self._future.cancel():
+            self._finish(JobStatus.CANCELLED)
+        return True
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """
+        Obtém o resultado, aguardando até timeout segundos
+
+        Args:
+            timeout: Espera máxima (None aguarda o fim)
+
+        Returns:
+            Any: Retorno da função (None se a tarefa foi cancelada)
+
+        Raises:
+            TimeoutError: Se a tarefa não terminar dentro do timeout
+            Exception: A exceção levantada pela função, se ela falhou
+        """
+        try:
+            valor = self._future.result(timeout) if self._future else None
+        except CancelledError:
+            return None
+        if self.status is JobStatus.CANCELLED:
+            return None
+        return valor
+
+    def _finish(self, status: JobStatus, error: Optional[str] = None) -> None:
+        self.status = status
+        self.error = error
+        self.finished_at = time.time()
+
+
+@dataclass(frozen=True)
+class JobResults:
+    """
+    Resultados de um conjunto de tarefas executadas em paralelo
+
+    Somente leitura: os mapeamentos não aceitam alteração.
+
+    Attributes:
+        values: Retorno de cada tarefa bem-sucedida, pelo nome
+        errors: Exceção de cada tarefa que falhou, pelo nome
+        elapsed: Tempo (s) até a última tarefa terminar
+    """
+
+    values: Mapping[str, Any]
+    errors: Mapping[str, BaseException]
+    elapsed: float
+
+    def result(self, name: str) -> Any:
+        """
+        Obtém o retorno da tarefa
+
+        Args:
+            name: Nome da tarefa
+
+        Returns:
+            Any: Retorno da tarefa
+
+        Raises:
+            KeyError: Se a tarefa não fez parte do conjunto
+            Exception: A exceção levantada pela tarefa, se ela falhou
+        """
+        if name in self.errors:
+            raise self.errors[name]
+        return self.values[name]
+
+
+def cancel_requested() -> bool:
+    """
+    Indica se a tarefa em execução na thread atual teve o cancelamento pedido
+
+    Funções longas (ex.: leitura em blocos) podem consultar entre etapas e
+    encerrar antes; fora de uma tarefa retorna sempre False.
+    """
+    job: Optional[Job] = getattr(_atual, "job", None)
+    return job is not None and job.cancel_requested
+
+
+class JobManager:
+    """
+    Pool de threads com registro das tarefas submetidas
+
+    Tarefas com a mesma chave (key) enquanto uma delas está ativa não são
+    duplicadas: a tarefa existente é retornada. Tarefas concluídas ficam
+    consultáveis por retention segundos.
+    """
+
+    def __init__(self, max_workers: int = 4, retention: float = 600):
+        """
+        Inicializa o pool
+
+        Args:
+            max_workers: Threads executando tarefas ao mesmo tempo
+            retention: Tempo (s) que uma tarefa concluída continua registrada
+        """
+        self.max_workers = max_workers
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="sgr-job"
+        )
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._por_chave: Dict[Hashable, str] = {}
+        self._submetidas = 0
+
+    def submit(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        key: Optional[Hashable] = None,
+        **kwargs: Any,
+    ) -> Job:
+        """
+        Agenda a execução de fn(*args, **kwargs)
+
+        A função não deve usar comandos do Streamlit: ela roda fora da thread
+        do script.
+
+        Args:
+            name: Nome da tarefa (logs e métricas)
+            fn: Função executada
+            key: Identifica tarefas equivalentes (reaproveita a ativa)
+
+        Returns:
+            Job: Handle da tarefa
+        """
+        with self._lock:
+            self._purge()
+            if key is not None:
+                existente = self._jobs.get(self._por_chave.get(key, ""))
+                if existente is not None and existente.active:
+                    return existente
+
+            job = Job(name, key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._por_chave[key] = job.id
+            self._submetidas += 1
+            job._future = self._executor.submit(self._run, job, fn, args, kwargs)
+
+        logger.debug(f"Job '{name}' submitted ({job.id})")
+        return job
+
+    def gather(
+        self,
+        tasks: Mapping[str, Callable[[], Any]],
+        prefix: str = "",
+        timeout: Optional[float] = None,
+    ) -> JobResults:
+        """
+        Executa funções independentes em paralelo e aguarda todas
+
+        Cada função roda em uma thread do pool, com a própria conexão de
+        banco; o tempo total fica próximo da função mais lenta, e não da soma.
+        Chamado de dentro de uma tarefa, executa em sequência (evita esperar
+        por threads do próprio pool).
+
+        Args:
+            tasks: Funções sem argumentos, pelo nome
+            prefix: Prefixo dos nomes das tarefas (logs)
+            timeout: Espera máxima (s) pelo conjunto; tarefas que não
+                terminarem a tempo entram em errors com TimeoutError
+
+        Returns:
+            JobResults: Retornos e erros de cada função
+        """
+        inicio = time.monotonic()
+        values: Dict[str, Any] = {}
+        errors: Dict[str, BaseException] = {}
+
+        if getattr(_atual, "job", None) is not None:
+            for nome, fn in tasks.items():
+                try:
+                    values[nome] = fn()
+                except Exception as e:
+                    errors[nome] = e
+        else:
+            jobs = {
+                nome: self.submit(f"{prefix}{nome}", fn) for nome, fn in tasks.items()
+            }
+            for nome, job in jobs.items():
+                restante = None
+                if timeout is not None:
+                    restante = max(timeout - (time.monotonic() - inicio), 0)
+                try:
+                    values[nome] = job.result(restante)
+                except TimeoutError as e:
+                    job.cancel()
+                    errors[nome] = e
+                except Exception as e:
+                    errors[nome] = e
+
+        decorrido = time.monotonic() - inicio
+        logger.info(
+            f"Gathered {len(tasks)} job(s) '{prefix}' in {decorrido:.2f}s"
+            f" ({len(errors)} failed)"
+        )
+        return JobResults(
+            values=MappingProxyType(values),
+            errors=MappingProxyType(errors),
+            elapsed=decorrido,
+        )
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        """Obtém a tarefa pelo id (None se desconhecida ou expirada)"""
+        if not job_id:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: Optional[str]) -> bool:
+        """Pede o cancelamento da tarefa pelo id"""
+        job = self.get(job_id)
+        return job.cancel() if job is not None else False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas das tarefas registradas"""
+        with self._lock:
+            self._purge()
+            por_status = {status.value: 0 for status in JobStatus}
+            for job in self._jobs.values():
+                por_status[job.status.value] += 1
+            return {
+                "workers": self.max_workers,
+                "submitted": self._submetidas,
+                "jobs": por_status,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancela as tarefas na fila e encerra as threads"""
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status is JobStatus.PENDING:
+                    job.cancel()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _run(
+        self,
+        job: Job,
+        fn: Callable[..., Any],
+        args: tuple,
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        """Executa a tarefa na thread do pool"""
+        if job.cancel_requested:
+            job._finish(JobStatus.CANCELLED)
+            return None
+
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        _atual.job = job
+        try:
+            resultado = fn(*args, **kwargs)
+        except Exception as e:
+            job._finish(JobStatus.FAILED, str(e))
+            logger.error(f"Job '{job.name}' failed: {str(e)}", exc_info=True)
+            raise
+        finally:
+            _atual.job = None
+            release_connections()
+
+        if job.cancel_requested:
+            job._finish(JobStatus.CANCELLED)
+            logger.info(f"Job '{job.name}' cancelled after {job.elapsed:.2f}s")
+            return None
+
+        job._finish(JobStatus.DONE)
+        logger.info(f"Job '{job.name}' done in {job.elapsed:.2f}s")
+        return resultado
+
+    def _purge(self) -> None:
+        """Remove tarefas concluídas há mais de retention segundos (com o lock)"""
+        limite = time.time() - self.retention
+        expiradas = [
+            job
+            for job in self._jobs.values()
+            if not job.active and (job.finished_at or 0) < limite
+        ]
+        for job in expiradas:
+            del self._jobs[job.id]
+            if job.key is not None and self._por_chave.get(job.key) == job.id:
+                del self._por_chave[job.key]
+
+
+def release_connections() -> None:
+    """Devolve ao pool as conexões Django abertas pela thread atual
+
+    Threads de trabalho (tarefas, agendador) vivem o processo todo; sem isso
+    a conexão ficaria presa à thread entre uma execução e outra.
+    """
+    try:
+        from django.db import connections
+
+        connections.close_all()
+    except Exception as e:
+        logger.debug(f"Could not release thread connections: {str(e)}")
+
+
+# Instância global compartilhada por todas as sessões do processo
+job_manager = JobManager(
+    max_workers=settings.app.job_workers,
+    retention=settings.app.job_retention_seconds,
+)
@@ -0,0 +1,255 @@
+"""
+Registro dos módulos de relatório com importação sob demanda
+Cada módulo (e as bibliotecas pesadas que ele traz: st_aggrid, openpyxl,
+reportlab, plotly, PIL) só é importado quando selecionado no menu. Após o
+login, os demais são importados em segundo plano; o tempo de cada importação
+fica registrado para que regressões no carregamento apareçam nos logs
+"""
+
+import importlib
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from core.jobs import Job, job_manager
+
+logger = logging.getLogger(__name__)
+
+# Importações acima deste tempo (s) geram aviso no log
+LIMITE_IMPORTACAO_LENTA = 2.0
+
+# Bibliotecas usadas dentro das funções do dashboard de vendas (app.py)
+BIBLIOTECAS_PESADAS = (
+    "st_aggrid",
+    "plotly.express",
+    "plotly.graph_objects",
+    "PIL.Image",
+    "openpyxl",
+    "xlsxwriter",
+    "reportlab.platypus",
+)
+
+
+@dataclass
+class ReportModule:
+    """
+    Módulo de relatório registrado
+
+    Attributes:
+        name: Nome do módulo no menu (original_name em apps.auth.modules)
+        path: Caminho de importação (ex.: "apps.estoque.views")
+        key: Chave passada para a função de entrada (main(key=...))
+        attr: Função de entrada do módulo
+        seconds: Tempo da primeira importação (None se ainda não importado)
+        origin: "demand" (selecionado no menu) ou "preload" (segundo plano)
+        error: Erro da última tentativa de importação
+    """
+
+    name: str
+    path: str
+    key: str
+    attr: str = "main"
+    seconds: Optional[float] = None
+    origin: Optional[str] = None
+    error: Optional[str] = None
+    _entry: Optional[Callable[..., Any]] = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def loaded(self) -> bool:
+        """Indica se o módulo já foi importado"""
+        return self._entry is not None
+
+
+class ModuleRegistry:
+    """
+    Módulos de relatório importados na primeira seleção
+
+    Thread-safe: a importação em segundo plano e a seleção no menu podem
+    pedir o mesmo módulo ao mesmo tempo; ele é importado uma única vez.
+    """
+
+    def __init__(self) -> None:
+        self._modules: Dict[str, ReportModule] = {}
+        self._libraries: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._preload_job: Optional[Job] = None
+
+    def register(self, name: str, path: str, key: str, attr: str = "main") -> None:
+        """
+        Registra um módulo de relatório (sem importar)
+
+        Args:
+            name: Nome do módulo no menu
+            path: Caminho de importação
+            key: Chave passada para a função de entrada
+            attr: Função de entrada do módulo
+        """
+        with self._lock:
+            self._modules[name] = ReportModule(name, path, key, attr)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._modules
+
+    def get(self, name: str) -> ReportModule:
+        """
+        Obtém o módulo registrado
+
+        Raises:
+            KeyError: Se o módulo não estiver registrado
+        """
+        return self._modules[name]
+
+    def load(self, name: str, origin: str = "demand") -> Callable[..., Any]:
+        """
+        Importa o módulo (apenas na primeira chamada) e retorna a função de entrada
+
+        Args:
+            name: Nome do módulo no menu
+            origin: Origem da importação, registrada no relatório
+
+        Returns:
+            Callable: Função de entrada (ex.: main)
+
+        Raises:
+            KeyError: Se o módulo não estiver registrado
+            ImportError: Se a importação falhar
+        """
+        modulo = self._modules[name]
+        if modulo._entry is not None:
+            return modulo._entry
+
+        with modulo._lock:
+            if modulo._entry is None:
+                inicio = time.perf_counter()
+                try:
+                    entrada = getattr(importlib.import_module(modulo.path), modulo.attr)
+                except Exception as e:
+                    modulo.error = str(e)
+                    logger.error(f"Module '{name}' import failed: {str(e)}")
+                    raise
+                modulo.seconds = time.perf_counter() - inicio
+                modulo.origin = origin
+                modulo.error = None
+                modulo._entry = entrada
+                _log_importacao(
+                    f"Module '{name}' ({modulo.path})", modulo.seconds, origin
+                )
+        return modulo._entry
+
+    def render(self, name: str) -> None:
+        """Importa o módulo, se necessário, e executa main(key=...)"""
+        self.load(name)(key=self._modules[name].key)
+
+    def preload(self, libraries: Sequence[str] = BIBLIOTECAS_PESADAS) -> Job:
+        """
+        Importa em segundo plano os módulos ainda não usados (uma vez por processo)
+
+        Args:
+            libraries: Bibliotecas pesadas importadas depois dos módulos
+
+        Returns:
+            Job: Tarefa da importação
+        """
+        with self._lock:
+            if self._preload_job is None:
+                self._preload_job = job_manager.submit(
+                    "modules:preload",
+                    self._preload,
+                    tuple(libraries),
+                    key="modules:preload",
+                )
+            return self._preload_job
+
+    def get_report(self) -> List[Dict[str, Any]]:
+        """
+        Retorna o tempo de importação de cada módulo e biblioteca
+
+        Returns:
+            List[Dict]: Itens ordenados do mais lento para o mais rápido
+        """
+        with self._lock:
+            modulos = list(self._modules.values())
+            bibliotecas = dict(self._libraries)
+
+        itens = [
+            {
+                "name": modulo.name,
+                "path": modulo.path,
+                "seconds": modulo.seconds,
+                "origin": modulo.origin,
+                "error": modulo.error,
+            }
+            for modulo in modulos
+        ]
+        itens += [
+            {
+                "name": nome,
+                "path": nome,
+                "seconds": segundos,
+                "origin": "preload",
+                "error": None,
+            }
+            for nome, segundos in bibliotecas.items()
+        ]
+        return sorted(itens, key=lambda item: -(item["seconds"] or 0))
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _preload(self, libraries: Sequence[str]) -> None:
+        """Importa os módulos e bibliotecas pendentes (roda em core.jobs)"""
+        inicio = time.perf_counter()
+        for nome in list(self._modules):
+            try:
+                self.load(nome, origin="preload")
+            except Exception:
+                pass  # Já registrado; a seleção no menu tentará de novo
+
+        for biblioteca in libraries:
+            t0 = time.perf_counter()
+            try:
+                importlib.import_module(biblioteca)
+            except ImportError as e:
+                logger.warning(f"Library '{biblioteca}' preload failed: {str(e)}")
+                continue
+            segundos = time.perf_counter() - t0
+            with self._lock:
+                self._libraries[biblioteca] = segundos
+            _log_importacao(f"Library '{biblioteca}'", segundos, "preload")
+
+        resumo = ", ".join(
+            f"{item['name']}={item['seconds']:.2f}s"
+            for item in self.get_report()
+            if item["seconds"] is not None
+        )
+        logger.info(
+            f"Module preload done in {time.perf_counter() - inicio:.2f}s"
+            f" - import report: {resumo}"
+        )
+
+
+def _log_importacao(descricao: str, segundos: float, origem: str) -> None:
+    """Registra o tempo de importação (aviso acima do limite)"""
+    mensagem = f"{descricao} imported in {segundos:.2f}s ({origem})"
+    if segundos > LIMITE_IMPORTACAO_LENTA:
+        logger.warning(f"Slow import: {mensagem}")
+    else:
+        logger.info(mensagem)
+
+
+# Instância global compartilhada por todas as sessões do processo
+module_registry = ModuleRegistry()
+module_registry.register("Estoque", "apps.estoque.views", key="estoque")
+module_registry.register("Cobrança", "apps.boletos.views", key="boletos")
+module_registry.register("Financeiro", "apps.extratos.views", key="extratos")
+module_registry.register("Relatório de Vendas", "apps.vendas.views", key="vendas")
+module_registry.register(
+    "Relatório de Recebimentos", "apps.vendas.recebimentos", key="recebimentos"
+)
+module_registry.register("Relatório de Clientes", "apps.clientes.views", key="clientes")
+module_registry.register("Comex Produtos", "apps.comex.views", key="comex")
+module_registry.register("Relatório de Pedidos", "apps.vendas.pedidos", key="pedidos")
+module_registry.register("Ordem de Serviço", "apps.sac.views", key="sac")
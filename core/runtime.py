@@ -0,0 +1,259 @@
+"""
+Runtime da aplicação compartilhado pelo processo
+O Streamlit reexecuta o app.py a cada interação; aqui o Django, os containers
+e os serviços são criados uma única vez e reaproveitados por todas as sessões
+e reexecuções. Ganchos de aquecimento rodam em segundo plano após a
+inicialização, as tarefas periódicas ficam no core.scheduler e os ganchos de
+encerramento rodam na saída do processo
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from config.settings import settings
+from core.jobs import Job, job_manager
+from core.scheduler import scheduler
+
+logger = logging.getLogger(__name__)
+
+Hook = Callable[[], Any]
+
+
+class AppRuntime:
+    """
+    Serviços do processo, criados na primeira chamada a start()
+
+    Thread-safe: sessões simultâneas que chegam antes da inicialização
+    aguardam uma única criação.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._started = False
+        self._stopped = False
+        self._warmups: List[Tuple[str, Hook]] = []
+        self._teardowns: List[Tuple[str, Hook]] = []
+        self._warmup_job: Optional[Job] = None
+
+        self._vendas_container: Any = None
+        self._recebimentos_container: Any = None
+        self._data_service: Any = None
+        self._user_service: Any = None
+
+    @property
+    def started(self) -> bool:
+        """Indica se o runtime já foi inicializado"""
+        return self._started
+
+    def start(self) -> "AppRuntime":
+        """
+        Inicializa Django, containers e serviços (apenas na primeira chamada)
+
+        Returns:
+            AppRuntime: O próprio runtime, para encadeamento
+        """
+        if self._started:
+            return self
+
+        with self._lock:
+            if self._started:
+                return self
+
+            inicio = time.monotonic()
+            self._setup_django()
+
+            # Importados após o django.setup(): dependem dos models
+            from core.container_recebimentos import DIContainerRecebimentos
+            from core.container_vendas import DIContainer
+            from service import DataService, UserService
+
+            self._vendas_container = DIContainer()
+            self._recebimentos_container = DIContainerRecebimentos()
+            self._data_service = DataService()
+            self._user_service = UserService(self._data_service)
+
+            self._register_default_hooks()
+            self._register_periodic_jobs()
+            scheduler.start()
+            atexit.register(self.shutdown)
+            self._started = True
+            logger.info(
+                f"Application runtime started in {time.monotonic() - inicio:.2f}s"
+            )
+
+        self.warm_up()
+        return self
+
+    @property
+    def vendas_container(self) -> Any:
+        """Container de vendas (core.container_vendas.DIContainer)"""
+        return self.start()._vendas_container
+
+    @property
+    def recebimentos_container(self) -> Any:
+        """Container de recebimentos (core.container_recebimentos)"""
+        return self.start()._recebimentos_container
+
+    @property
+    def data_service(self) -> Any:
+        """DataService legado (service.py) compartilhado"""
+        return self.start()._data_service
+
+    @property
+    def user_service(self) -> Any:
+        """UserService legado (service.py) compartilhado"""
+        return self.start()._user_service
+
+    @property
+    def vendas_service(self) -> Any:
+        """Serviço de vendas compartilhado"""
+        return self.vendas_container.get_vendas_service()
+
+    @property
+    def recebimentos_service(self) -> Any:
+        """Serviço de recebimentos compartilhado"""
+        return self.recebimentos_container.get_recebimentos_service()
+
+    def on_warmup(self, name: str, hook: Hook) -> None:
+        """
+        Registra uma função executada em segundo plano após a inicialização
+
+        Args:
+            name: Nome do gancho (logs)
+            hook: Função sem argumentos (sem Streamlit)
+        """
+        with self._lock:
+            self._warmups.append((name, hook))
+
+    def on_teardown(self, name: str, hook: Hook) -> None:
+        """
+        Registra uma função executada no encerramento do processo
+
+        Os ganchos rodam na ordem inversa do registro.
+
+        Args:
+            name: Nome do gancho (logs)
+            hook: Função sem argumentos
+        """
+        with self._lock:
+            self._teardowns.append((name, hook))
+
+    def warm_up(self) -> Optional[Job]:
+        """
+        Executa os ganchos de aquecimento uma vez por processo, em segundo plano
+
+        Returns:
+            Optional[Job]: Tarefa do aquecimento (None antes do start())
+        """
+        with self._lock:
+            if not self._started or self._stopped:
+                return None
+            if self._warmup_job is None:
+                ganchos = list(self._warmups)
+                self._warmup_job = job_manager.submit(
+                    "runtime:warmup", _run_hooks, "warm-up", ganchos, key="warmup"
+                )
+            return self._warmup_job
+
+    def shutdown(self) -> None:
+        """Executa os ganchos de encerramento (apenas uma vez)"""
+        with self._lock:
+            if not self._started or self._stopped:
+                return
+            self._stopped = True
+            ganchos = list(reversed(self._teardowns))
+        _run_hooks("teardown", ganchos)
+        logger.info("Application runtime stopped")
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _setup_django() -> None:
+        """Configura o Django (idempotente)"""
+        import django
+        from django.apps import apps
+
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+        if not apps.ready:
+            django.setup()
+
+    def _register_default_hooks(self) -> None:
+        """Aquecimento e encerramento padrão dos serviços do processo"""
+        from infrastructure.database.pool import check_database, close_pools
+
+        # Primeira conexão do pool e dados do mês atual (tela inicial de
+        # vendas) prontos antes do primeiro login
+        self._warmups.insert(0, ("database", check_database))
+        self._warmups.insert(
+            1, ("vendas_mes_atual", lambda: self.vendas_service.get_vendas_mes_atual())
+        )
+
+        # Ordem inversa no encerramento: agendador, tarefas e por fim o banco
+        self._teardowns.insert(0, ("database_pools", close_pools))
+        self._teardowns.insert(1, ("jobs", job_manager.shutdown))
+        self._teardowns.insert(2, ("scheduler", scheduler.shutdown))
+
+    def _register_periodic_jobs(self) -> None:
+        """Tarefas periódicas padrão do processo (uma de cada, por nome)"""
+        from infrastructure.database.pool import check_database
+
+        if settings.app.keep_alive_url:
+            scheduler.register(
+                "keep_alive",
+                lambda: _keep_alive(settings.app.keep_alive_url),
+                interval=settings.app.keep_alive_interval,
+                delay=0,
+            )
+        scheduler.register(
+            "database_health",
+            lambda: check_database(max_age=0),
+            interval=settings.database.pool_ping_interval,
+        )
+        scheduler.register(
+            "rpa_watermarks",
+            _poll_watermarks,
+            interval=settings.cache.watermark_poll_interval,
+        )
+        scheduler.register(
+            "vendas_mes_atual",
+            lambda: self.vendas_service.get_vendas_mes_atual(),
+            interval=settings.cache.query_ttl,
+        )
+
+
+def _run_hooks(fase: str, ganchos: List[Tuple[str, Hook]]) -> None:
+    """Executa os ganchos em sequência; a falha de um não impede os demais"""
+    for nome, gancho in ganchos:
+        inicio = time.monotonic()
+        try:
+            gancho()
+            logger.info(
+                f"Runtime {fase} '{nome}' done in {time.monotonic() - inicio:.2f}s"
+            )
+        except Exception as e:
+            logger.warning(f"Runtime {fase} '{nome}' failed: {str(e)}")
+
+
+def _keep_alive(url: str) -> None:
+    """Acessa a URL pública do app para evitar a hibernação"""
+    import requests
+
+    response = requests.get(url, timeout=10)
+    logger.info(f"Keep-alive sent - status {response.status_code}")
+
+
+def _poll_watermarks() -> None:
+    """Lê as marcas d'água dos RPAs (novas ingestões invalidam os caches já)"""
+    from infrastructure.database.freshness import freshness_monitor
+
+    for rpa_id in {r for r in settings.cache.dataset_rpa_ids.values() if r}:
+        freshness_monitor.get_watermark(rpa_id)
+
+
+# Instância global compartilhada por todas as sessões do processo
+runtime = AppRuntime()
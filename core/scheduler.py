@@ -0,0 +1,232 @@
+"""
+Agendador de tarefas periódicas compartilhado pelo processo
+Keep-alive, health check do banco, leitura das marcas d'água e aquecimento de
+cache rodam em um único registro, identificado pelo nome da tarefa: abrir
+novas sessões não cria novas threads. Uma thread controla os horários e um
+pool limitado executa as tarefas
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import settings
+from core.jobs import release_connections
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PeriodicJob:
+    """
+    Tarefa periódica registrada no Scheduler
+
+    Attributes:
+        name: Nome único da tarefa
+        fn: Função sem argumentos (sem Streamlit)
+        interval: Intervalo (s) entre o fim de uma execução e o início da próxima
+        next_run: Próxima execução (time.monotonic())
+        running: Indica se a tarefa está em execução
+        runs: Execuções concluídas
+        failures: Execuções que levantaram exceção
+        last_run: Início da última execução (time.time())
+        last_duration: Duração (s) da última execução
+        last_error: Erro da última execução que falhou
+    """
+
+    name: str
+    fn: Callable[[], Any]
+    interval: float
+    next_run: float
+    running: bool = False
+    runs: int = 0
+    failures: int = 0
+    last_run: Optional[float] = None
+    last_duration: Optional[float] = None
+    last_error: Optional[str] = None
+
+
+class Scheduler:
+    """
+    Executa tarefas periódicas em um pool limitado de threads
+
+    Registrar uma tarefa com um nome já existente mantém a original (a menos
+    que replace=True), então o registro pode ser feito a cada execução do
+    script sem duplicar nada. Uma tarefa nunca executa sobreposta a si mesma:
+    a próxima execução é agendada a partir do fim da anterior.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        """
+        Inicializa o agendador (as threads só começam em start())
+
+        Args:
+            max_workers: Tarefas executando ao mesmo tempo
+        """
+        self.max_workers = max_workers
+        self._cond = threading.Condition()
+        self._jobs: Dict[str, PeriodicJob] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def register(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        interval: float,
+        delay: Optional[float] = None,
+        replace: bool = False,
+    ) -> PeriodicJob:
+        """
+        Registra uma tarefa periódica
+
+        Args:
+            name: Nome único da tarefa
+            fn: Função sem argumentos; roda fora da thread do script, então
+                não deve usar comandos do Streamlit
+            interval: Intervalo (s) entre execuções
+            delay: Espera (s) até a primeira execução (padrão: interval)
+            replace: Substitui a tarefa já registrada com o mesmo nome
+
+        Returns:
+            PeriodicJob: Tarefa registrada (a existente, se já havia uma)
+        """
+        if interval <= 0:
+            raise ValueError(f"Intervalo inválido para a tarefa '{name}': {interval}")
+
+        with self._cond:
+            existente = self._jobs.get(name)
+            if existente is not None and not replace:
+                return existente
+
+            espera = interval if delay is None else delay
+            job = PeriodicJob(name, fn, interval, time.monotonic() + espera)
+            self._jobs[name] = job
+            self._cond.notify_all()
+
+        logger.info(f"Periodic job '{name}' registered (every {interval:.0f}s)")
+        return job
+
+    def unregister(self, name: str) -> bool:
+        """
+        Remove a tarefa (uma execução em andamento termina normalmente)
+
+        Returns:
+            bool: False se a tarefa não estava registrada
+        """
+        with self._cond:
+            return self._jobs.pop(name, None) is not None
+
+    def run_now(self, name: str) -> bool:
+        """
+        Antecipa a próxima execução da tarefa
+
+        Returns:
+            bool: False se a tarefa não estava registrada
+        """
+        with self._cond:
+            job = self._jobs.get(name)
+            if job is None:
+                return False
+            job.next_run = time.monotonic()
+            self._cond.notify_all()
+            return True
+
+    def start(self) -> None:
+        """Inicia a thread de controle (idempotente)"""
+        with self._cond:
+            if self._stopped or self._thread is not None:
+                return
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="sgr-periodic"
+            )
+            self._thread = threading.Thread(
+                target=self._loop, name="sgr-scheduler", daemon=True
+            )
+            self._thread.start()
+        logger.info(f"Scheduler started with {self.max_workers} worker(s)")
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Para o agendamento e encerra as threads (idempotente)"""
+        with self._cond:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._cond.notify_all()
+            executor = self._executor
+
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Scheduler stopped")
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna o estado de cada tarefa registrada"""
+        agora = time.monotonic()
+        with self._cond:
+            return {
+                job.name: {
+                    "interval": job.interval,
+                    "running": job.running,
+                    "runs": job.runs,
+                    "failures": job.failures,
+                    "last_run": job.last_run,
+                    "last_duration": job.last_duration,
+                    "last_error": job.last_error,
+                    "next_run_in": max(job.next_run - agora, 0.0),
+                }
+                for job in self._jobs.values()
+            }
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _loop(self) -> None:
+        """Dispara as tarefas vencidas e dorme até a próxima"""
+        with self._cond:
+            while not self._stopped:
+                agora = time.monotonic()
+                proxima: Optional[float] = None
+                for job in self._jobs.values():
+                    if job.running:
+                        continue
+                    if job.next_run <= agora:
+                        job.running = True
+                        self._executor.submit(self._run, job)
+                    elif proxima is None or job.next_run < proxima:
+                        proxima = job.next_run
+
+                # Sem tarefas pendentes aguarda um registro ou um fim de execução
+                self._cond.wait(None if proxima is None else proxima - agora)
+
+    def _run(self, job: PeriodicJob) -> None:
+        """Executa a tarefa em uma thread do pool e agenda a próxima"""
+        inicio = time.monotonic()
+        erro: Optional[str] = None
+        try:
+            job.fn()
+        except Exception as e:
+            erro = str(e)
+            logger.warning(f"Periodic job '{job.name}' failed: {erro}")
+        finally:
+            release_connections()
+
+        fim = time.monotonic()
+        with self._cond:
+            job.running = False
+            job.runs += 1
+            job.last_run = time.time() - (fim - inicio)
+            job.last_duration = fim - inicio
+            if erro is not None:
+                job.failures += 1
+                job.last_error = erro
+            job.next_run = fim + job.interval
+            self._cond.notify_all()
+        logger.debug(f"Periodic job '{job.name}' done in {fim - inicio:.2f}s")
+
+
+# Instância global compartilhada por todas as sessões do processo
+scheduler = Scheduler(max_workers=settings.app.scheduler_workers)
@@ -0,0 +1,359 @@
+"""
+Gerenciador dos DataFrames de cada sessão Streamlit
+Guarda os frames fora do st.session_state, mede o tamanho de cada um e, acima
+dos orçamentos por sessão e global, descarta os de módulos inativos. Um frame
+descartado é recarregado na próxima leitura pela função de carga registrada
+(que passa pelo cache de queries compartilhado)
+"""
+
+import logging
+import threading
+import time
+import uuid
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from config.settings import settings
+from utils.memory import formatar_bytes, tamanho_dataframe
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Optional[pd.DataFrame]]
+
+# Chave do st.session_state com o identificador da sessão
+_CHAVE_SESSAO = "_session_data_token"
+
+
+class _SessionToken:
+    """Objeto guardado no st.session_state; quando a sessão termina e ele é
+    coletado, os frames da sessão são liberados"""
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+
+
+@dataclass
+class _Frame:
+    """DataFrame registrado por uma sessão"""
+
+    module: str
+    df: Optional[pd.DataFrame]
+    size: int
+    loader: Optional[Loader]
+    last_access: float
+
+
+@dataclass
+class _Session:
+    """Frames e módulo ativo de uma sessão"""
+
+    frames: Dict[str, _Frame] = field(default_factory=dict)
+    active_module: Optional[str] = None
+    last_seen: float = field(default_factory=time.monotonic)
+
+    @property
+    def size(self) -> int:
+        return sum(frame.size for frame in self.frames.values())
+
+
+@dataclass
+class _SessionDataStats:
+    """Contadores do gerenciador"""
+
+    evictions: int = 0
+    evicted_bytes: int = 0
+    rehydrations: int = 0
+    rehydration_failures: int = 0
+
+
+class SessionDataManager:
+    """
+    Armazena os DataFrames das sessões com orçamento de memória
+
+    Cada frame pertence a um módulo (ex.: "vendas", "sac"). Quando uma sessão
+    passa de max_session_bytes, ou o processo passa de max_total_bytes, os
+    frames de módulos que a sessão não está usando são descartados, dos menos
+    acessados para os mais acessados. Sessões sem interação há mais de
+    idle_seconds perdem também os frames do módulo ativo.
+    """
+
+    def __init__(
+        self,
+        max_session_bytes: int = 200 * 1024 * 1024,
+        max_total_bytes: int = 1024 * 1024 * 1024,
+        idle_seconds: float = 900,
+    ):
+        """
+        Inicializa o gerenciador
+
+        Args:
+            max_session_bytes: Orçamento de memória por sessão
+            max_total_bytes: Orçamento de memória somando todas as sessões
+            idle_seconds: Inatividade a partir da qual a sessão perde também
+                os frames do módulo ativo quando o orçamento global estoura
+        """
+        self.max_session_bytes = max_session_bytes
+        self.max_total_bytes = max_total_bytes
+        self.idle_seconds = idle_seconds
+
+        self._lock = threading.RLock()
+        self._sessions: Dict[str, _Session] = {}
+        self._stats = _SessionDataStats()
+        self._encerradas: Deque[str] = deque()
+
+    # ------------------------------------------------------------------
+    # API pública (sessão atual)
+    # ------------------------------------------------------------------
+    def put(
+        self,
+        key: str,
+        df: Optional[pd.DataFrame],
+        module: str,
+        loader: Optional[Loader] = None,
+    ) -> None:
+        """
+        Guarda o DataFrame da sessão atual
+
+        Args:
+            key: Nome do frame (ex.: "df_vendas")
+            df: DataFrame (None remove o frame)
+            module: Módulo dono do frame
+            loader: Função sem argumentos que recarrega o frame se ele for
+                descartado (sem loader, o frame descartado é esquecido)
+        """
+        if df is None:
+            self.pop(key)
+            return
+
+        sessao_id = self._session_id()
+        with self._lock:
+            sessao = self._get_session(sessao_id)
+            sessao.frames[key] = _Frame(
+                module=module,
+                df=df,
+                size=tamanho_dataframe(df),
+                loader=loader,
+                last_access=time.monotonic(),
+            )
+            self._enforce_budgets(sessao_id)
+            uso = ", ".join(
+                f"{chave}={formatar_bytes(frame.size)}"
+                for chave, frame in sessao.frames.items()
+            )
+            logger.info(
+                f"Session data ({module}): {formatar_bytes(sessao.size)} [{uso}]"
+            )
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Obtém o DataFrame da sessão atual, recarregando-o se foi descartado
+
+        Args:
+            key: Nome do frame
+
+        Returns:
+            Optional[pd.DataFrame]: Frame ou None se não houver
+        """
+        sessao_id = self._session_id()
+        with self._lock:
+            sessao = self._get_session(sessao_id)
+            frame = sessao.frames.get(key)
+            if frame is None:
+                return None
+            frame.last_access = time.monotonic()
+            if frame.df is not None:
+                return frame.df
+            loader = frame.loader
+
+        df = self._rehydrate(key, loader)
+
+        with self._lock:
+            atual = sessao.frames.get(key)
+            if atual is not frame:
+                # Substituído/removido enquanto recarregava
+                return atual.df if atual is not None else None
+            if df is None:
+                sessao.frames.pop(key, None)
+                return None
+            frame.df = df
+            frame.size = tamanho_dataframe(df)
+            frame.last_access = time.monotonic()
+            self._enforce_budgets(sessao_id)
+        return df
+
+    def has(self, key: str) -> bool:
+        """Indica se a sessão atual tem o frame (mesmo que descartado)"""
+        with self._lock:
+            return key in self._get_session(self._session_id()).frames
+
+    def pop(self, key: str) -> None:
+        """Remove o frame da sessão atual"""
+        with self._lock:
+            self._get_session(self._session_id()).frames.pop(key, None)
+
+    def activate(self, module: Optional[str]) -> None:
+        """
+        Informa o módulo em uso pela sessão atual
+
+        Chamado a cada execução do script; os demais módulos da sessão viram
+        candidatos a descarte.
+
+        Args:
+            module: Módulo selecionado no menu
+        """
+        sessao_id = self._session_id()
+        with self._lock:
+            sessao = self._get_session(sessao_id)
+            sessao.active_module = module
+            self._enforce_budgets(sessao_id)
+
+    def get_session_usage(self) -> Dict[str, int]:
+        """Retorna os bytes por frame da sessão atual (descartados valem 0)"""
+        with self._lock:
+            sessao = self._get_session(self._session_id())
+            return {key: frame.size for key, frame in sessao.frames.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas do gerenciador (todas as sessões)"""
+        with self._lock:
+            self._purge_sessions()
+            return {
+                "sessions": len(self._sessions),
+                "frames": sum(
+                    1
+                    for sessao in self._sessions.values()
+                    for frame in sessao.frames.values()
+                    if frame.df is not None
+                ),
+                "bytes": self._total_size(),
+                "max_total_bytes": self.max_total_bytes,
+                "max_session_bytes": self.max_session_bytes,
+                "evictions": self._stats.evictions,
+                "evicted_bytes": self._stats.evicted_bytes,
+                "rehydrations": self._stats.rehydrations,
+                "rehydration_failures": self._stats.rehydration_failures,
+            }
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _session_id(self) -> str:
+        """Identifica a sessão atual pelo token guardado no st.session_state"""
+        token = st.session_state.get(_CHAVE_SESSAO)
+        if token is None:
+            token = _SessionToken()
+            st.session_state[_CHAVE_SESSAO] = token
+            # Fim da sessão (ou session_state.clear()) libera os frames
+            weakref.finalize(token, self._drop_session, token.id)
+        return token.id
+
+    def _get_session(self, sessao_id: str) -> _Session:
+        """Obtém a sessão registrada e atualiza o último acesso (com o lock)"""
+        self._purge_sessions()
+        sessao = self._sessions.get(sessao_id)
+        if sessao is None:
+            sessao = self._sessions[sessao_id] = _Session()
+        sessao.last_seen = time.monotonic()
+        return sessao
+
+    def _drop_session(self, sessao_id: str) -> None:
+        """Marca a sessão encerrada para liberação
+
+        Chamado pelo coletor de lixo em qualquer thread e a qualquer momento
+        (inclusive com o lock adquirido): apenas enfileira.
+        """
+        self._encerradas.append(sessao_id)
+
+    def _purge_sessions(self) -> None:
+        """Libera os frames das sessões encerradas (com o lock)"""
+        while self._encerradas:
+            sessao = self._sessions.pop(self._encerradas.popleft(), None)
+            if sessao is not None and sessao.frames:
+                logger.debug(
+                    f"Session data released: {len(sessao.frames)} frame(s), "
+                    f"{formatar_bytes(sessao.size)}"
+                )
+
+    def _rehydrate(self, key: str, loader: Optional[Loader]) -> Optional[pd.DataFrame]:
+        """Recarrega um frame descartado (fora do lock)"""
+        if loader is None:
+            return None
+        try:
+            df = loader()
+        except Exception as e:
+            logger.warning(f"Could not rehydrate session frame '{key}': {str(e)}")
+            with self._lock:
+                self._stats.rehydration_failures += 1
+            return None
+
+        with self._lock:
+            self._stats.rehydrations += 1
+        logger.info(f"Session frame '{key}' rehydrated")
+        return df
+
+    def _total_size(self) -> int:
+        """Soma dos frames de todas as sessões (com o lock)"""
+        return sum(sessao.size for sessao in self._sessions.values())
+
+    def _enforce_budgets(self, sessao_id: str) -> None:
+        """Descarta frames inativos até caber nos orçamentos (com o lock)"""
+        sessao = self._sessions[sessao_id]
+        if sessao.size > self.max_session_bytes:
+            self._evict(
+                [(sessao, key) for key in self._inactive_keys(sessao)],
+                lambda: sessao.size > self.max_session_bytes,
+            )
+
+        if self._total_size() > self.max_total_bytes:
+            agora = time.monotonic()
+            candidatos: List[Tuple[_Session, str]] = []
+            for outra in self._sessions.values():
+                if agora - outra.last_seen > self.idle_seconds:
+                    chaves = [k for k, f in outra.frames.items() if f.df is not None]
+                else:
+                    chaves = self._inactive_keys(outra)
+                candidatos.extend((outra, key) for key in chaves)
+            self._evict(candidatos, lambda: self._total_size() > self.max_total_bytes)
+
+    @staticmethod
+    def _inactive_keys(sessao: _Session) -> List[str]:
+        """Frames carregados de módulos diferentes do módulo ativo"""
+        return [
+            key
+            for key, frame in sessao.frames.items()
+            if frame.df is not None and frame.module != sessao.active_module
+        ]
+
+    def _evict(
+        self, candidatos: List[Tuple[_Session, str]], acima: Callable[[], bool]
+    ) -> None:
+        """Descarta candidatos do menos para o mais recente enquanto acima()"""
+        candidatos.sort(key=lambda item: item[0].frames[item[1]].last_access)
+        for sessao, key in candidatos:
+            if not acima():
+                break
+            frame = sessao.frames[key]
+            self._stats.evictions += 1
+            self._stats.evicted_bytes += frame.size
+            logger.info(
+                f"Session frame '{key}' ({frame.module}) evicted: "
+                f"{formatar_bytes(frame.size)}"
+            )
+            if frame.loader is None:
+                del sessao.frames[key]
+            else:
+                frame.df = None
+                frame.size = 0
+
+
+# Instância global compartilhada por todas as sessões do processo
+session_data = SessionDataManager(
+    max_session_bytes=settings.cache.session_max_mb * 1024 * 1024,
+    max_total_bytes=settings.cache.session_total_max_mb * 1024 * 1024,
+    idle_seconds=settings.cache.session_idle_seconds,
+)
@@ -11,6 +11,7 @@ import pandas as pd
 
 from core.exceptions import BusinessLogicError, ValidationError
 from infrastructure.database.repositories_recebimentos import RecebimentosRepository
+from utils.memory import compactar_dataframe
 
 logger = logging.getLogger(__name__)
 
@@ -165,4 +166,6 @@ class RecebimentosService:
         if "Valor" in df.columns:
             df["Valor"] = pd.to_numeric(df["Valor"], errors="coerce").fillna(0.0)
 
-        return df
+        return compactar_dataframe(
+            df, colunas_categoricas=["Vencimento", "FormaPagamento", "Cliente"]
+        )
@@ -4,7 +4,7 @@ Implementa a lógica de negócios para análise de vendas
 """
 
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
@@ -17,6 +17,12 @@ from infrastructure.database.repositories_vendas import (
     VendaProdutosRepository,
     VendaRepository,
 )
+from infrastructure.database.vendas_snapshot import VendasSnapshotStore
+from utils.memory import compactar_dataframe
+from utils.numeric import converter_colunas_numericas
+
+# Grupos de produtos classificados como acessórios nas métricas de produtos
+GRUPOS_ACESSORIOS = ["PEÇA DE REPOSIÇÃO", "ACESSÓRIOS"]
 
 
 def _convert_to_date(value: Any) -> Optional[date]:
@@ -51,6 +57,7 @@ class VendasService:
         produtos_repository: VendaProdutosRepository,
         atualizacao_repository: VendaAtualizacaoRepository,
         configuracao_repository: Optional[VendaConfiguracaoRepository] = None,
+        snapshot_store: Optional[VendasSnapshotStore] = None,
     ):
         self.venda_repository = venda_repository
         self.pagamento_repository = pagamento_repository
@@ -59,6 +66,14 @@ class VendasService:
         self.configuracao_repository = (
             configuracao_repository or VendaConfiguracaoRepository()
         )
+        # Snapshot incremental opcional: filtros respondidos localmente
+        self.snapshot_store = snapshot_store
+
+    def _buscar_vendas(self, **filtros: Any) -> pd.DataFrame:
+        """Busca vendas pelo snapshot (se configurado) ou pelo repositório"""
+        if self.snapshot_store is not None:
+            return self.snapshot_store.get_vendas(**filtros)
+        return self.venda_repository.get_vendas_filtradas(**filtros)
 
     def get_vendas_mes_atual(self) -> pd.DataFrame:
         """
@@ -80,7 +95,7 @@ class VendasService:
             data_final = hoje.date()
 
             # Buscar vendas sem filtro de situação (apenas período e vendedores válidos)
-            df = self.venda_repository.get_vendas_filtradas(
+            df = self._buscar_vendas(
                 data_inicial=data_inicial,
                 data_final=data_final,
             )
@@ -97,6 +112,7 @@ class VendasService:
         vendedores: Optional[List[str]] = None,
         situacoes: Optional[List[str]] = None,
         origens: Optional[List[str]] = None,
+        colunas: Optional[List[str]] = None,
     ) -> pd.DataFrame:
         """
         Obtém vendas com filtros aplicados
@@ -107,6 +123,8 @@ class VendasService:
             vendedores: Lista de vendedores (opcional)
             situacoes: Lista de situações (opcional)
             origens: Lista de origens (opcional)
+            colunas: Colunas de "Vendas" a retornar (opcional, padrão todas).
+                     Inclua "ValorTotal" para manter o descarte de vendas sem valor
 
         Returns:
             pd.DataFrame: Dados de vendas filtrados
@@ -127,12 +145,13 @@ class VendasService:
             # Validar range de datas
             date_range = DateRangeValidator(start_date=data_inicio, end_date=data_fim)
 
-            df = self.venda_repository.get_vendas_filtradas(
+            df = self._buscar_vendas(
                 data_inicial=filtros.data_inicio,
                 data_final=filtros.data_fim,
                 vendedores=filtros.vendedores,
                 situacoes=filtros.situacoes,
                 origens=origens if origens else None,
+                colunas=colunas,
             )
 
             return self._processar_dados_vendas(df)
@@ -142,6 +161,55 @@ class VendasService:
         except Exception as e:
             raise BusinessLogicError(f"Erro ao filtrar vendas: {str(e)}")
 
+    def iter_vendas_filtradas(
+        self,
+        data_inicio: datetime,
+        data_fim: datetime,
+        vendedores: Optional[List[str]] = None,
+        situacoes: Optional[List[str]] = None,
+        origens: Optional[List[str]] = None,
+        colunas: Optional[List[str]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Percorre as vendas filtradas em blocos lidos direto do banco
+
+        Mesmos filtros e tratamento de get_vendas_filtradas, sem montar o
+        resultado inteiro (nem passar pelo snapshot): indicado para
+        exportações. Deve ser consumido na thread que o criou.
+
+        Args:
+            data_inicio: Data inicial do filtro
+            data_fim: Data final do filtro
+            vendedores: Lista de vendedores (opcional)
+            situacoes: Lista de situações (opcional)
+            origens: Lista de origens (opcional)
+            colunas: Colunas de "Vendas" a retornar (opcional, padrão todas)
+            chunk_size: Linhas por bloco (padrão: DB_STREAM_CHUNK_SIZE)
+
+        Yields:
+            pd.DataFrame: Bloco de vendas processado
+        """
+        filtros = VendasFilterValidator(
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            vendedores=vendedores or [],
+            situacoes=situacoes or [],
+        )
+        DateRangeValidator(start_date=data_inicio, end_date=data_fim)
+
+        blocos = self.venda_repository.iter_vendas_filtradas(
+            data_inicial=filtros.data_inicio,
+            data_final=filtros.data_fim,
+            vendedores=filtros.vendedores,
+            situacoes=filtros.situacoes,
+            origens=origens if origens else None,
+            colunas=colunas,
+            chunk_size=chunk_size,
+        )
+        for bloco in blocos:
+            yield self._processar_dados_vendas(bloco)
+
     def get_metricas_vendas(self, df_vendas: pd.DataFrame) -> Dict[str, Any]:
         """
         Calcula métricas de vendas
@@ -241,7 +309,7 @@ class VendasService:
                 return pd.DataFrame()
 
             vendas_por_vendedor = (
-                df_vendas.groupby("VendedorNome")
+                df_vendas.groupby("VendedorNome", observed=True)
                 .agg(
                     total_valor=("ValorTotal", "sum"),
                     quantidade=("ValorTotal", "count"),
@@ -264,6 +332,62 @@ class VendasService:
         except Exception as e:
             raise BusinessLogicError(f"Erro ao agrupar por vendedor: {str(e)}")
 
+    def get_totais_vendedor_por_periodos(
+        self,
+        periodos: Dict[str, Tuple[date, date]],
+        situacoes_excluir: Optional[List[str]] = None,
+        excluir_em: Optional[Sequence[str]] = None,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Obtém o total vendido por vendedor em vários períodos com uma única query
+
+        Args:
+            periodos: Dicionário nome -> (data_inicial, data_final)
+            situacoes_excluir: Situações a excluir (opcional)
+            excluir_em: Nomes dos períodos em que situacoes_excluir se aplica
+                        (None aplica em todos)
+
+        Returns:
+            Dict[str, Dict[str, float]]: nome do período -> {vendedor: total}
+
+        Raises:
+            BusinessLogicError: Se erro ao buscar os totais
+        """
+        try:
+            janelas = {
+                nome: (
+                    _convert_to_date(inicio),
+                    _convert_to_date(fim),
+                    bool(situacoes_excluir)
+                    and (excluir_em is None or nome in excluir_em),
+                )
+                for nome, (inicio, fim) in periodos.items()
+            }
+            totais: Dict[str, Dict[str, float]] = {nome: {} for nome in janelas}
+            if not janelas:
+                return totais
+
+            df = self.venda_repository.get_totais_vendedor_por_periodos(
+                periodos=list(set(janelas.values())),
+                situacoes_excluir=situacoes_excluir,
+            )
+            if df.empty:
+                return totais
+
+            chaves = ["DataInicial", "DataFinal", "ExcluiSituacoes"]
+            for (inicio, fim, exclui), grupo in df.groupby(chaves):
+                valores = dict(zip(grupo["VendedorNome"], grupo["ValorTotal"]))
+                for nome, janela in janelas.items():
+                    if janela == (inicio, fim, bool(exclui)):
+                        totais[nome] = valores
+
+            return totais
+
+        except Exception as e:
+            raise BusinessLogicError(
+                f"Erro ao obter totais de vendedores por período: {str(e)}"
+            )
+
     def get_tendencia_vendas(
         self, df_vendas: pd.DataFrame, periodo: str = "mes"
     ) -> pd.DataFrame:
@@ -411,7 +535,9 @@ class VendasService:
             if col in df.columns:
                 df[col] = pd.to_datetime(df[col], errors="coerce")
 
-        return df
+        # Vendedor, situação, origem etc. repetem muito: category economiza
+        # memória do frame guardado em st.session_state
+        return compactar_dataframe(df)
 
     def get_produtos_detalhados(
         self,
@@ -516,39 +642,17 @@ class VendasService:
         # Fazer cópia para evitar modificar original
         df = df.copy()
 
-        def clean_numeric_value(val):
-            """Limpa valores numéricos que podem estar no formato ('10.00',) ou vazios"""
-            if not val or str(val).strip() == "" or str(val) == "None":
-                return 0.0
-
-            # Converter para string e limpar
-            val_str = str(val)
-            # Remover tuplas: ('10.00',) -> 10.00
-            val_str = (
-                val_str.replace("(", "")
-                .replace(")", "")
-                .replace("'", "")
-                .replace('"', "")
-                .replace(",", ".")
-            )
-            val_str = val_str.strip()
-
-            try:
-                return float(val_str) if val_str else 0.0
-            except:
-                return 0.0
-
-        # Converter colunas de valores
-        valor_columns = [
-            "Quantidade",
-            "ValorCusto",
-            "ValorVenda",
-            "ValorDesconto",
-            "ValorTotal",
-        ]
-        for col in valor_columns:
-            if col in df.columns:
-                df[col] = df[col].apply(clean_numeric_value)
+        # Converter colunas de valores (Decimal, None e formato ('10.00',))
+        converter_colunas_numericas(
+            df,
+            [
+                "Quantidade",
+                "ValorCusto",
+                "ValorVenda",
+                "ValorDesconto",
+                "ValorTotal",
+            ],
+        )
 
         # Converter colunas de data
         date_columns = ["Data"]
@@ -591,6 +695,102 @@ class VendasService:
 
         return df
 
+    def calcular_valores_proporcionais(
+        self,
+        df_produtos: pd.DataFrame,
+        df_vendas: pd.DataFrame,
+        coluna_valor: str = "ValorTotal",
+    ) -> pd.Series:
+        """
+        Rateia o ValorTotal de cada venda entre seus produtos, proporcionalmente
+        ao valor de cada item dentro da venda (operação vetorizada)
+
+        A soma dos produtos por venda é calculada uma única vez via
+        groupby/transform, evitando filtrar o DataFrame inteiro a cada linha.
+
+        Args:
+            df_produtos: DataFrame de produtos com colunas Venda_ID e coluna_valor
+            df_vendas: DataFrame de vendas com colunas ID_Gestao e ValorTotal
+            coluna_valor: Coluna de valor do produto usada como peso do rateio
+
+        Returns:
+            pd.Series: Valor proporcional de cada produto (alinhado ao índice
+            de df_produtos); 0 quando a venda ou a soma dos produtos é zero
+        """
+        if df_produtos.empty:
+            return pd.Series(0.0, index=df_produtos.index, dtype="float64")
+
+        valores_produto = pd.to_numeric(
+            df_produtos[coluna_valor], errors="coerce"
+        ).fillna(0.0)
+
+        # Soma dos produtos de cada venda, replicada em cada linha do grupo
+        soma_produtos = valores_produto.groupby(df_produtos["Venda_ID"]).transform(
+            "sum"
+        )
+
+        # ValorTotal real de cada venda (última ocorrência, como em um dict)
+        valores_venda = (
+            df_vendas.drop_duplicates(subset="ID_Gestao", keep="last")
+            .set_index("ID_Gestao")["ValorTotal"]
+            .pipe(pd.to_numeric, errors="coerce")
+        )
+        valor_venda = df_produtos["Venda_ID"].map(valores_venda).fillna(0.0)
+
+        valido = (valor_venda != 0) & (soma_produtos != 0)
+        proporcional = pd.Series(0.0, index=df_produtos.index, dtype="float64")
+        proporcional[valido] = (
+            valor_venda[valido] * valores_produto[valido] / soma_produtos[valido]
+        )
+        return proporcional
+
+    def classificar_tipo_produto(
+        self,
+        df_produtos: pd.DataFrame,
+        grupos_acessorios: Optional[List[str]] = None,
+    ) -> pd.Series:
+        """
+        Classifica produtos como "Acessório" ou "Equipamento" pelo NomeGrupo
+
+        Args:
+            df_produtos: DataFrame de produtos com coluna NomeGrupo
+            grupos_acessorios: Grupos considerados acessórios (opcional)
+
+        Returns:
+            pd.Series: Tipo de cada produto
+        """
+        if grupos_acessorios is None:
+            grupos_acessorios = GRUPOS_ACESSORIOS
+
+        eh_acessorio = df_produtos["NomeGrupo"].isin(grupos_acessorios)
+        return eh_acessorio.map({True: "Acessório", False: "Equipamento"})
+
+    def get_valores_por_tipo_produto(
+        self, df_produtos: pd.DataFrame, df_vendas: pd.DataFrame
+    ) -> Dict[str, float]:
+        """
+        Calcula o valor proporcional de vendas separado em Equipamentos e
+        Acessórios
+
+        Args:
+            df_produtos: DataFrame de produtos detalhados (com Venda_ID)
+            df_vendas: DataFrame de vendas (com ID_Gestao e ValorTotal)
+
+        Returns:
+            Dict[str, float]: Valores por tipo ("Equipamento" e "Acessório")
+        """
+        if df_produtos.empty:
+            return {"Equipamento": 0.0, "Acessório": 0.0}
+
+        valores = self.calcular_valores_proporcionais(df_produtos, df_vendas)
+        tipos = self.classificar_tipo_produto(df_produtos)
+        totais = valores.groupby(tipos).sum()
+
+        return {
+            "Equipamento": float(totais.get("Equipamento", 0.0)),
+            "Acessório": float(totais.get("Acessório", 0.0)),
+        }
+
     def formatar_valor_monetario(self, valor: float) -> str:
         """
         Formata valor como moeda brasileira
@@ -0,0 +1,168 @@
+"""
+Leitura de resultados via COPY ... TO STDOUT decodificada pelo Arrow
+O PostgreSQL envia o resultado como CSV e o leitor de CSV do pyarrow converte
+as colunas já tipadas (numeric -> float64, date -> date64), sem criar um
+objeto Python (tupla, Decimal, str) por célula
+"""
+
+import io
+import logging
+import threading
+from typing import Any, Dict, Hashable, Optional, Sequence, Set, Tuple
+
+from django.db import connections
+
+import pandas as pd
+
+from infrastructure.database.streaming import read_query_frame
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - pyarrow está em requirements.txt
+    pa = None
+    pa_csv = None
+
+logger = logging.getLogger(__name__)
+
+# OIDs dos tipos do PostgreSQL suportados pela leitura via Arrow
+_OID_BOOL = 16
+_OIDS_INTEIROS = {20, 21, 23}  # int8, int2, int4
+_OIDS_DECIMAIS = {700, 701, 1700}  # float4, float8, numeric
+_OIDS_TEXTO = {19, 25, 1042, 1043}  # name, text, char, varchar
+_OID_DATE = 1082
+_OID_TIMESTAMP = 1114
+_OID_TIMESTAMPTZ = 1184
+
+# Colunas (nome, OID) por modelo de query: COPY não preenche
+# cursor.description, então a consulta LIMIT 0 roda só na primeira leitura
+_MAX_DESCRICOES = 256
+_descricoes: Dict[Hashable, Tuple[Tuple[str, int], ...]] = {}
+_descricoes_lock = threading.Lock()
+
+
+def read_query_arrow(
+    query: str,
+    params: Optional[Sequence[Any]] = None,
+    dictionary_columns: Optional[Sequence[str]] = None,
+    using: str = "default",
+) -> pd.DataFrame:
+    """
+    Executa a query via COPY e converte o resultado com o Arrow
+
+    Colunas numeric chegam como float64, inteiros como int64 (float64 se
+    houver nulos), date como datetime.date (date64 no Arrow) e timestamps como
+    datetime64. Se o pyarrow não estiver instalado ou a query tiver colunas de
+    tipos não suportados (arrays, json, xid...), usa a leitura por cursor.
+    Nomes e tipos das colunas são descobertos na primeira leitura de cada
+    modelo de query; as seguintes fazem apenas o COPY.
+
+    Args:
+        query: Query SQL (SELECT)
+        params: Parâmetros da query
+        dictionary_columns: Colunas de texto codificadas como dicionário,
+            retornadas como category no pandas. Agrupamentos sobre elas
+            devem usar observed=True para não listar categorias sem linhas.
+        using: Alias da conexão Django
+
+    Returns:
+        pd.DataFrame: Resultado da query
+    """
+    if pa is None:
+        return read_query_frame(query, params, using=using)
+
+    chave = _chave_descricao(query, params, using)
+    with connections[using].cursor() as cursor:
+        sql = cursor.mogrify(query, params or []).decode("utf-8")
+        sql = sql.strip().rstrip(";")
+
+        descricao = _descricoes.get(chave)
+        if descricao is None:
+            # Descobrir nomes e tipos das colunas sem trazer linhas
+            cursor.execute(f"SELECT * FROM ({sql}) AS _arrow_query LIMIT 0")
+            descricao = tuple((col[0], col[1]) for col in cursor.description)
+            with _descricoes_lock:
+                if len(_descricoes) >= _MAX_DESCRICOES:
+                    _descricoes.clear()
+                _descricoes[chave] = descricao
+
+        colunas = [nome for nome, _ in descricao]
+        tipos = _tipos_arrow(descricao, set(dictionary_columns or []))
+        if tipos is None or len(set(colunas)) != len(colunas):
+            logger.debug("Arrow read not supported for query, using cursor")
+            return read_query_frame(query, params, using=using)
+
+        buffer = io.BytesIO()
+        cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH (FORMAT csv)", buffer)
+
+    schema = pa.schema([pa.field(nome, tipo) for nome, tipo in tipos.items()])
+    if buffer.tell() == 0:
+        tabela = schema.empty_table()
+    else:
+        buffer.seek(0)
+        try:
+            tabela = pa_csv.read_csv(
+                buffer,
+                read_options=pa_csv.ReadOptions(column_names=colunas),
+                parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types=schema,
+                    # COPY CSV: NULL é vazio sem aspas e "" é string vazia
+                    null_values=[""],
+                    strings_can_be_null=True,
+                    quoted_strings_can_be_null=False,
+                    true_values=["t"],
+                    false_values=["f"],
+                ),
+            )
+        except pa.ArrowInvalid as e:
+            # Colunas guardadas não conferem mais (ex.: tabela alterada)
+            logger.warning(f"Arrow read failed, using cursor: {str(e)}")
+            with _descricoes_lock:
+                _descricoes.pop(chave, None)
+            return read_query_frame(query, params, using=using)
+
+    return tabela.to_pandas(coerce_temporal_nanoseconds=True)
+
+
+def _chave_descricao(
+    query: str, params: Optional[Sequence[Any]], using: str
+) -> Hashable:
+    """
+    Identifica o modelo da query: texto com placeholders e tipos dos parâmetros
+
+    Os tipos entram na chave porque mogrify insere os valores como literais,
+    e o tipo de uma coluna pode depender deles (ex.: SELECT %s).
+    """
+    tipos = tuple(type(valor).__name__ for valor in params or [])
+    return (using, query, tipos)
+
+
+def _tipos_arrow(
+    description: Sequence[Any], dictionary_columns: Set[str]
+) -> Optional[Dict[str, Any]]:
+    """Mapeia as colunas (nome, OID) para tipos Arrow (None se houver não suportado)"""
+    tipos: Dict[str, Any] = {}
+    for coluna in description:
+        nome, oid = coluna[0], coluna[1]
+        if oid in _OIDS_TEXTO:
+            if nome in dictionary_columns:
+                tipos[nome] = pa.dictionary(pa.int32(), pa.string())
+            else:
+                tipos[nome] = pa.string()
+        elif oid in _OIDS_DECIMAIS:
+            tipos[nome] = pa.float64()
+        elif oid in _OIDS_INTEIROS:
+            tipos[nome] = pa.int64()
+        elif oid == _OID_BOOL:
+            tipos[nome] = pa.bool_()
+        elif oid == _OID_DATE:
+            tipos[nome] = pa.date64()
+        elif oid == _OID_TIMESTAMP:
+            tipos[nome] = pa.timestamp("us")
+        elif oid == _OID_TIMESTAMPTZ:
+            # O backend do Django fixa a sessão em UTC quando USE_TZ=True
+            tipos[nome] = pa.timestamp("us", tz="UTC")
+        else:
+            return None
+    return tipos
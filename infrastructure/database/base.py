@@ -4,7 +4,7 @@ Implementa funcionalidades comuns para todos os repositórios
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 import pandas as pd
 
@@ -48,6 +48,31 @@ class BaseRepository:
             logger.error(f"Erro ao converter QuerySet para DataFrame: {str(e)}")
             raise Exception(f"Erro na conversão de dados: {str(e)}")
 
+    def fetch_dataframe(
+        self,
+        query: str,
+        params: Optional[Sequence[Any]] = None,
+        dictionary_columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Executa SQL bruto e retorna DataFrame com colunas já tipadas
+
+        Lê o resultado via COPY decodificado pelo Arrow: numeric chega como
+        float64 (sem Decimal por célula) e date como datetime.date. Queries
+        com tipos não suportados usam a leitura por cursor.
+
+        Args:
+            query: Query SQL (SELECT)
+            params: Parâmetros da query
+            dictionary_columns: Colunas de texto retornadas como category
+
+        Returns:
+            pd.DataFrame: Resultado da query
+        """
+        from infrastructure.database.arrow_reader import read_query_arrow
+
+        return read_query_arrow(query, params, dictionary_columns)
+
     def health_check(self) -> bool:
         """
         Verifica se a conexão com o banco está saudável
@@ -55,14 +80,11 @@ class BaseRepository:
         Returns:
             bool: True se conexão está OK
         """
-        try:
-            from django.db import connection
+        # SELECT 1 compartilhado: um sucesso recente vale para todos os
+        # repositórios em vez de uma ida ao banco por repositório
+        from infrastructure.database.pool import check_database
 
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                return True
-        except Exception:
-            return False
+        return check_database()
 
     def log_query_performance(
         self, query_name: str, duration: float, record_count: int
@@ -0,0 +1,188 @@
+"""
+Monitor de atualização dos dados baseado nas execuções dos RPAs
+Lê a marca d'água (última execução) de cada RPA em RPA_Atualizacao com uma
+única query barata por RPA, permitindo revalidar caches apenas quando a
+ingestão realmente aconteceu
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+Watermark = Optional[Tuple]
+
+
+def read_rpa_watermark(rpa_id: int) -> Watermark:
+    """
+    Lê a última execução de um RPA em RPA_Atualizacao
+
+    Args:
+        rpa_id: Identificador do RPA
+
+    Returns:
+        Tuple (Data, Hora) da última execução ou None se nunca executou
+    """
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT "Data", "Hora"
+            FROM "RPA_Atualizacao"
+            WHERE "RPA_id" = %s
+            ORDER BY "Data" DESC, "Hora" DESC
+            LIMIT 1
+            """,
+            [rpa_id],
+        )
+        row = cursor.fetchone()
+    return tuple(row) if row else None
+
+
+class FreshnessMonitor:
+    """
+    Acompanha as marcas d'água dos RPAs para todo o processo
+
+    Cada RPA é consultado no máximo uma vez a cada poll_interval segundos,
+    independentemente do número de sessões. Conjuntos de dados são associados
+    a um RPA e expõem uma "versão" que só muda após uma nova ingestão.
+    """
+
+    def __init__(
+        self,
+        poll_interval: float = 30,
+        fallback_ttl: float = 300,
+        provider: Optional[Callable[[int], Watermark]] = None,
+    ):
+        """
+        Inicializa o monitor
+
+        Args:
+            poll_interval: Intervalo mínimo entre leituras de cada RPA (segundos)
+            fallback_ttl: Janela de validade para conjuntos sem RPA associado
+            provider: Função que lê a marca d'água de um RPA
+        """
+        self.poll_interval = poll_interval
+        self.fallback_ttl = fallback_ttl
+        self._provider = provider or read_rpa_watermark
+        self._lock = threading.Lock()
+        self._watermarks: Dict[int, Tuple[float, Watermark]] = {}
+        self._datasets: Dict[str, Optional[int]] = {}
+        self._listeners: Dict[int, List[Callable[[int], None]]] = {}
+
+    def register_dataset(self, dataset: str, rpa_id: Optional[int]) -> None:
+        """
+        Associa um conjunto de dados ao RPA que o alimenta
+
+        Args:
+            dataset: Nome do conjunto (ex.: "extratos")
+            rpa_id: RPA responsável (None usa a janela fallback_ttl)
+        """
+        with self._lock:
+            self._datasets[dataset] = rpa_id
+
+    def subscribe(self, rpa_id: int, callback: Callable[[int], None]) -> None:
+        """
+        Registra callback chamado quando uma nova ingestão do RPA é detectada
+
+        Args:
+            rpa_id: Identificador do RPA
+            callback: Função que recebe o rpa_id
+        """
+        with self._lock:
+            self._listeners.setdefault(rpa_id, []).append(callback)
+
+    def get_watermark(self, rpa_id: int) -> Watermark:
+        """
+        Obtém a marca d'água do RPA, consultando o banco apenas se a leitura
+        anterior for mais antiga que poll_interval
+
+        Args:
+            rpa_id: Identificador do RPA
+
+        Returns:
+            Marca d'água atual (ou a última conhecida se a leitura falhar)
+        """
+        agora = time.monotonic()
+        with self._lock:
+            cached = self._watermarks.get(rpa_id)
+        if cached and agora - cached[0] < self.poll_interval:
+            return cached[1]
+
+        try:
+            watermark = self._provider(rpa_id)
+        except Exception as e:
+            logger.warning(f"Error reading RPA {rpa_id} watermark: {str(e)}")
+            return cached[1] if cached else None
+
+        with self._lock:
+            anterior = self._watermarks.get(rpa_id)
+            self._watermarks[rpa_id] = (agora, watermark)
+            listeners = list(self._listeners.get(rpa_id, []))
+        mudou = anterior is not None and anterior[1] != watermark
+
+        if mudou:
+            logger.info(f"Nova ingestão do RPA {rpa_id} detectada: {watermark}")
+            for callback in listeners:
+                try:
+                    callback(rpa_id)
+                except Exception as e:
+                    logger.error(f"Error notifying RPA {rpa_id} listener: {str(e)}")
+
+        return watermark
+
+    def get_version(self, dataset: str) -> str:
+        """
+        Retorna a versão atual de um conjunto de dados
+
+        A versão é estável entre ingestões e deve ser usada como argumento de
+        funções com @st.cache_data para que o cache só expire quando o RPA
+        correspondente executar.
+
+        Args:
+            dataset: Nome do conjunto registrado
+
+        Returns:
+            str: Identificador da versão
+        """
+        with self._lock:
+            rpa_id = self._datasets.get(dataset)
+
+        if rpa_id is None:
+            # Sem RPA configurado: mantém o comportamento de expiração por tempo
+            return f"ttl:{int(time.time() // self.fallback_ttl)}"
+
+        watermark = self.get_watermark(rpa_id)
+        if watermark is None:
+            return f"rpa{rpa_id}:none"
+        return f"rpa{rpa_id}:" + "|".join(str(v) for v in watermark)
+
+    def refresh(self, rpa_id: Optional[int] = None) -> None:
+        """
+        Força nova leitura das marcas d'água na próxima consulta
+
+        Args:
+            rpa_id: RPA específico (None força todos)
+        """
+        with self._lock:
+            if rpa_id is None:
+                for chave, (_, watermark) in self._watermarks.items():
+                    self._watermarks[chave] = (float("-inf"), watermark)
+            elif rpa_id in self._watermarks:
+                _, watermark = self._watermarks[rpa_id]
+                self._watermarks[rpa_id] = (float("-inf"), watermark)
+
+
+# Instância global compartilhada por todas as sessões do processo
+freshness_monitor = FreshnessMonitor(
+    poll_interval=settings.cache.watermark_poll_interval,
+    fallback_ttl=settings.app.cache_ttl,
+)
+
+for _dataset, _rpa_id in settings.cache.dataset_rpa_ids.items():
+    freshness_monitor.register_dataset(_dataset, _rpa_id)
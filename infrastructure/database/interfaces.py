@@ -33,6 +33,7 @@ class VendaRepositoryInterface(BaseRepositoryInterface):
         situacoes_excluir: Optional[List[str]] = None,
         apenas_vendedores_ativos: bool = False,
         origens: Optional[List[str]] = None,
+        colunas: Optional[List[str]] = None,
     ) -> pd.DataFrame:
         """Obtém vendas com filtros aplicados"""
         pass
@@ -76,6 +77,7 @@ class VendaProdutosRepositoryInterface(BaseRepositoryInterface):
         data_final: Optional[date] = None,
         vendedores: Optional[List[str]] = None,
         situacoes: Optional[List[str]] = None,
+        agregar_no_banco: bool = True,
     ) -> pd.DataFrame:
         """Obtém produtos agregados (somatórios) das vendas com filtros aplicados"""
         pass
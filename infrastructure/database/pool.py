@@ -0,0 +1,474 @@
+"""
+Pool de conexões PostgreSQL compartilhado pelo processo
+Usado pelo backend Django (infrastructure.database.pooled_backend) e pelos
+repositórios legados de repository.py, evitando abrir uma conexão TCP e
+autenticar a cada chamada
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+import psycopg2
+import psycopg2.extensions
+
+from config.settings import settings
+from core.exceptions import DatabaseConnectionError
+
+logger = logging.getLogger(__name__)
+
+Connection = psycopg2.extensions.connection
+
+
+@dataclass
+class _PooledConnection:
+    """Conexão ociosa no pool"""
+
+    connection: Connection
+    created_at: float
+    last_used: float
+
+
+@dataclass
+class _Checkout:
+    """Conexão emprestada a uma thread"""
+
+    connection: Connection
+    created_at: float
+    thread: threading.Thread
+
+
+@dataclass
+class _PoolStats:
+    """Contadores do pool"""
+
+    checkouts: int = 0
+    created: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    timeouts: int = 0
+    failed_pings: int = 0
+    recycled: int = 0
+    reclaimed: int = 0
+
+
+class PoolTimeoutError(DatabaseConnectionError):
+    """Nenhuma conexão ficou livre dentro do tempo limite"""
+
+    pass
+
+
+class ConnectionPool:
+    """
+    Pool de conexões psycopg2 limitado e thread-safe
+
+    Na retirada, conexões ociosas há mais de ping_interval segundos são
+    testadas com SELECT 1 (pre-ping) e conexões mais antigas que max_lifetime
+    são recicladas. Conexões de threads encerradas sem devolução (ex.: threads
+    de execução do Streamlit) são recuperadas antes de abrir novas.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Connection],
+        name: str = "default",
+        max_size: int = 10,
+        timeout: float = 30,
+        ping_interval: float = 30,
+        max_lifetime: float = 1800,
+    ):
+        """
+        Inicializa o pool
+
+        Args:
+            connect: Função que abre uma nova conexão
+            name: Nome do pool (logs e métricas)
+            max_size: Máximo de conexões abertas (ociosas + emprestadas)
+            timeout: Tempo máximo (s) aguardando uma conexão livre
+            ping_interval: Ociosidade (s) a partir da qual a conexão é testada
+                na retirada (0 testa sempre)
+            max_lifetime: Idade máxima (s) de uma conexão antes de ser reciclada
+        """
+        self.name = name
+        self.max_size = max_size
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self.max_lifetime = max_lifetime
+        self._connect = connect
+
+        self._cond = threading.Condition()
+        self._idle: Deque[_PooledConnection] = deque()
+        self._in_use: Dict[int, _Checkout] = {}
+        self._size = 0
+        self._stats = _PoolStats()
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def acquire(self) -> Connection:
+        """
+        Retira uma conexão saudável do pool, abrindo uma nova se necessário
+
+        Returns:
+            Connection: Conexão psycopg2
+
+        Raises:
+            PoolTimeoutError: Se o pool continuar esgotado após timeout
+            DatabaseConnectionError: Se não for possível abrir a conexão
+        """
+        inicio = time.monotonic()
+        aguardou = False
+
+        while True:
+            item: Optional[_PooledConnection] = None
+            orfas: List[_Checkout] = []
+
+            with self._cond:
+                while True:
+                    if self._idle:
+                        # LIFO: reutiliza a conexão usada mais recentemente
+                        item = self._idle.pop()
+                        break
+
+                    # Antes de abrir outra conexão, recuperar as abandonadas
+                    orfas = self._collect_orphans()
+                    if orfas:
+                        break
+
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+
+                    restante = self.timeout - (time.monotonic() - inicio)
+                    if restante <= 0:
+                        self._stats.timeouts += 1
+                        raise PoolTimeoutError(
+                            f"Nenhuma conexão livre no pool '{self.name}' após "
+                            f"{self.timeout:g}s ({self.max_size} em uso)"
+                        )
+                    aguardou = True
+                    self._cond.wait(restante)
+
+            if orfas:
+                for checkout in orfas:
+                    self._return(checkout.connection, checkout.created_at)
+                continue
+
+            if item is not None and not self._is_healthy(item):
+                self._discard(item.connection)
+                continue
+
+            if item is None:
+                connection = self._open()
+                created_at = time.monotonic()
+            else:
+                connection = item.connection
+                created_at = item.created_at
+
+            with self._cond:
+                self._in_use[id(connection)] = _Checkout(
+                    connection=connection,
+                    created_at=created_at,
+                    thread=threading.current_thread(),
+                )
+                self._stats.checkouts += 1
+                if aguardou:
+                    espera = time.monotonic() - inicio
+                    self._stats.waits += 1
+                    self._stats.wait_seconds += espera
+                    self._stats.max_wait_seconds = max(
+                        self._stats.max_wait_seconds, espera
+                    )
+            return connection
+
+    def release(self, connection: Connection) -> None:
+        """
+        Devolve a conexão ao pool (transação aberta é desfeita)
+
+        Args:
+            connection: Conexão obtida por acquire()
+        """
+        with self._cond:
+            checkout = self._in_use.pop(id(connection), None)
+
+        if checkout is None:
+            # Conexão desconhecida (ou já devolvida): apenas fechar
+            _close_quietly(connection)
+            return
+
+        self._return(connection, checkout.created_at)
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """
+        Empresta uma conexão durante o bloco with
+
+        Example:
+            with pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self) -> None:
+        """Fecha as conexões ociosas do pool"""
+        with self._cond:
+            ociosas = list(self._idle)
+            self._idle.clear()
+            self._size -= len(ociosas)
+            self._cond.notify_all()
+        for item in ociosas:
+            _close_quietly(item.connection)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas de uso do pool"""
+        with self._cond:
+            return {
+                "name": self.name,
+                "size": self._size,
+                "max_size": self.max_size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "checkouts": self._stats.checkouts,
+                "created": self._stats.created,
+                "waits": self._stats.waits,
+                "wait_seconds": round(self._stats.wait_seconds, 3),
+                "max_wait_seconds": round(self._stats.max_wait_seconds, 3),
+                "timeouts": self._stats.timeouts,
+                "failed_pings": self._stats.failed_pings,
+                "recycled": self._stats.recycled,
+                "reclaimed": self._stats.reclaimed,
+            }
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _open(self) -> Connection:
+        """Abre nova conexão (a vaga já foi reservada em _size)"""
+        try:
+            connection = self._connect()
+        except Exception as e:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            if isinstance(e, DatabaseConnectionError):
+                raise
+            raise DatabaseConnectionError(f"Erro ao conectar ao banco de dados: {e}")
+
+        with self._cond:
+            self._stats.created += 1
+        logger.debug(f"Pool '{self.name}': new connection opened")
+        return connection
+
+    def _is_healthy(self, item: _PooledConnection) -> bool:
+        """Verifica a conexão ociosa antes de emprestá-la"""
+        agora = time.monotonic()
+        if item.connection.closed:
+            return False
+
+        if agora - item.created_at > self.max_lifetime:
+            with self._cond:
+                self._stats.recycled += 1
+            return False
+
+        if agora - item.last_used < self.ping_interval:
+            return True
+
+        try:
+            with item.connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            _end_transaction(item.connection)
+            return True
+        except Exception as e:
+            logger.warning(f"Pool '{self.name}': discarding dead connection: {e}")
+            with self._cond:
+                self._stats.failed_pings += 1
+            return False
+
+    def _return(self, connection: Connection, created_at: float) -> None:
+        """Limpa o estado da conexão e a devolve à fila de ociosas"""
+        try:
+            reutilizavel = not connection.closed and _end_transaction(connection)
+        except Exception:
+            reutilizavel = False
+
+        if not reutilizavel:
+            self._discard(connection)
+            return
+
+        with self._cond:
+            self._idle.append(
+                _PooledConnection(
+                    connection=connection,
+                    created_at=created_at,
+                    last_used=time.monotonic(),
+                )
+            )
+            self._cond.notify()
+
+    def _discard(self, connection: Connection) -> None:
+        """Fecha a conexão e libera a vaga"""
+        _close_quietly(connection)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _collect_orphans(self) -> List[_Checkout]:
+        """Remove do registro conexões de threads encerradas (com o lock)"""
+        orfas = [c for c in self._in_use.values() if not c.thread.is_alive()]
+        for checkout in orfas:
+            del self._in_use[id(checkout.connection)]
+        if orfas:
+            self._stats.reclaimed += len(orfas)
+            logger.info(
+                f"Pool '{self.name}': reclaimed {len(orfas)} connection(s) "
+                "from finished threads"
+            )
+        return orfas
+
+
+def _end_transaction(connection: Connection) -> bool:
+    """
+    Desfaz transação pendente para que a conexão volte limpa ao pool
+
+    Returns:
+        bool: False se o estado da conexão for desconhecido (descartar)
+    """
+    status = connection.get_transaction_status()
+    if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+        return False
+    if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+    return True
+
+
+def _close_quietly(connection: Connection) -> None:
+    """Fecha a conexão ignorando erros"""
+    try:
+        if not connection.closed:
+            connection.close()
+    except Exception:
+        pass
+
+
+# ----------------------------------------------------------------------
+# Registro de pools do processo
+# ----------------------------------------------------------------------
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str, connect: Callable[[], Connection]) -> ConnectionPool:
+    """
+    Obtém (ou cria) o pool do processo com o nome informado
+
+    Cada consumidor usa seu próprio pool (ex.: "django:default", "legacy")
+    para que o estado de sessão configurado por um não vaze para o outro.
+
+    Args:
+        name: Nome do pool
+        connect: Função que abre uma conexão (usada apenas na criação)
+
+    Returns:
+        ConnectionPool: Pool compartilhado
+    """
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            config = settings.database
+            pool = ConnectionPool(
+                connect,
+                name=name,
+                max_size=config.pool_max_size,
+                timeout=config.pool_timeout,
+                ping_interval=config.pool_ping_interval,
+                max_lifetime=config.pool_max_lifetime,
+            )
+            _pools[name] = pool
+            _check_pool_size(pool)
+        return pool
+
+
+def _check_pool_size(pool: ConnectionPool) -> None:
+    """
+    Avisa quando o pool não comporta as threads de fundo e ainda sobra vaga
+
+    Cada worker de core.jobs e de core.scheduler pode prender uma conexão
+    enquanto executa; as sessões do Streamlit disputam o que sobra.
+    """
+    app = settings.app
+    fundo = app.job_workers + app.scheduler_workers
+    if pool.max_size <= fundo:
+        logger.warning(
+            f"Pool '{pool.name}': max_size={pool.max_size} does not exceed the "
+            f"{fundo} background worker(s) ({app.job_workers} jobs + "
+            f"{app.scheduler_workers} scheduler); sessions will wait for "
+            "connections. Raise DB_POOL_MAX_SIZE."
+        )
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Retorna as métricas de todos os pools do processo"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.get_stats() for pool in pools}
+
+
+def close_pools() -> None:
+    """Fecha as conexões ociosas de todos os pools (encerramento do processo)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_all()
+
+
+# ----------------------------------------------------------------------
+# Health check compartilhado
+# ----------------------------------------------------------------------
+_health_lock = threading.Lock()
+_last_healthy_at = float("-inf")
+
+
+def check_database(max_age: Optional[float] = None) -> bool:
+    """
+    Verifica a conexão do Django com o banco, reaproveitando o último sucesso
+
+    Vários repositórios chamam health_check a cada renderização; um SELECT 1
+    bem-sucedido vale para todos durante max_age segundos.
+
+    Args:
+        max_age: Validade (s) do último sucesso (padrão: pool_ping_interval)
+
+    Returns:
+        bool: True se a conexão está OK
+    """
+    global _last_healthy_at
+
+    if max_age is None:
+        max_age = settings.database.pool_ping_interval
+
+    with _health_lock:
+        if time.monotonic() - _last_healthy_at < max_age:
+            return True
+
+    try:
+        from django.db import connection
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except Exception as e:
+        logger.warning(f"Database health check failed: {str(e)}")
+        return False
+
+    with _health_lock:
+        _last_healthy_at = time.monotonic()
+    return True
@@ -0,0 +1,4 @@
+"""
+Backend PostgreSQL do Django com conexões do pool do processo
+Uso em DATABASES: "ENGINE": "infrastructure.database.pooled_backend"
+"""
@@ -0,0 +1,76 @@
+"""
+DatabaseWrapper do PostgreSQL que empresta conexões do ConnectionPool
+
+O Streamlit executa cada interação em uma thread nova e o Django mantém uma
+conexão por thread; sem o pool, cada interação abria (e autenticava) uma
+conexão nova. Aqui a conexão é retirada do pool do processo e devolvida no
+close(); conexões de threads encerradas sem close() são recuperadas pelo pool.
+"""
+
+from typing import Any, Dict, Optional
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql.base import (
+    DatabaseWrapper as PostgresDatabaseWrapper,
+)
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from django.utils.asyncio import async_unsafe
+
+import psycopg2
+import psycopg2.extras
+
+from infrastructure.database.pool import Connection, ConnectionPool, get_pool
+
+
+class DatabaseWrapper(PostgresDatabaseWrapper):
+    """DatabaseWrapper do PostgreSQL com conexões emprestadas do pool"""
+
+    _pool: Optional[ConnectionPool] = None
+
+    def _get_pool(self, conn_params: Dict[str, Any]) -> ConnectionPool:
+        """Obtém o pool deste alias (criado na primeira conexão)"""
+
+        def conectar() -> Connection:
+            connection = psycopg2.connect(**conn_params)
+            # Mesmo ajuste do backend original para JSONField
+            psycopg2.extras.register_default_jsonb(
+                conn_or_curs=connection, loads=lambda x: x
+            )
+            return connection
+
+        return get_pool(f"django:{self.alias}", conectar)
+
+    @async_unsafe
+    def get_new_connection(self, conn_params: Dict[str, Any]) -> Connection:
+        # Mesma validação do backend original para OPTIONS["isolation_level"]
+        valor = self.settings_dict["OPTIONS"].get("isolation_level")
+        try:
+            self.isolation_level = IsolationLevel(
+                IsolationLevel.READ_COMMITTED if valor is None else valor
+            )
+        except ValueError:
+            raise ImproperlyConfigured(
+                f"Invalid transaction isolation level {valor} specified. "
+                "Use one of the psycopg.IsolationLevel values."
+            )
+
+        self._pool = self._get_pool(conn_params)
+        connection = self._pool.acquire()
+        if valor is not None:
+            # Reaplicado a cada empréstimo (sem ida ao banco): a conexão pode
+            # ter sido alterada por quem a usou antes
+            try:
+                connection.isolation_level = self.isolation_level
+            except Exception:
+                self._pool.release(connection)
+                raise
+        return connection
+
+    def _close(self) -> None:
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                if self._pool is not None:
+                    # Devolve ao pool (transação pendente é desfeita)
+                    self._pool.release(self.connection)
+                else:
+                    self.connection.close()
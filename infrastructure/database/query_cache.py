@@ -0,0 +1,414 @@
+"""
+Cache de resultados de queries compartilhado entre sessões Streamlit
+Mantém DataFrames em memória do processo com TTL, orçamento de memória,
+despejo LRU e invalidação pela marca d'água de ingestão do RPA
+"""
+
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import settings
+from infrastructure.database.freshness import FreshnessMonitor, freshness_monitor
+
+logger = logging.getLogger(__name__)
+
+# RPA responsável pela ingestão de Vendas/VendaProdutos/VendaPagamentos
+RPA_VENDAS_ID = 7
+
+
+def _normalize_value(value: Any) -> Hashable:
+    """Normaliza um parâmetro de filtro para compor a chave do cache"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize_value(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset, pd.Series)):
+        itens = [_normalize_value(v) for v in value]
+        if not itens:
+            # Lista vazia equivale a "sem filtro", assim como None
+            return None
+        return tuple(sorted(set(itens), key=repr))
+    return value
+
+
+def make_cache_key(namespace: str, params: Dict[str, Any]) -> Tuple:
+    """
+    Gera chave determinística a partir dos parâmetros de filtro
+
+    Listas são ordenadas e deduplicadas, datas viram ISO e listas vazias
+    equivalem a None, de modo que filtros equivalentes compartilham a entrada.
+
+    Args:
+        namespace: Nome lógico da query (ex.: "vendas_filtradas")
+        params: Parâmetros de filtro
+
+    Returns:
+        Tuple: Chave hashável
+    """
+    normalizados = tuple(
+        sorted((nome, _normalize_value(valor)) for nome, valor in params.items())
+    )
+    return (namespace, normalizados)
+
+
+def _estimate_size(value: Any) -> int:
+    """Estima o tamanho em bytes de um resultado cacheado"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    return 1024
+
+
+def _copy_value(value: Any) -> Any:
+    """Retorna cópia para que o chamador não altere o objeto cacheado"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    return value
+
+
+@dataclass
+class _CacheEntry:
+    """Entrada do cache"""
+
+    value: Any
+    size: int
+    created_at: float
+    rpa_id: Optional[int] = None
+    watermark: Optional[Tuple] = None
+
+
+@dataclass
+class _CacheStats:
+    """Contadores do cache"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class QueryResultCache:
+    """
+    Cache LRU thread-safe de resultados de queries, compartilhado pelo processo
+
+    Sessões concorrentes que pedem a mesma chave aguardam uma única busca
+    (single-flight) em vez de executar N queries iguais.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300,
+        max_bytes: int = 256 * 1024 * 1024,
+        monitor: Optional[FreshnessMonitor] = None,
+    ):
+        """
+        Inicializa o cache
+
+        Args:
+            ttl: Tempo de vida das entradas em segundos
+            max_bytes: Orçamento de memória total das entradas
+            monitor: Monitor de marcas d'água dos RPAs
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._monitor = monitor or freshness_monitor
+        self._subscribed_rpas: Set[int] = set()
+
+        self._entries: "OrderedDict[Tuple, _CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        # Memória de estruturas fora do cache que dividem o mesmo orçamento
+        self._reservas: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._inflight: Dict[Tuple, threading.Lock] = {}
+        self._stats = _CacheStats()
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def get_or_load(
+        self,
+        namespace: str,
+        params: Dict[str, Any],
+        loader: Callable[[], Any],
+        rpa_id: Optional[int] = RPA_VENDAS_ID,
+    ) -> Any:
+        """
+        Retorna o resultado cacheado ou executa o loader uma única vez
+
+        Args:
+            namespace: Nome lógico da query
+            params: Parâmetros de filtro que identificam o resultado
+            loader: Função sem argumentos que executa a query
+            rpa_id: RPA cuja ingestão invalida a entrada (None desativa)
+
+        Returns:
+            Cópia do resultado
+        """
+        key = make_cache_key(namespace, params)
+        watermark = self._current_watermark(rpa_id)
+
+        value = self._lookup(key, watermark)
+        if value is not None:
+            return _copy_value(value)
+
+        # Single-flight: apenas uma thread busca cada chave por vez
+        with self._lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                value = self._lookup(key, watermark, count=False)
+                if value is None:
+                    inicio = time.perf_counter()
+                    value = loader()
+                    logger.debug(
+                        f"Query cache miss '{namespace}' carregada em "
+                        f"{time.perf_counter() - inicio:.3f}s"
+                    )
+                    self._store(key, value, rpa_id, watermark)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+        return _copy_value(value)
+
+    def peek(
+        self,
+        namespace: str,
+        params: Dict[str, Any],
+        rpa_id: Optional[int] = RPA_VENDAS_ID,
+    ) -> Any:
+        """
+        Retorna o resultado cacheado sem executar a query
+
+        Args:
+            namespace: Nome lógico da query
+            params: Parâmetros de filtro que identificam o resultado
+            rpa_id: RPA cuja ingestão invalida a entrada (None desativa)
+
+        Returns:
+            Cópia do resultado ou None se não estiver no cache
+        """
+        key = make_cache_key(namespace, params)
+        value = self._lookup(key, self._current_watermark(rpa_id), count=False)
+        return None if value is None else _copy_value(value)
+
+    def invalidate(self, namespace: Optional[str] = None) -> int:
+        """
+        Remove entradas do cache
+
+        Args:
+            namespace: Remove apenas esse namespace (None remove tudo)
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        with self._lock:
+            keys = [k for k in self._entries if namespace is None or k[0] == namespace]
+            for key in keys:
+                self._remove(key)
+            self._stats.invalidations += len(keys)
+            return len(keys)
+
+    def invalidate_rpa(self, rpa_id: int) -> int:
+        """Remove entradas dependentes de um RPA"""
+        with self._lock:
+            keys = [k for k, e in self._entries.items() if e.rpa_id == rpa_id]
+            for key in keys:
+                self._remove(key)
+            self._stats.invalidations += len(keys)
+            return len(keys)
+
+    def reserve(self, name: str, size: int) -> None:
+        """
+        Reserva parte do orçamento para memória mantida fora do cache
+
+        Entradas antigas são despejadas para abrir espaço; chamar de novo com
+        o mesmo nome substitui a reserva (size=0 a libera).
+
+        Args:
+            name: Dono da reserva (ex.: "vendas_snapshot")
+            size: Bytes ocupados
+        """
+        with self._lock:
+            self._reservas[name] = max(int(size), 0)
+            self._evict_to_fit(0)
+
+        if size > self.max_bytes:
+            logger.warning(
+                f"'{name}' uses {size / 1024**2:.1f} MB, above the whole cache "
+                f"budget of {self.max_bytes / 1024**2:.0f} MB"
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas de uso do cache"""
+        with self._lock:
+            total = self._stats.hits + self._stats.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "reserved": dict(self._reservas),
+                "max_bytes": self.max_bytes,
+                "hits": self._stats.hits,
+                "misses": self._stats.misses,
+                "hit_ratio": (self._stats.hits / total) if total else 0.0,
+                "evictions": self._stats.evictions,
+                "expirations": self._stats.expirations,
+                "invalidations": self._stats.invalidations,
+            }
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _current_watermark(self, rpa_id: Optional[int]) -> Optional[Tuple]:
+        """Obtém a marca d'água do RPA pelo monitor de atualização"""
+        if rpa_id is None:
+            return None
+
+        if rpa_id not in self._subscribed_rpas:
+            with self._lock:
+                if rpa_id not in self._subscribed_rpas:
+                    # Libera a memória assim que uma nova ingestão é detectada
+                    self._monitor.subscribe(rpa_id, self.invalidate_rpa)
+                    self._subscribed_rpas.add(rpa_id)
+
+        return self._monitor.get_watermark(rpa_id)
+
+    def _lookup(
+        self, key: Tuple, watermark: Optional[Tuple], count: bool = True
+    ) -> Any:
+        """Busca entrada válida e atualiza a ordem LRU"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if count:
+                    self._stats.misses += 1
+                return None
+
+            expirada = time.monotonic() - entry.created_at > self.ttl
+            desatualizada = entry.rpa_id is not None and entry.watermark != watermark
+            if expirada or desatualizada:
+                self._remove(key)
+                self._stats.expirations += 1
+                if count:
+                    self._stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            if count:
+                self._stats.hits += 1
+            return entry.value
+
+    def _store(
+        self,
+        key: Tuple,
+        value: Any,
+        rpa_id: Optional[int],
+        watermark: Optional[Tuple],
+    ) -> None:
+        """Armazena resultado respeitando o orçamento de memória"""
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            logger.debug(
+                f"Resultado de {size} bytes excede o orçamento do cache; não cacheado"
+            )
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._evict_to_fit(size)
+            self._entries[key] = _CacheEntry(
+                value=value,
+                size=size,
+                created_at=time.monotonic(),
+                rpa_id=rpa_id,
+                watermark=watermark,
+            )
+            self._total_bytes += size
+
+    def _evict_to_fit(self, size: int) -> None:
+        """Despeja as entradas mais antigas até caber size (chamar com o lock)"""
+        limite = self.max_bytes - sum(self._reservas.values())
+        while self._entries and self._total_bytes + size > limite:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats.evictions += 1
+
+    def _remove(self, key: Tuple) -> None:
+        """Remove entrada (chamar com o lock adquirido)"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
+
+
+# Instância global compartilhada por todas as sessões do processo
+query_cache = QueryResultCache(
+    ttl=settings.cache.query_ttl,
+    max_bytes=settings.cache.query_max_mb * 1024 * 1024,
+)
+
+
+def cached_query(
+    namespace: str, rpa_id: Optional[int] = RPA_VENDAS_ID
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorator que coloca um método de repositório atrás do cache de queries
+
+    A chave é formada pelos argumentos nomeados normalizados (self é ignorado).
+
+    Args:
+        namespace: Nome lógico da query
+        rpa_id: RPA cuja ingestão invalida os resultados
+
+    Example:
+        @cached_query("vendas_filtradas")
+        def get_vendas_filtradas(self, data_inicial, data_final, ...):
+            ...
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            params.pop("self", None)
+
+            return query_cache.get_or_load(
+                namespace,
+                params,
+                lambda: func(self, *args, **kwargs),
+                rpa_id=rpa_id,
+            )
+
+        # Acesso à função original sem cache
+        wrapper.uncached = func  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
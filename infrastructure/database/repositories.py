@@ -5,10 +5,9 @@ Migração para usar os modelos Django existentes
 
 import logging
 from datetime import date, datetime, time
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, Iterator, List, Optional, cast
 
 from django.contrib.auth.models import User
-from django.db import connection
 from django.db.models import Count, F, Q, Value
 from django.db.models.functions import Coalesce
 
@@ -37,6 +36,7 @@ from infrastructure.database.interfaces import (
     VendaPagamentoRepositoryInterface,
     VendaRepositoryInterface,
 )
+from infrastructure.database.streaming import iter_query_chunks
 
 logger = logging.getLogger(__name__)
 
@@ -107,12 +107,7 @@ class DatabaseRepository(BaseRepository, DatabaseRepositoryInterface):
         try:
             logger.info("Executing raw SQL query")
 
-            with connection.cursor() as cursor:
-                cursor.execute(query, params or [])
-                columns = [col[0] for col in cursor.description]
-                data = cursor.fetchall()
-
-                result = pd.DataFrame(data, columns=columns)
+            result = self.fetch_dataframe(query, params)
 
             logger.info(f"Raw query successful: {len(result)} rows returned")
             return result
@@ -123,6 +118,36 @@ class DatabaseRepository(BaseRepository, DatabaseRepositoryInterface):
                 query=query, message=f"Erro ao executar query personalizada: {str(e)}"
             )
 
+    def execute_query_chunks(
+        self,
+        query: str,
+        params: Optional[tuple] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Executa query SQL bruta devolvendo o resultado em blocos
+
+        Usa cursor nomeado (server-side): apenas um bloco fica em memória por
+        vez, o que permite exportar relatórios grandes sem carregar tudo.
+
+        Args:
+            query: Query SQL
+            params: Parâmetros da query
+            chunk_size: Linhas por bloco (padrão: DB_STREAM_CHUNK_SIZE)
+
+        Yields:
+            DataFrame com um bloco do resultado
+        """
+        try:
+            logger.info("Streaming raw SQL query")
+            yield from iter_query_chunks(query, params, chunk_size=chunk_size)
+
+        except Exception as e:
+            logger.error(f"Raw query streaming failed: {str(e)}")
+            raise DatabaseQueryError(
+                query=query, message=f"Erro ao executar query personalizada: {str(e)}"
+            )
+
 
 class UserRepository(BaseRepository, UserRepositoryInterface):
     """Repositório para operações com usuários usando Django ORM"""
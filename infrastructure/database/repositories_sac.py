@@ -11,9 +11,13 @@ import pandas as pd
 
 from core.exceptions import DatabaseError
 from infrastructure.database.base import BaseRepository
+from infrastructure.database.query_cache import cached_query
 
 logger = logging.getLogger(__name__)
 
+# RPA responsável pela ingestão de OS/OS_Produtos
+RPA_SAC_ID = 9
+
 
 class SacAtualizacaoRepository(BaseRepository):
     """Repositório para informações de atualização do SAC"""
@@ -70,11 +74,62 @@ class SacAtualizacaoRepository(BaseRepository):
             logger.error(f"Error fetching update history: {str(e)}")
             raise DatabaseError(f"Erro ao buscar histórico de atualizações: {str(e)}")
 
-    def health_check(self) -> bool:
-        """Verifica se a conexão está saudável"""
+
+class OSRepository(BaseRepository):
+    """Repositório de métricas das Ordens de Serviço calculadas no banco"""
+
+    @cached_query("sac_resumo_os", rpa_id=RPA_SAC_ID)
+    def get_resumo_os(self) -> Dict[str, Any]:
+        """
+        Obtém os totais de todas as OS com uma única agregação
+
+        Returns:
+            Dict: total, situacoes, clientes, data_inicial e data_final
+        """
         try:
+            query = '''
+                SELECT
+                    COUNT(*) AS "total",
+                    COUNT(DISTINCT "SituacaoNome") AS "situacoes",
+                    COUNT(DISTINCT "ClienteNome") AS "clientes",
+                    MIN("Data") AS "data_inicial",
+                    MAX("Data") AS "data_final"
+                FROM "OS"
+            '''
+
             with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                return True
-        except Exception:
-            return False
+                cursor.execute(query)
+                columns = [col[0] for col in cursor.description]
+                row = cursor.fetchone()
+
+            return dict(zip(columns, row))
+
+        except Exception as e:
+            logger.error(f"Error fetching OS summary: {str(e)}")
+            raise DatabaseError(f"Erro ao buscar resumo das OS: {str(e)}")
+
+    @cached_query("sac_os_por_situacao", rpa_id=RPA_SAC_ID)
+    def get_contagem_por_situacao(self) -> pd.DataFrame:
+        """
+        Obtém a quantidade de OS por situação (GROUP BY no banco)
+
+        Returns:
+            pd.DataFrame: Colunas SituacaoNome e Quantidade, ordenadas pela
+            situação
+        """
+        try:
+            query = '''
+                SELECT "SituacaoNome", COUNT(*) AS "Quantidade"
+                FROM "OS"
+                GROUP BY "SituacaoNome"
+                ORDER BY "SituacaoNome"
+            '''
+
+            result = self.fetch_dataframe(query)
+
+            logger.info(f"Retrieved OS counts for {len(result)} situations")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error fetching OS counts by situation: {str(e)}")
+            raise DatabaseError(f"Erro ao buscar OS por situação: {str(e)}")
@@ -4,7 +4,7 @@ Repositórios específicos para Vendas usando Django ORM com SQL bruto
 
 import logging
 from datetime import date, datetime, time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from django.db import connection
 
@@ -19,13 +19,59 @@ from infrastructure.database.interfaces import (
     VendaProdutosRepositoryInterface,
     VendaRepositoryInterface,
 )
+from infrastructure.database.query_cache import cached_query
+from infrastructure.database.streaming import iter_query_chunks
+from utils.numeric import converter_colunas_numericas
 
 logger = logging.getLogger(__name__)
 
+# Textos repetidos em milhares de linhas: lidos como category (dicionário do
+# Arrow), sem criar uma string Python por célula
+COLUNAS_DICIONARIO = ("VendedorNome", "SituacaoNome")
+
+# Colunas de "Vendas" na ordem do modelo (lista branca para projeção)
+COLUNAS_VENDAS: List[str] = [field.column for field in Venda._meta.concrete_fields]
+
+
+def normalizar_colunas_vendas(colunas: Optional[List[str]]) -> List[str]:
+    """
+    Valida as colunas solicitadas e as coloca na ordem do modelo
+
+    A ordem canônica faz pedidos equivalentes gerarem o mesmo resultado
+    (e a mesma entrada no cache de queries).
+
+    Args:
+        colunas: Colunas desejadas (None ou lista vazia seleciona todas)
+
+    Returns:
+        List[str]: Colunas na ordem do modelo (vazia significa todas)
+
+    Raises:
+        ValueError: Se alguma coluna não existir em "Vendas"
+    """
+    if not colunas:
+        return []
+
+    solicitadas = set(colunas)
+    invalidas = sorted(solicitadas - set(COLUNAS_VENDAS))
+    if invalidas:
+        raise ValueError(f"Colunas inválidas para Vendas: {', '.join(invalidas)}")
+
+    return [col for col in COLUNAS_VENDAS if col in solicitadas]
+
+
+def _build_select_colunas(colunas: Optional[List[str]]) -> str:
+    """Monta a lista do SELECT (todas as colunas se nenhuma for informada)"""
+    selecionadas = normalizar_colunas_vendas(colunas)
+    if not selecionadas:
+        return "*"
+    return ", ".join(f'"{col}"' for col in selecionadas)
+
 
 class VendaRepository(BaseRepository, VendaRepositoryInterface):
     """Repositório para operações com vendas usando SQL bruto via Django"""
 
+    @cached_query("vendas_filtradas")
     def get_vendas_filtradas(
         self,
         data_inicial: date,
@@ -36,47 +82,183 @@ class VendaRepository(BaseRepository, VendaRepositoryInterface):
         situacoes_excluir: Optional[List[str]] = None,
         apenas_vendedores_ativos: bool = False,
         origens: Optional[List[str]] = None,
+        colunas: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """Obtém vendas com filtros aplicados usando SQL bruto
+
+        Args:
+            colunas: Colunas a retornar (None retorna todas). Os filtros
+                     continuam valendo para colunas não selecionadas.
+        """
+        try:
+            query, params = self._build_query_vendas_filtradas(
+                data_inicial=data_inicial,
+                data_final=data_final,
+                vendedores=vendedores,
+                situacoes=situacoes,
+                situacao=situacao,
+                situacoes_excluir=situacoes_excluir,
+                origens=origens,
+                colunas=colunas,
+            )
+
+            # COPY decodificado pelo Arrow: colunas tipadas, sem objetos por célula
+            result = self.fetch_dataframe(query, params, COLUNAS_DICIONARIO)
+
+            logger.info(f"Retrieved {len(result)} sales records")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error fetching filtered sales: {str(e)}")
+            raise DatabaseError(f"Erro ao buscar vendas filtradas: {str(e)}")
+
+    def iter_vendas_filtradas(
+        self,
+        data_inicial: date,
+        data_final: date,
+        vendedores: Optional[List[str]] = None,
+        situacoes: Optional[List[str]] = None,
+        situacao: Optional[str] = None,
+        situacoes_excluir: Optional[List[str]] = None,
+        origens: Optional[List[str]] = None,
+        colunas: Optional[List[str]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Percorre as vendas filtradas em blocos (cursor nomeado, sem cache)
+
+        Mesmos filtros de get_vendas_filtradas. Indicado para exportações e
+        agregações de períodos longos, que não precisam do resultado inteiro
+        em memória.
+
+        Args:
+            chunk_size: Linhas por bloco (padrão: DB_STREAM_CHUNK_SIZE)
+
+        Yields:
+            pd.DataFrame: Bloco de vendas, na ordem de Data decrescente
+        """
+        try:
+            query, params = self._build_query_vendas_filtradas(
+                data_inicial=data_inicial,
+                data_final=data_final,
+                vendedores=vendedores,
+                situacoes=situacoes,
+                situacao=situacao,
+                situacoes_excluir=situacoes_excluir,
+                origens=origens,
+                colunas=colunas,
+            )
+            yield from iter_query_chunks(query, params, chunk_size=chunk_size)
+
+        except Exception as e:
+            logger.error(f"Error streaming filtered sales: {str(e)}")
+            raise DatabaseError(f"Erro ao percorrer vendas filtradas: {str(e)}")
+
+    def _build_query_vendas_filtradas(
+        self,
+        data_inicial: date,
+        data_final: date,
+        vendedores: Optional[List[str]] = None,
+        situacoes: Optional[List[str]] = None,
+        situacao: Optional[str] = None,
+        situacoes_excluir: Optional[List[str]] = None,
+        origens: Optional[List[str]] = None,
+        colunas: Optional[List[str]] = None,
+    ) -> Tuple[str, List[Any]]:
+        """Monta a query de vendas filtradas e seus parâmetros"""
+        # Query base com critérios obrigatórios aplicados SEMPRE
+        query = f"""
+            SELECT {_build_select_colunas(colunas)} FROM "Vendas"
+            WHERE "Data"::DATE BETWEEN %s AND %s
+            AND TRIM("VendedorNome") IN (SELECT "Nome" FROM "Vendedores")
+        """
+        params: List[Any] = [data_inicial, data_final]
+
+        # Filtro de vendedores específicos (adicional aos critérios obrigatórios)
+        if vendedores:
+            query += ' AND "VendedorNome" = ANY(%s)'
+            params.append(list(vendedores))
+
+        # Filtro de situação única (opcional)
+        if situacao:
+            query += ' AND "SituacaoNome" = %s'
+            params.append(situacao)
+
+        # Filtro de situações múltiplas (opcional)
+        if situacoes:
+            query += ' AND "SituacaoNome" = ANY(%s)'
+            params.append(list(situacoes))
+
+        # Filtro para excluir situações específicas (opcional)
+        if situacoes_excluir:
+            query += ' AND "SituacaoNome" <> ALL(%s)'
+            params.append(list(situacoes_excluir))
+
+        # Filtro de origens (opcional)
+        if origens:
+            query += ' AND "Origem" = ANY(%s)'
+            params.append(list(origens))
+
+        query += ' ORDER BY "Data" DESC'
+        return query, params
+
+    @cached_query("totais_vendedor_periodos")
+    def get_totais_vendedor_por_periodos(
+        self,
+        periodos: List[Tuple[date, date, bool]],
+        situacoes_excluir: Optional[List[str]] = None,
     ) -> pd.DataFrame:
-        """Obtém vendas com filtros aplicados usando SQL bruto"""
+        """Obtém a soma de vendas por vendedor para vários períodos em uma única query
+
+        Args:
+            periodos: Lista de tuplas (data_inicial, data_final, exclui); o
+                      terceiro item diz se situacoes_excluir vale no período
+            situacoes_excluir: Situações a excluir (opcional)
+
+        Returns:
+            pd.DataFrame: Colunas DataInicial, DataFinal, ExcluiSituacoes
+                          (identificam o período), VendedorNome, ValorTotal e
+                          Quantidade
+        """
         try:
-            # Query base com critérios obrigatórios aplicados SEMPRE
+            if not periodos:
+                return pd.DataFrame(
+                    columns=[
+                        "DataInicial",
+                        "DataFinal",
+                        "ExcluiSituacoes",
+                        "VendedorNome",
+                        "ValorTotal",
+                        "Quantidade",
+                    ]
+                )
+
+            # Os períodos entram como arrays paralelos: texto constante
+            # independentemente do número de janelas
             query = """
-                SELECT * FROM "Vendas"
-                WHERE "Data"::DATE BETWEEN %s AND %s
-                AND TRIM("VendedorNome") IN (SELECT "Nome" FROM "Vendedores")
+                SELECT
+                    p.inicio AS "DataInicial",
+                    p.fim AS "DataFinal",
+                    p.exclui AS "ExcluiSituacoes",
+                    v."VendedorNome",
+                    COALESCE(SUM(v."ValorTotal"), 0) AS "ValorTotal",
+                    COUNT(v."ValorTotal") AS "Quantidade"
+                FROM UNNEST(%s::DATE[], %s::DATE[], %s::BOOLEAN[])
+                    AS p(inicio, fim, exclui)
+                INNER JOIN "Vendas" v ON v."Data"::DATE BETWEEN p.inicio AND p.fim
+                WHERE TRIM(v."VendedorNome") IN (SELECT "Nome" FROM "Vendedores")
             """
-            params: List[Any] = [data_inicial, data_final]
+            params: List[Any] = [
+                [inicio for inicio, _, _ in periodos],
+                [fim for _, fim, _ in periodos],
+                [bool(exclui) for _, _, exclui in periodos],
+            ]
 
-            # Filtro de vendedores específicos (adicional aos critérios obrigatórios)
-            if vendedores:
-                placeholders = ",".join(["%s"] * len(vendedores))
-                query += f' AND "VendedorNome" IN ({placeholders})'
-                params.extend(vendedores)
-
-            # Filtro de situação única (opcional)
-            if situacao:
-                query += ' AND "SituacaoNome" = %s'
-                params.append(situacao)
-
-            # Filtro de situações múltiplas (opcional)
-            if situacoes:
-                placeholders = ",".join(["%s"] * len(situacoes))
-                query += f' AND "SituacaoNome" IN ({placeholders})'
-                params.extend(situacoes)
-
-            # Filtro para excluir situações específicas (opcional)
             if situacoes_excluir:
-                placeholders = ",".join(["%s"] * len(situacoes_excluir))
-                query += f' AND "SituacaoNome" NOT IN ({placeholders})'
-                params.extend(situacoes_excluir)
-
-            # Filtro de origens (opcional)
-            if origens:
-                placeholders = ",".join(["%s"] * len(origens))
-                query += f' AND "Origem" IN ({placeholders})'
-                params.extend(origens)
+                # Só nos períodos marcados; NULL em SituacaoNome continua fora
+                query += ' AND (NOT p.exclui OR v."SituacaoNome" <> ALL(%s))'
+                params.append(list(situacoes_excluir))
 
-            query += ' ORDER BY "Data" DESC'
+            query += ' GROUP BY p.inicio, p.fim, p.exclui, v."VendedorNome"'
 
             with connection.cursor() as cursor:
                 cursor.execute(query, params)
@@ -85,12 +267,99 @@ class VendaRepository(BaseRepository, VendaRepositoryInterface):
 
                 result = pd.DataFrame(data, columns=columns)
 
-            logger.info(f"Retrieved {len(result)} sales records")
+            result["ValorTotal"] = pd.to_numeric(
+                result["ValorTotal"], errors="coerce"
+            ).fillna(0.0)
+
+            logger.info(
+                f"Retrieved {len(result)} seller totals for {len(periodos)} period(s)"
+            )
             return result
 
         except Exception as e:
-            logger.error(f"Error fetching filtered sales: {str(e)}")
-            raise DatabaseError(f"Erro ao buscar vendas filtradas: {str(e)}")
+            logger.error(f"Error fetching seller totals by period: {str(e)}")
+            raise DatabaseError(
+                f"Erro ao buscar totais de vendedores por período: {str(e)}"
+            )
+
+    def get_vendas_snapshot(
+        self,
+        data_inicial: date,
+        data_final: date,
+        desde_xmin: Optional[int] = None,
+        ids_vendas: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """Obtém vendas do período para o snapshot incremental
+
+        Aplica apenas os critérios obrigatórios (período e vendedores válidos)
+        e inclui as colunas auxiliares "_DataRef" ("Data"::DATE) e "_xmin"
+        (transação que gravou a linha).
+
+        Args:
+            desde_xmin: Se informado, retorna apenas linhas gravadas a partir
+                        desta transação (inseridas/alteradas pelo RPA)
+            ids_vendas: IDs adicionais a retornar mesmo sem alteração
+        """
+        try:
+            query = """
+                SELECT *,
+                    "Data"::DATE AS "_DataRef",
+                    xmin::TEXT::BIGINT AS "_xmin"
+                FROM "Vendas"
+                WHERE "Data"::DATE BETWEEN %s AND %s
+                AND TRIM("VendedorNome") IN (SELECT "Nome" FROM "Vendedores")
+            """
+            params: List[Any] = [data_inicial, data_final]
+
+            if desde_xmin is not None:
+                if ids_vendas:
+                    query += ' AND (xmin::TEXT::BIGINT >= %s OR "ID_Gestao" = ANY(%s))'
+                    params.extend([desde_xmin, list(ids_vendas)])
+                else:
+                    query += " AND xmin::TEXT::BIGINT >= %s"
+                    params.append(desde_xmin)
+
+            result = self.fetch_dataframe(query, params, COLUNAS_DICIONARIO)
+
+            logger.info(f"Retrieved {len(result)} sales records for snapshot")
+            return result
+
+        except Exception as e:
+            logger.error(f"Error fetching sales snapshot: {str(e)}")
+            raise DatabaseError(f"Erro ao buscar snapshot de vendas: {str(e)}")
+
+    def get_ids_vendas(self, data_inicial: date, data_final: date) -> List[str]:
+        """Obtém apenas os IDs das vendas válidas do período"""
+        try:
+            query = """
+                SELECT "ID_Gestao" FROM "Vendas"
+                WHERE "Data"::DATE BETWEEN %s AND %s
+                AND TRIM("VendedorNome") IN (SELECT "Nome" FROM "Vendedores")
+            """
+            with connection.cursor() as cursor:
+                cursor.execute(query, [data_inicial, data_final])
+                return [row[0] for row in cursor.fetchall()]
+
+        except Exception as e:
+            logger.error(f"Error fetching sales ids: {str(e)}")
+            raise DatabaseError(f"Erro ao buscar IDs de vendas: {str(e)}")
+
+    def get_horizonte_transacoes(self) -> int:
+        """Obtém a transação mais antiga ainda em aberto (xid de 32 bits)
+
+        Linhas gravadas por transações a partir deste valor ainda não estavam
+        visíveis (ou estavam em andamento) no momento da leitura.
+        """
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT MOD(txid_snapshot_xmin(txid_current_snapshot()), 4294967296)"
+                )
+                return int(cursor.fetchone()[0])
+
+        except Exception as e:
+            logger.error(f"Error fetching transaction horizon: {str(e)}")
+            raise DatabaseError(f"Erro ao obter horizonte de transações: {str(e)}")
 
     def get_vendedores_ativos(self) -> pd.DataFrame:
         """Obtém lista de vendedores ativos"""
@@ -171,19 +440,11 @@ class VendaRepository(BaseRepository, VendaRepositoryInterface):
             logger.error(f"Error fetching available origins: {str(e)}")
             raise DatabaseError(f"Erro ao buscar origens disponíveis: {str(e)}")
 
-    def health_check(self) -> bool:
-        """Verifica se a conexão está saudável"""
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                return True
-        except Exception:
-            return False
-
 
 class VendaProdutosRepository(BaseRepository, VendaProdutosRepositoryInterface):
     """Repositório para operações com produtos de vendas"""
 
+    @cached_query("produtos_por_vendas")
     def get_produtos_por_vendas(
         self,
         venda_ids: Optional[List[str]] = None,
@@ -232,20 +493,17 @@ class VendaProdutosRepository(BaseRepository, VendaProdutosRepositoryInterface):
                 params.extend([data_inicial, data_final])
 
             if vendedores:
-                placeholders = ",".join(["%s"] * len(vendedores))
-                query += f' AND v."VendedorNome" IN ({placeholders})'
-                params.extend(vendedores)
+                query += ' AND v."VendedorNome" = ANY(%s)'
+                params.append(list(vendedores))
 
             if situacoes and len(situacoes) > 0:
-                placeholders = ",".join(["%s"] * len(situacoes))
-                query += f' AND v."SituacaoNome" IN ({placeholders})'
-                params.extend(situacoes)
+                query += ' AND v."SituacaoNome" = ANY(%s)'
+                params.append(list(situacoes))
             # Se situacoes=None ou [], não filtra por situação (busca todas)
 
             if venda_ids and len(venda_ids) > 0:
-                placeholders = ",".join(["%s"] * len(venda_ids))
-                query += f' AND vp."Venda_ID" IN ({placeholders})'
-                params.extend(venda_ids)
+                query += ' AND vp."Venda_ID" = ANY(%s)'
+                params.append(list(venda_ids))
 
             # Aplicar filtro obrigatório de vendedores ativos
             query += ' AND TRIM(v."VendedorNome") IN (SELECT "Nome" FROM "Vendedores")'
@@ -276,6 +534,7 @@ class VendaProdutosRepository(BaseRepository, VendaProdutosRepositoryInterface):
             logger.error(f"Error fetching products by sales: {str(e)}")
             raise DatabaseError(f"Erro ao buscar produtos por vendas: {str(e)}")
 
+    @cached_query("produtos_agregados")
     def get_produtos_agregados(
         self,
         venda_ids: Optional[List[str]] = None,
@@ -283,9 +542,27 @@ class VendaProdutosRepository(BaseRepository, VendaProdutosRepositoryInterface):
         data_final: Optional[date] = None,
         vendedores: Optional[List[str]] = None,
         situacoes: Optional[List[str]] = None,
+        agregar_no_banco: bool = True,
     ) -> pd.DataFrame:
-        """Obtém produtos agregados (somatórios) das vendas com filtros aplicados"""
+        """Obtém produtos agregados (somatórios) das vendas com filtros aplicados
+
+        Args:
+            agregar_no_banco: Se True, executa SUM/GROUP BY no PostgreSQL e
+                              retorna apenas uma linha por produto. Se False,
+                              busca as linhas brutas e agrega no Python.
+        """
         try:
+            filtros, params = self._build_filtros_produtos_agregados(
+                venda_ids=venda_ids,
+                data_inicial=data_inicial,
+                data_final=data_final,
+                vendedores=vendedores,
+                situacoes=situacoes,
+            )
+
+            if agregar_no_banco:
+                return self._get_produtos_agregados_sql(filtros, params)
+
             # Query simples para obter os dados brutos - agregação será feita no Python
             query = """
                 SELECT
@@ -302,32 +579,7 @@ class VendaProdutosRepository(BaseRepository, VendaProdutosRepositoryInterface):
                 LEFT JOIN "Produtos" p ON vp."Nome" = p."Nome"
                 WHERE 1=1
             """
-            params: List[Any] = []
-
-            # Aplicar os mesmos filtros da query de produtos detalhados
-            if data_inicial and data_final:
-                query += ' AND v."Data"::DATE BETWEEN %s AND %s'
-                params.extend([data_inicial, data_final])
-
-            if vendedores:
-                placeholders = ",".join(["%s"] * len(vendedores))
-                query += f' AND v."VendedorNome" IN ({placeholders})'
-                params.extend(vendedores)
-
-            if situacoes and len(situacoes) > 0:
-                placeholders = ",".join(["%s"] * len(situacoes))
-                query += f' AND v."SituacaoNome" IN ({placeholders})'
-                params.extend(situacoes)
-            # Se situacoes=None ou [], não filtra por situação (busca todas)
-
-            if venda_ids and len(venda_ids) > 0:
-                placeholders = ",".join(["%s"] * len(venda_ids))
-                query += f' AND vp."Venda_ID" IN ({placeholders})'
-                params.extend(venda_ids)
-
-            # Aplicar filtro obrigatório de vendedores ativos
-            query += ' AND TRIM(v."VendedorNome") IN (SELECT "Nome" FROM "Vendedores")'
-
+            query += filtros
             query += ' ORDER BY vp."Nome"'
 
             with connection.cursor() as cursor:
@@ -341,39 +593,17 @@ class VendaProdutosRepository(BaseRepository, VendaProdutosRepositoryInterface):
             if df_raw.empty:
                 return pd.DataFrame()
 
-            # Limpar e converter valores
-            def clean_value(val):
-                """Limpa valores que podem estar no formato ('10.00',)"""
-                if not val or str(val).strip() == "":
-                    return 0.0
-
-                # Converter para string e limpar
-                val_str = str(val)
-                # Remover tuplas: ('10.00',) -> 10.00
-                val_str = (
-                    val_str.replace("(", "")
-                    .replace(")", "")
-                    .replace("'", "")
-                    .replace(",", ".")
-                )
-                val_str = val_str.strip()
-
-                try:
-                    return float(val_str) if val_str else 0.0
-                except:
-                    return 0.0
-
-            # Aplicar limpeza aos campos numéricos
-            numeric_columns = [
-                "Quantidade",
-                "ValorCusto",
-                "ValorVenda",
-                "ValorDesconto",
-                "ValorTotal",
-            ]
-            for col in numeric_columns:
-                if col in df_raw.columns:
-                    df_raw[col] = df_raw[col].apply(clean_value)
+            # Limpar e converter valores (aceita Decimal e formato ('10.00',))
+            converter_colunas_numericas(
+                df_raw,
+                [
+                    "Quantidade",
+                    "ValorCusto",
+                    "ValorVenda",
+                    "ValorDesconto",
+                    "ValorTotal",
+                ],
+            )
 
             # Agregar por produto
             result = (
@@ -412,31 +642,124 @@ class VendaProdutosRepository(BaseRepository, VendaProdutosRepositoryInterface):
             logger.error(f"Error fetching aggregated products: {str(e)}")
             raise DatabaseError(f"Erro ao buscar produtos agregados: {str(e)}")
 
-    def health_check(self) -> bool:
-        """Verifica se a conexão está saudável"""
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                return True
-        except Exception:
-            return False
+    def _build_filtros_produtos_agregados(
+        self,
+        venda_ids: Optional[List[str]] = None,
+        data_inicial: Optional[date] = None,
+        data_final: Optional[date] = None,
+        vendedores: Optional[List[str]] = None,
+        situacoes: Optional[List[str]] = None,
+    ) -> Tuple[str, List[Any]]:
+        """Monta as cláusulas WHERE compartilhadas pelos modos de agregação"""
+        query = ""
+        params: List[Any] = []
+
+        # Aplicar os mesmos filtros da query de produtos detalhados
+        if data_inicial and data_final:
+            query += ' AND v."Data"::DATE BETWEEN %s AND %s'
+            params.extend([data_inicial, data_final])
+
+        if vendedores:
+            query += ' AND v."VendedorNome" = ANY(%s)'
+            params.append(list(vendedores))
+
+        if situacoes and len(situacoes) > 0:
+            query += ' AND v."SituacaoNome" = ANY(%s)'
+            params.append(list(situacoes))
+        # Se situacoes=None ou [], não filtra por situação (busca todas)
+
+        if venda_ids and len(venda_ids) > 0:
+            query += ' AND vp."Venda_ID" = ANY(%s)'
+            params.append(list(venda_ids))
+
+        # Aplicar filtro obrigatório de vendedores ativos
+        query += ' AND TRIM(v."VendedorNome") IN (SELECT "Nome" FROM "Vendedores")'
+
+        return query, params
+
+    def _get_produtos_agregados_sql(
+        self, filtros: str, params: List[Any]
+    ) -> pd.DataFrame:
+        """Agrega produtos diretamente no PostgreSQL (uma linha por produto)
+
+        Mantém o mesmo contrato de colunas do modo Python (Total*). Produtos
+        sem correspondência em "Produtos" (CodigoExpedicao/NomeGrupo nulos)
+        são descartados, assim como no groupby do pandas.
+        """
+        query = """
+            SELECT
+                vp."Nome",
+                p."CodigoExpedicao",
+                p."NomeGrupo",
+                COALESCE(SUM(vp."Quantidade"), 0) AS "TotalQuantidade",
+                COALESCE(SUM(vp."ValorCusto"), 0) AS "TotalValorCusto",
+                COALESCE(SUM(vp."ValorVenda"), 0) AS "TotalValorVenda",
+                COALESCE(SUM(vp."ValorDesconto"), 0) AS "TotalValorDesconto",
+                COALESCE(SUM(vp."ValorTotal"), 0) AS "TotalValorTotal"
+            FROM "VendaProdutos" vp
+            INNER JOIN "Vendas" v ON vp."Venda_ID" = v."ID_Gestao"
+            INNER JOIN "Produtos" p ON vp."Nome" = p."Nome"
+            WHERE p."CodigoExpedicao" IS NOT NULL
+              AND p."NomeGrupo" IS NOT NULL
+        """
+        query += filtros
+        query += """
+            GROUP BY vp."Nome", p."CodigoExpedicao", p."NomeGrupo"
+            ORDER BY "TotalValorTotal" DESC
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            data = cursor.fetchall()
+
+            result = pd.DataFrame(data, columns=columns)
+
+        if result.empty:
+            return pd.DataFrame()
+
+        # SUM de DECIMAL retorna Decimal; converter para float
+        total_columns = [
+            "TotalQuantidade",
+            "TotalValorCusto",
+            "TotalValorVenda",
+            "TotalValorDesconto",
+            "TotalValorTotal",
+        ]
+        for col in total_columns:
+            result[col] = pd.to_numeric(result[col], errors="coerce").fillna(0.0)
+
+        logger.info(f"Retrieved {len(result)} aggregated product records (SQL)")
+        return result
 
 
 class VendaPagamentoRepository(BaseRepository, VendaPagamentoRepositoryInterface):
     """Repositório para operações com pagamentos de vendas"""
 
+    @cached_query("pagamentos_por_vendas")
     def get_pagamentos_por_vendas(self, venda_ids: List[str]) -> pd.DataFrame:
         """Obtém pagamentos por IDs de vendas"""
         try:
             if not venda_ids:
                 return pd.DataFrame()
 
-            queryset = (
-                VendaPagamento.objects.filter(Venda_ID__in=venda_ids)
-                .order_by("DataVencimento")
-                .values()
+            # Mesmas colunas de .values() do modelo; IDs em um único parâmetro
+            # array para que o texto da query não cresça com o período
+            colunas = ", ".join(
+                f'"{field.column}"' for field in VendaPagamento._meta.concrete_fields
             )
-            result = pd.DataFrame(list(queryset))
+            query = f"""
+                SELECT {colunas} FROM "VendaPagamentos"
+                WHERE "Venda_ID" = ANY(%s)
+                ORDER BY "DataVencimento"
+            """
+
+            with connection.cursor() as cursor:
+                cursor.execute(query, [list(venda_ids)])
+                columns = [col[0] for col in cursor.description]
+                data = cursor.fetchall()
+
+                result = pd.DataFrame(data, columns=columns)
 
             logger.info(f"Retrieved {len(result)} payment records")
             return result
@@ -460,9 +783,8 @@ class VendaPagamentoRepository(BaseRepository, VendaPagamentoRepositoryInterface
             params: List[Any] = [data_inicial, data_final]
 
             if venda_ids:
-                placeholders = ",".join(["%s"] * len(venda_ids))
-                query += f' AND "Venda_ID" IN ({placeholders})'
-                params.extend(venda_ids)
+                query += ' AND "Venda_ID" = ANY(%s)'
+                params.append(list(venda_ids))
 
             query += ' ORDER BY "DataVencimento"'
 
@@ -479,15 +801,6 @@ class VendaPagamentoRepository(BaseRepository, VendaPagamentoRepositoryInterface
             logger.error(f"Error fetching filtered payments: {str(e)}")
             raise DatabaseError(f"Erro ao buscar pagamentos filtrados: {str(e)}")
 
-    def health_check(self) -> bool:
-        """Verifica se a conexão está saudável"""
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                return True
-        except Exception:
-            return False
-
 
 class VendaAtualizacaoRepository(BaseRepository, VendaAtualizacaoRepositoryInterface):
     """Repositório para informações de atualização de vendas"""
@@ -544,15 +857,6 @@ class VendaAtualizacaoRepository(BaseRepository, VendaAtualizacaoRepositoryInter
             logger.error(f"Error fetching update history: {str(e)}")
             raise DatabaseError(f"Erro ao buscar histórico de atualizações: {str(e)}")
 
-    def health_check(self) -> bool:
-        """Verifica se a conexão está saudável"""
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                return True
-        except Exception:
-            return False
-
 
 class VendaConfiguracaoRepository(BaseRepository):
     """Repositório para configurações de vendas"""
@@ -585,12 +889,3 @@ class VendaConfiguracaoRepository(BaseRepository):
         except Exception as e:
             logger.error(f"Error fetching sales goal: {str(e)}")
             raise DatabaseError(f"Erro ao buscar meta de vendas: {str(e)}")
-
-    def health_check(self) -> bool:
-        """Verifica se a conexão está saudável"""
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                return True
-        except Exception:
-            return False
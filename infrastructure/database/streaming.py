@@ -0,0 +1,149 @@
+"""
+Leitura de resultados em blocos com cursores nomeados (server-side)
+Evita manter o resultado inteiro como lista de tuplas e como DataFrame ao
+mesmo tempo: o PostgreSQL entrega as linhas em blocos de tamanho fixo
+"""
+
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from django.db import connections, transaction
+
+import pandas as pd
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def iter_query_chunks(
+    query: str,
+    params: Optional[Sequence[Any]] = None,
+    chunk_size: Optional[int] = None,
+    using: str = "default",
+) -> Iterator[pd.DataFrame]:
+    """
+    Executa a query com cursor nomeado e produz DataFrames de até chunk_size linhas
+
+    A leitura ocorre dentro de uma transação (o cursor nomeado só existe
+    nela), que permanece aberta enquanto o iterador estiver em uso. Cursor e
+    transação são encerrados ao fim da leitura, em erro ou quando o iterador
+    é fechado antes do fim; quem interrompe a leitura deve fechá-lo (close()
+    ou contextlib.closing) na mesma thread, sem esperar o coletor de lixo.
+    Sempre produz ao menos um bloco: sem linhas, um DataFrame vazio com as
+    colunas.
+
+    Args:
+        query: Query SQL
+        params: Parâmetros da query
+        chunk_size: Linhas por bloco (padrão: settings.database.stream_chunk_size)
+        using: Alias da conexão Django
+
+    Yields:
+        pd.DataFrame: Bloco de linhas com as colunas da query
+
+    Example:
+        for bloco in iter_query_chunks('SELECT * FROM "Vendas"'):
+            total += bloco["ValorTotal"].sum()
+    """
+    chunk_size = chunk_size or settings.database.stream_chunk_size
+    connection = connections[using]
+
+    atomic = transaction.atomic(using=using)
+    atomic.__enter__()
+    cursor = None
+    erro: Optional[BaseException] = None
+    blocos = 0
+    try:
+        cursor = connection.chunked_cursor()
+        cursor.execute(query, params or [])
+
+        columns: Optional[List[str]] = None
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if columns is None:
+                # Cursor nomeado só preenche description após o 1º fetch
+                columns = [col[0] for col in cursor.description or []]
+            if not rows:
+                break
+            blocos += 1
+            yield pd.DataFrame(rows, columns=columns)
+
+        if blocos == 0:
+            yield pd.DataFrame(columns=columns)
+    except BaseException as e:
+        # Inclui GeneratorExit: o consumidor fechou o iterador antes do fim
+        erro = e
+        raise
+    finally:
+        try:
+            if cursor is not None:
+                cursor.close()
+        finally:
+            # Fecha a transação (desfeita se houve erro) mesmo se close() falhar
+            if erro is None:
+                atomic.__exit__(None, None, None)
+            else:
+                atomic.__exit__(type(erro), erro, erro.__traceback__)
+
+    if erro is None:
+        logger.debug(f"Streamed query in {max(blocos, 1)} chunk(s) of {chunk_size}")
+
+
+def read_query_frame(
+    query: str,
+    params: Optional[Sequence[Any]] = None,
+    chunk_size: Optional[int] = None,
+    using: str = "default",
+) -> pd.DataFrame:
+    """
+    Lê o resultado completo em um DataFrame, bloco a bloco
+
+    Equivale a fetchall() + pd.DataFrame, mas só mantém as tuplas de um
+    bloco por vez. As colunas de cada bloco são separadas assim que ele
+    chega e concatenadas uma coluna por vez no final, liberando as partes
+    de cada coluna logo em seguida: o pico fica perto do resultado mais uma
+    coluna, e não de todos os blocos mais o resultado.
+
+    Args:
+        query: Query SQL
+        params: Parâmetros da query
+        chunk_size: Linhas por bloco
+        using: Alias da conexão Django
+
+    Returns:
+        pd.DataFrame: Resultado completo
+    """
+    blocos = iter_query_chunks(query, params, chunk_size, using)
+    # Sempre há ao menos um bloco; resultado de um só bloco volta como veio
+    primeiro: Optional[pd.DataFrame] = next(blocos)
+    colunas = list(primeiro.columns)
+    partes: Optional[List[List[pd.Series]]] = None
+
+    for bloco in blocos:
+        if partes is None:
+            partes = [[] for _ in colunas]
+            _separar_colunas(primeiro, partes)
+            primeiro = None
+        _separar_colunas(bloco, partes)
+        del bloco
+
+    if partes is None:
+        return primeiro
+
+    dados: Dict[int, pd.Series] = {}
+    for posicao in range(len(colunas)):
+        pecas, partes[posicao] = partes[posicao], []
+        dados[posicao] = pd.concat(pecas, ignore_index=True)
+        del pecas
+
+    # copy=False mantém cada coluna no próprio array (sem consolidar cópias)
+    frame = pd.DataFrame(dados, copy=False)
+    frame.columns = colunas
+    return frame
+
+
+def _separar_colunas(bloco: pd.DataFrame, partes: List[List[pd.Series]]) -> None:
+    """Copia cada coluna do bloco para a lista dela (o bloco pode ser liberado)"""
+    for posicao, pecas in enumerate(partes):
+        pecas.append(bloco.iloc[:, posicao].copy())
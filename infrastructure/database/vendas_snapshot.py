@@ -0,0 +1,361 @@
+"""
+Snapshot incremental de Vendas em memória do processo
+Mantém o período recente carregado (ex.: mês corrente) e, a cada nova
+ingestão do RPA de Vendas, busca apenas as linhas inseridas ou alteradas.
+Filtros mais restritos (período menor, vendedores, situações, origens) são
+respondidos localmente, sem ida ao banco. Períodos anteriores à janela vão ao
+repositório (query_cache), sem deslocar o snapshot.
+"""
+
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from config.settings import settings
+from infrastructure.database.freshness import FreshnessMonitor, freshness_monitor
+from infrastructure.database.query_cache import (
+    RPA_VENDAS_ID,
+    QueryResultCache,
+    query_cache,
+)
+from infrastructure.database.repositories_vendas import (
+    VendaRepository,
+    normalizar_colunas_vendas,
+)
+
+logger = logging.getLogger(__name__)
+
+# Colunas auxiliares retornadas por VendaRepository.get_vendas_snapshot
+_COLUNA_DATA = "_DataRef"
+_COLUNA_XMIN = "_xmin"
+
+
+def _tamanho(df: Optional[pd.DataFrame]) -> int:
+    """Memória ocupada pelo DataFrame (0 se não houver)"""
+    if df is None:
+        return 0
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _to_date(value: Any) -> date:
+    """Converte datetime/Timestamp para date"""
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class VendasSnapshotStore:
+    """
+    Snapshot incremental e thread-safe da tabela Vendas
+
+    Guarda um único intervalo contínuo de datas com os critérios obrigatórios
+    (vendedores válidos) aplicados. A janela termina hoje e tem max_dias: o
+    intervalo cresce sob demanda dentro dela e linhas que saem dela são
+    descartadas. Consultas que começam antes da janela vão direto ao
+    repositório, sem recarregar nem deslocar o snapshot, então sessões
+    consultando o histórico não disputam o snapshot com o mês corrente.
+
+    O tamanho do snapshot é reservado no orçamento do query_cache.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[VendaRepository] = None,
+        monitor: Optional[FreshnessMonitor] = None,
+        max_dias: int = 400,
+        max_idade: float = 300,
+        cache: Optional[QueryResultCache] = None,
+    ):
+        """
+        Inicializa o snapshot
+
+        Args:
+            repository: Repositório de vendas
+            monitor: Monitor de ingestões dos RPAs
+            max_dias: Maior intervalo (em dias) mantido em memória
+            max_idade: Idade máxima (s) sem sincronizar quando a marca d'água
+                do RPA não está disponível
+            cache: Cache em cujo orçamento de memória o snapshot é reservado
+        """
+        self.repository = repository or VendaRepository()
+        self.monitor = monitor or freshness_monitor
+        self.max_dias = max_dias
+        self.max_idade = max_idade
+        self.cache = cache or query_cache
+
+        self._lock = threading.Lock()
+        self._df: Optional[pd.DataFrame] = None
+        self._inicio: Optional[date] = None
+        self._fim: Optional[date] = None
+        self._watermark: Optional[Tuple] = None
+        self._horizonte: Optional[int] = None
+        self._sincronizado_em = 0.0
+
+    def get_vendas(
+        self,
+        data_inicial: date,
+        data_final: date,
+        vendedores: Optional[List[str]] = None,
+        situacoes: Optional[List[str]] = None,
+        situacao: Optional[str] = None,
+        situacoes_excluir: Optional[List[str]] = None,
+        origens: Optional[List[str]] = None,
+        colunas: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Obtém vendas com a mesma semântica de VendaRepository.get_vendas_filtradas
+
+        Args:
+            data_inicial: Data inicial
+            data_final: Data final
+            vendedores: Vendedores (opcional)
+            situacoes: Situações (opcional)
+            situacao: Situação única (opcional)
+            situacoes_excluir: Situações a excluir (opcional)
+            origens: Origens (opcional)
+            colunas: Colunas a retornar (None retorna todas)
+
+        Returns:
+            pd.DataFrame: Vendas filtradas, ordenadas por Data decrescente
+        """
+        data_inicial = _to_date(data_inicial)
+        data_final = _to_date(data_final)
+        filtros = {
+            "vendedores": vendedores,
+            "situacoes": situacoes,
+            "situacao": situacao,
+            "situacoes_excluir": situacoes_excluir,
+            "origens": origens,
+            "colunas": colunas,
+        }
+
+        # Fora da janela: repositório (query_cache), sem tocar no snapshot
+        if data_inicial < self._inicio_janela():
+            return self.repository.get_vendas_filtradas(
+                data_inicial=data_inicial, data_final=data_final, **filtros
+            )
+
+        watermark = self.monitor.get_watermark(RPA_VENDAS_ID)
+
+        with self._lock:
+            self._sincronizar(data_inicial, data_final, watermark)
+            df = self._df
+
+        return self._filtrar(df, data_inicial, data_final, **filtros)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna período, linhas e memória do snapshot"""
+        with self._lock:
+            df = self._df
+            inicio, fim = self._inicio, self._fim
+        tamanho = _tamanho(df)
+        return {
+            "inicio": inicio,
+            "fim": fim,
+            "rows": 0 if df is None else len(df),
+            "bytes": tamanho,
+            "max_bytes": self.cache.max_bytes,
+        }
+
+    def invalidate(self) -> None:
+        """Descarta o snapshot (a próxima consulta recarrega o período)"""
+        with self._lock:
+            self._df = None
+            self._inicio = None
+            self._fim = None
+            self._watermark = None
+            self._horizonte = None
+        self.cache.reserve("vendas_snapshot", 0)
+
+    # ------------------------------------------------------------------
+    # Sincronização (chamar com o lock adquirido)
+    # ------------------------------------------------------------------
+    def _sincronizar(
+        self, data_inicial: date, data_final: date, watermark: Optional[Tuple]
+    ) -> None:
+        """Garante que o snapshot cobre o período e reflete a última ingestão"""
+        if self._df is None:
+            self._carregar_completo(data_inicial, data_final, watermark)
+            return
+
+        # A janela avança com a data: descarta os dias que saíram dela
+        inicio_janela = self._inicio_janela()
+        if self._inicio < inicio_janela:
+            self._descartar_antes(inicio_janela)
+
+        novo_inicio = min(self._inicio, data_inicial)
+        novo_fim = max(self._fim, data_final)
+
+        sem_marca_expirado = (
+            watermark is None
+            and time.monotonic() - self._sincronizado_em > self.max_idade
+        )
+        if watermark != self._watermark or sem_marca_expirado:
+            self._aplicar_delta(watermark)
+
+        # Estender o período buscando apenas os dias que faltam
+        if novo_inicio < self._inicio:
+            self._anexar_periodo(novo_inicio, self._inicio - timedelta(days=1))
+            self._inicio = novo_inicio
+        if novo_fim > self._fim:
+            self._anexar_periodo(self._fim + timedelta(days=1), novo_fim)
+            self._fim = novo_fim
+
+    def _inicio_janela(self) -> date:
+        """Primeiro dia que pode ficar no snapshot"""
+        return date.today() - timedelta(days=self.max_dias - 1)
+
+    def _descartar_antes(self, inicio: date) -> None:
+        """Remove do snapshot os dias anteriores a inicio"""
+        if not self._df.empty:
+            self._df = self._df[self._df[_COLUNA_DATA] >= inicio].reset_index(drop=True)
+        self._inicio = inicio
+        if self._fim < inicio:
+            self._fim = inicio
+        self._reservar_memoria()
+
+    def _reservar_memoria(self) -> None:
+        """Atualiza a reserva do snapshot no orçamento do query_cache"""
+        tamanho = _tamanho(self._df)
+        self.cache.reserve("vendas_snapshot", tamanho)
+        logger.debug(
+            f"Sales snapshot holds {len(self._df)} rows, "
+            f"{tamanho / 1024**2:.1f} MB of the "
+            f"{self.cache.max_bytes / 1024**2:.0f} MB query cache budget"
+        )
+
+    def _carregar_completo(
+        self, data_inicial: date, data_final: date, watermark: Optional[Tuple]
+    ) -> None:
+        """Carrega o período inteiro do banco"""
+        horizonte = self.repository.get_horizonte_transacoes()
+        self._df = self.repository.get_vendas_snapshot(data_inicial, data_final)
+        self._inicio = data_inicial
+        self._fim = data_final
+        self._watermark = watermark
+        self._horizonte = horizonte
+        self._sincronizado_em = time.monotonic()
+        self._reservar_memoria()
+        logger.info(
+            f"Snapshot de vendas carregado: {len(self._df)} registros "
+            f"({data_inicial} a {data_final})"
+        )
+
+    def _anexar_periodo(self, data_inicial: date, data_final: date) -> None:
+        """Busca um trecho ainda não carregado e o incorpora ao snapshot"""
+        df_novo = self.repository.get_vendas_snapshot(data_inicial, data_final)
+        self._df = self._concatenar(self._df, df_novo)
+        self._reservar_memoria()
+
+    def _aplicar_delta(self, watermark: Optional[Tuple]) -> None:
+        """Incorpora apenas as linhas inseridas/alteradas desde a última leitura"""
+        horizonte = self.repository.get_horizonte_transacoes()
+        if self._horizonte is None or horizonte < self._horizonte:
+            # Contador de transações reiniciou (wraparound): recarregar tudo
+            self._carregar_completo(self._inicio, self._fim, watermark)
+            return
+
+        # IDs válidos hoje: remove vendas excluídas e detecta vendas que
+        # passaram a ser válidas sem alteração na própria linha
+        ids_atuais = self.repository.get_ids_vendas(self._inicio, self._fim)
+        conhecidos = set(self._df["ID_Gestao"]) if not self._df.empty else set()
+        ids_faltantes = list(set(ids_atuais) - conhecidos)
+
+        df_delta = self.repository.get_vendas_snapshot(
+            self._inicio,
+            self._fim,
+            desde_xmin=self._horizonte,
+            ids_vendas=ids_faltantes,
+        )
+
+        df = self._df
+        if not df.empty:
+            df = df[df["ID_Gestao"].isin(ids_atuais)]
+            if not df_delta.empty:
+                df = df[~df["ID_Gestao"].isin(df_delta["ID_Gestao"])]
+
+        self._df = self._concatenar(df, df_delta)
+        self._watermark = watermark
+        self._horizonte = horizonte
+        self._sincronizado_em = time.monotonic()
+        self._reservar_memoria()
+        logger.info(
+            f"Snapshot de vendas atualizado: {len(df_delta)} registro(s) "
+            f"novo(s)/alterado(s), total {len(self._df)}"
+        )
+
+    @staticmethod
+    def _concatenar(df: pd.DataFrame, df_novo: pd.DataFrame) -> pd.DataFrame:
+        """
+        Concatena preservando colunas quando um dos lados está vazio
+
+        Colunas category dos dois lados recebem as mesmas categorias antes:
+        com categorias diferentes, pd.concat as converteria para object.
+        """
+        if df_novo.empty:
+            return df
+        if df.empty:
+            return df_novo.reset_index(drop=True)
+
+        for coluna in df.columns.intersection(df_novo.columns):
+            antigo, novo = df[coluna], df_novo[coluna]
+            if not (
+                isinstance(antigo.dtype, pd.CategoricalDtype)
+                and isinstance(novo.dtype, pd.CategoricalDtype)
+            ):
+                continue
+            categorias = antigo.cat.categories.union(novo.cat.categories)
+            df = df.assign(**{coluna: antigo.cat.set_categories(categorias)})
+            df_novo = df_novo.assign(**{coluna: novo.cat.set_categories(categorias)})
+        return pd.concat([df, df_novo], ignore_index=True)
+
+    # ------------------------------------------------------------------
+    # Filtros locais
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _filtrar(
+        df: pd.DataFrame,
+        data_inicial: date,
+        data_final: date,
+        vendedores: Optional[List[str]] = None,
+        situacoes: Optional[List[str]] = None,
+        situacao: Optional[str] = None,
+        situacoes_excluir: Optional[List[str]] = None,
+        origens: Optional[List[str]] = None,
+        colunas: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """Aplica localmente os mesmos filtros do SQL de get_vendas_filtradas"""
+        # Mesma validação e ordem da projeção feita no SQL
+        colunas = normalizar_colunas_vendas(colunas)
+        if not colunas:
+            colunas = [c for c in df.columns if c not in (_COLUNA_DATA, _COLUNA_XMIN)]
+        if df.empty:
+            return pd.DataFrame(columns=colunas)
+
+        datas = df[_COLUNA_DATA]
+        mask = (datas >= data_inicial) & (datas <= data_final)
+
+        if vendedores:
+            mask &= df["VendedorNome"].isin(vendedores)
+        if situacao:
+            mask &= df["SituacaoNome"] == situacao
+        if situacoes:
+            mask &= df["SituacaoNome"].isin(situacoes)
+        if situacoes_excluir:
+            # NOT IN do SQL também descarta situações nulas
+            mask &= df["SituacaoNome"].notna() & ~df["SituacaoNome"].isin(
+                situacoes_excluir
+            )
+        if origens:
+            mask &= df["Origem"].isin(origens)
+
+        result = df.loc[mask].sort_values("Data", ascending=False, kind="stable")
+        return result[colunas].reset_index(drop=True)
+
+
+# Instância global compartilhada por todas as sessões do processo
+vendas_snapshot = VendasSnapshotStore(max_idade=settings.cache.query_ttl)
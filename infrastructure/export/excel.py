@@ -0,0 +1,456 @@
+"""
+Exportação de DataFrames para Excel em uma única passada
+Usa o xlsxwriter em modo constant_memory: cada linha vai para o arquivo
+temporário assim que é escrita, então a planilha inteira nunca fica em RAM.
+Os valores são convertidos por coluna (vetorizado) antes da escrita e os
+formatos de cada coluna são criados uma única vez
+"""
+
+import io
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+from utils.numeric import converter_para_numerico
+
+logger = logging.getLogger(__name__)
+
+MIME_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Linhas escritas por vez quando um DataFrame inteiro é exportado
+LINHAS_POR_BLOCO = 10_000
+
+LARGURA_MAXIMA = 50
+
+FORMATO_MOEDA = '"R$ "#,##0.00'
+FORMATO_NUMERO = "#,##0.00"
+FORMATO_INTEIRO = "#,##0"
+FORMATO_DATA = "dd/mm/yyyy"
+FORMATO_DATA_HORA = "dd/mm/yyyy hh:mm:ss"
+
+# Cabeçalho equivalente ao do DataFrame.to_excel
+CABECALHO_SIMPLES: Dict[str, Any] = {"bold": True, "border": 1, "align": "center"}
+
+# Cabeçalho azul dos relatórios do SGR
+CABECALHO_DESTAQUE: Dict[str, Any] = {
+    "bold": True,
+    "font_color": "#FFFFFF",
+    "bg_color": "#1E88E5",
+    "align": "center",
+    "valign": "vcenter",
+    "border": 1,
+    "border_color": "#BDBDBD",
+}
+
+# Data zero do Excel (datas viram número de dias a partir dela)
+_EPOCA_EXCEL = pd.Timestamp("1899-12-30")
+
+_COR_ZEBRA = "#F5F5F5"
+_COR_TOTAL = "#E3F2FD"
+
+_TIPOS = {"auto", "texto", "numero", "inteiro", "moeda", "data", "datahora"}
+
+
+@dataclass(frozen=True)
+class ExcelColumn:
+    """
+    Coluna exportada
+
+    Attributes:
+        field: Coluna do DataFrame
+        header: Título no cabeçalho (padrão: field)
+        kind: "texto", "numero", "inteiro", "moeda", "data", "datahora" ou
+            "auto" (deduzido do dtype)
+        width: Largura fixa; None calcula pelo conteúdo (até 50)
+        align: Alinhamento horizontal das células
+        total: Conteúdo da linha de total: "soma" ou um texto, onde "{n}" é
+            substituído pela quantidade de linhas (ex.: "{n} recebimentos")
+    """
+
+    field: str
+    header: Optional[str] = None
+    kind: str = "auto"
+    width: Optional[float] = None
+    align: Optional[str] = None
+    total: Optional[str] = None
+
+
+ExcelData = Union[pd.DataFrame, Iterable[pd.DataFrame]]
+
+
+def export_excel(
+    data: ExcelData,
+    columns: Optional[Sequence[ExcelColumn]] = None,
+    sheet_name: str = "Dados",
+    title: Optional[str] = None,
+    subtitle: Optional[str] = None,
+    header_format: Optional[Dict[str, Any]] = None,
+    zebra: bool = False,
+    borders: bool = False,
+    freeze_header: bool = True,
+) -> bytes:
+    """
+    Gera um arquivo xlsx a partir de um DataFrame ou de blocos de DataFrame
+
+    Blocos (ex.: iter_query_chunks) são escritos à medida que chegam, de modo
+    que o resultado de uma query pode ir direto para a planilha sem montar o
+    DataFrame completo.
+
+    Args:
+        data: DataFrame ou iterável de DataFrames com as mesmas colunas
+        columns: Colunas exportadas (padrão: todas, tipo deduzido)
+        sheet_name: Nome da aba
+        title: Título mesclado na primeira linha
+        subtitle: Linha de texto abaixo do título
+        header_format: Propriedades do formato do cabeçalho
+            (padrão: CABECALHO_SIMPLES)
+        zebra: Alterna o fundo das linhas de dados
+        borders: Aplica borda cinza às células de dados
+        freeze_header: Congela as linhas até o cabeçalho
+
+    Returns:
+        bytes: Conteúdo do arquivo xlsx
+    """
+    buffer = io.BytesIO()
+    writer = _ExcelSheetWriter(
+        buffer,
+        sheet_name=sheet_name,
+        header_format=header_format or CABECALHO_SIMPLES,
+        zebra=zebra,
+        borders=borders,
+    )
+    try:
+        for bloco in _iter_blocos(data):
+            if writer.columns is None:
+                writer.start(columns or _colunas_do_frame(bloco), title, subtitle)
+            writer.write_rows(bloco)
+        if writer.columns is None:
+            # Sem blocos: planilha apenas com o cabeçalho
+            writer.start(columns or [], title, subtitle)
+        writer.finish(freeze_header)
+    finally:
+        writer.close()
+
+    logger.info(
+        f"Excel export '{sheet_name}': {writer.row_count} rows, "
+        f"{buffer.tell() / 1024:.1f} KB"
+    )
+    return buffer.getvalue()
+
+
+def _iter_blocos(data: ExcelData) -> Iterable[pd.DataFrame]:
+    """Divide um DataFrame em blocos ou repassa os blocos recebidos"""
+    if isinstance(data, pd.DataFrame):
+        for inicio in range(0, len(data), LINHAS_POR_BLOCO):
+            yield data.iloc[inicio : inicio + LINHAS_POR_BLOCO]
+        return
+    for bloco in data:
+        if not bloco.empty:
+            yield bloco
+
+
+def _colunas_do_frame(df: pd.DataFrame) -> List[ExcelColumn]:
+    """Todas as colunas do DataFrame com tipo deduzido"""
+    return [ExcelColumn(field=str(col)) for col in df.columns]
+
+
+def _deduzir_tipo(serie: pd.Series) -> str:
+    """Deduz o tipo de exportação a partir do dtype (e do primeiro valor)"""
+    if pd.api.types.is_bool_dtype(serie):
+        return "texto"
+    if pd.api.types.is_integer_dtype(serie):
+        return "inteiro"
+    if pd.api.types.is_numeric_dtype(serie):
+        return "numero"
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return "datahora"
+    if serie.dtype == object:
+        validos = serie.dropna()
+        if not validos.empty:
+            primeiro = validos.iloc[0]
+            if isinstance(primeiro, pd.Timestamp):
+                return "datahora"
+            if hasattr(primeiro, "isoformat") and hasattr(primeiro, "year"):
+                return "datahora" if hasattr(primeiro, "hour") else "data"
+    return "texto"
+
+
+def _preparar_valores(serie: pd.Series, tipo: str) -> pd.Series:
+    """
+    Converte a coluna inteira para os valores gravados (None = célula vazia)
+
+    Datas que não puderem ser interpretadas são gravadas como texto.
+    """
+    if tipo in ("numero", "inteiro", "moeda"):
+        numeros = converter_para_numerico(serie, padrao=np.nan)
+        return numeros.astype(object).where(numeros.notna(), None)
+
+    if tipo in ("data", "datahora"):
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            datas = serie
+        else:
+            # Datas se repetem: interpretar apenas os valores distintos
+            codigos, unicos = pd.factorize(serie.astype(object))
+            convertidos = pd.to_datetime(
+                pd.Series(unicos, dtype=object),
+                errors="coerce",
+                dayfirst=True,
+                format="mixed",
+            )
+            datas = pd.Series(
+                convertidos.take(codigos).to_numpy(), index=serie.index
+            ).where(codigos >= 0)
+        if getattr(datas.dt, "tz", None) is not None:
+            datas = datas.dt.tz_localize(None)
+        # Número serial do Excel calculado para a coluna inteira
+        seriais = (datas - _EPOCA_EXCEL) / pd.Timedelta(days=1)
+        valores = seriais.astype(object).where(seriais.notna(), None)
+        texto = _preparar_valores(serie, "texto")
+        return valores.where(valores.notna() | texto.isna(), texto)
+
+    texto = serie.astype(object)
+    vazio = texto.isna()
+    texto = texto.where(vazio, texto.astype(str))
+    return texto.where(~vazio & (texto != ""), None)
+
+
+def _largura(valores: pd.Series, tipo: str) -> float:
+    """Largura necessária para o bloco (vetorizado)"""
+    if valores.isna().all():
+        return 0
+    if tipo == "data":
+        return 12
+    if tipo == "datahora":
+        return 20
+    if tipo in ("numero", "inteiro", "moeda"):
+        maior = float(valores.dropna().astype(float).abs().max())
+        digitos = len(f"{maior:,.0f}") + (0 if tipo == "inteiro" else 3)
+        return digitos + (4 if tipo == "moeda" else 1)
+    return float(valores.dropna().astype(str).str.len().max())
+
+
+class _ExcelSheetWriter:
+    """Escreve uma aba linha a linha em modo constant_memory"""
+
+    def __init__(
+        self,
+        destino: io.BytesIO,
+        sheet_name: str,
+        header_format: Dict[str, Any],
+        zebra: bool,
+        borders: bool,
+    ):
+        self.workbook = xlsxwriter.Workbook(
+            destino, {"constant_memory": True, "in_memory": False}
+        )
+        self.worksheet = self.workbook.add_worksheet(sheet_name[:31])
+        self.header_format = header_format
+        self.zebra = zebra
+        self.borders = borders
+
+        self.columns: Optional[List[ExcelColumn]] = None
+        self.row_count = 0
+        self._tipos: List[str] = []
+        self._formatos: List[List[Any]] = []
+        self._escritores: List[Callable[..., Any]] = []
+        self._larguras: List[float] = []
+        self._somas: List[float] = []
+        self._header_row = 0
+        self._proxima_linha = 0
+
+    def start(
+        self,
+        columns: Sequence[ExcelColumn],
+        title: Optional[str],
+        subtitle: Optional[str],
+    ) -> None:
+        """Define as colunas, cria os formatos e escreve título e cabeçalho"""
+        self.columns = list(columns)
+        ultima_coluna = max(len(self.columns) - 1, 0)
+
+        linha = 0
+        if title:
+            fmt_titulo = self.workbook.add_format(
+                {
+                    "bold": True,
+                    "font_size": 14,
+                    "font_color": "#1E88E5",
+                    "align": "center",
+                    "valign": "vcenter",
+                }
+            )
+            self._escrever_mesclado(linha, ultima_coluna, title, fmt_titulo)
+            self.worksheet.set_row(linha, 24)
+            linha += 1
+        if subtitle:
+            fmt_subtitulo = self.workbook.add_format(
+                {"italic": True, "font_size": 9, "font_color": "#757575"}
+            )
+            self._escrever_mesclado(linha, ultima_coluna, subtitle, fmt_subtitulo)
+            linha += 1
+
+        fmt_cabecalho = self.workbook.add_format(self.header_format)
+        for indice, coluna in enumerate(self.columns):
+            titulo = coluna.header if coluna.header is not None else coluna.field
+            self.worksheet.write_string(linha, indice, titulo, fmt_cabecalho)
+            self._larguras.append(len(titulo))
+        self._header_row = linha
+        self._proxima_linha = linha + 1
+        self._somas = [0.0] * len(self.columns)
+
+    def write_rows(self, bloco: pd.DataFrame) -> None:
+        """Escreve as linhas de um bloco, em ordem"""
+        if not self._tipos:
+            self._preparar_colunas(bloco)
+
+        valores_colunas = []
+        for indice, coluna in enumerate(self.columns):
+            tipo = self._tipos[indice]
+            if coluna.field in bloco.columns:
+                valores = _preparar_valores(bloco[coluna.field], tipo)
+            else:
+                valores = pd.Series([None] * len(bloco), dtype=object)
+            if coluna.width is None:
+                self._larguras[indice] = max(
+                    self._larguras[indice], _largura(valores, tipo)
+                )
+            if coluna.total == "soma":
+                self._somas[indice] += float(
+                    pd.to_numeric(valores, errors="coerce").sum()
+                )
+            valores_colunas.append(valores.tolist())
+
+        escrever_vazio = self.worksheet.write_blank
+        for valores_linha in zip(*valores_colunas):
+            linha = self._proxima_linha
+            formatos = self._formatos[(linha - self._header_row - 1) % 2]
+            for indice, valor in enumerate(valores_linha):
+                if valor is None:
+                    escrever_vazio(linha, indice, None, formatos[indice])
+                else:
+                    self._escritores[indice](linha, indice, valor, formatos[indice])
+            self._proxima_linha += 1
+        self.row_count += len(bloco)
+
+    def finish(self, freeze_header: bool) -> None:
+        """Escreve a linha de total e ajusta larguras e painéis"""
+        if self.columns and any(coluna.total for coluna in self.columns):
+            self._escrever_total()
+
+        for indice, coluna in enumerate(self.columns or []):
+            largura = coluna.width
+            if largura is None:
+                largura = min(self._larguras[indice] + 2, LARGURA_MAXIMA)
+            self.worksheet.set_column(indice, indice, largura)
+
+        if freeze_header:
+            self.worksheet.freeze_panes(self._header_row + 1, 0)
+
+    def close(self) -> None:
+        """Fecha o workbook (grava o arquivo no destino)"""
+        self.workbook.close()
+
+    def _preparar_colunas(self, bloco: pd.DataFrame) -> None:
+        """Resolve tipos, formatos e funções de escrita uma vez por coluna"""
+        ws = self.worksheet
+        escritor_por_tipo = {
+            "texto": ws.write_string,
+            "numero": ws.write_number,
+            "inteiro": ws.write_number,
+            "moeda": ws.write_number,
+            "data": self._escrever_data,
+            "datahora": self._escrever_data,
+        }
+        formato_por_tipo = {
+            "numero": FORMATO_NUMERO,
+            "inteiro": FORMATO_INTEIRO,
+            "moeda": FORMATO_MOEDA,
+            "data": FORMATO_DATA,
+            "datahora": FORMATO_DATA_HORA,
+        }
+        alinhamento_por_tipo = {"data": "center", "datahora": "center"}
+
+        pares: List[Any] = []
+        impares: List[Any] = []
+        for coluna in self.columns:
+            tipo = coluna.kind
+            if tipo not in _TIPOS:
+                raise ValueError(f"Tipo de coluna inválido: {tipo}")
+            if tipo == "auto":
+                tipo = (
+                    _deduzir_tipo(bloco[coluna.field])
+                    if coluna.field in bloco.columns
+                    else "texto"
+                )
+            self._tipos.append(tipo)
+            self._escritores.append(escritor_por_tipo[tipo])
+
+            propriedades: Dict[str, Any] = {"valign": "vcenter"}
+            if tipo in formato_por_tipo:
+                propriedades["num_format"] = formato_por_tipo[tipo]
+            alinhamento = coluna.align or alinhamento_por_tipo.get(tipo)
+            if alinhamento:
+                propriedades["align"] = alinhamento
+            if self.borders:
+                propriedades.update({"border": 1, "border_color": "#BDBDBD"})
+
+            pares.append(self.workbook.add_format(propriedades))
+            if self.zebra:
+                impares.append(
+                    self.workbook.add_format({**propriedades, "bg_color": _COR_ZEBRA})
+                )
+            else:
+                impares.append(pares[-1])
+        self._formatos = [pares, impares]
+
+    def _escrever_data(self, linha: int, coluna: int, valor: Any, formato: Any) -> None:
+        """Data já convertida em serial; valor não interpretado vira texto"""
+        if isinstance(valor, float):
+            self.worksheet.write_number(linha, coluna, valor, formato)
+        else:
+            self.worksheet.write_string(linha, coluna, valor, formato)
+
+    def _escrever_total(self) -> None:
+        """Linha de total com somas acumuladas entre os blocos"""
+        linha = self._proxima_linha
+        base = {"bold": True, "bg_color": _COR_TOTAL, "valign": "vcenter"}
+        if self.borders:
+            base.update({"border": 1, "border_color": "#BDBDBD"})
+
+        for indice, coluna in enumerate(self.columns):
+            if coluna.total == "soma":
+                tipo = self._tipos[indice] if self._tipos else "numero"
+                formato = self.workbook.add_format(
+                    {
+                        **base,
+                        "align": "right",
+                        "num_format": (
+                            FORMATO_MOEDA if tipo == "moeda" else FORMATO_NUMERO
+                        ),
+                    }
+                )
+                self.worksheet.write_number(linha, indice, self._somas[indice], formato)
+            elif coluna.total:
+                formato = self.workbook.add_format(
+                    {**base, "align": coluna.align or "left"}
+                )
+                quantidade = f"{self.row_count:,}".replace(",", ".")
+                texto = coluna.total.replace("{n}", quantidade)
+                self.worksheet.write_string(linha, indice, texto, formato)
+            else:
+                self.worksheet.write_blank(
+                    linha, indice, None, self.workbook.add_format(base)
+                )
+
+    def _escrever_mesclado(
+        self, linha: int, ultima_coluna: int, texto: str, formato: Any
+    ) -> None:
+        """Escreve texto ocupando a linha inteira da tabela"""
+        if ultima_coluna > 0:
+            self.worksheet.merge_range(linha, 0, linha, ultima_coluna, texto, formato)
+        else:
+            self.worksheet.write_string(linha, 0, texto, formato)
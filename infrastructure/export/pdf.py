@@ -0,0 +1,266 @@
+"""
+Exportação de DataFrames para relatórios PDF em tabela
+As colunas são formatadas de uma vez (vetorizado) e a tabela é dividida em
+blocos do tamanho de uma página, com altura de linha fixa: o reportlab não
+precisa medir nem dividir uma tabela gigante a cada página. Não usa Streamlit,
+então pode ser executado em uma thread de trabalho
+"""
+
+import io
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.platypus import (
+    PageBreak,
+    Paragraph,
+    SimpleDocTemplate,
+    Spacer,
+    Table,
+    TableStyle,
+)
+
+from utils.numeric import converter_para_numerico
+
+logger = logging.getLogger(__name__)
+
+# Alturas fixas (pontos): fonte 8/9 com 4 pontos de espaçamento acima e abaixo
+ALTURA_CABECALHO = 20
+ALTURA_LINHA = 18
+
+_COR_CABECALHO = colors.HexColor("#1E88E5")
+_COR_ZEBRA = colors.HexColor("#F5F5F5")
+_COR_TOTAL = colors.HexColor("#E3F2FD")
+
+# Espaçamento interno padrão do Frame do SimpleDocTemplate (acima + abaixo)
+_PADDING_FRAME = 12
+
+# Troca de separadores do formato americano para o brasileiro
+_TROCA_BR = str.maketrans({",": ".", ".": ","})
+
+_TIPOS = {"texto", "numero", "inteiro", "moeda"}
+
+
+@dataclass(frozen=True)
+class PdfColumn:
+    """
+    Coluna do relatório
+
+    Attributes:
+        field: Coluna do DataFrame
+        header: Título no cabeçalho (padrão: field)
+        kind: "texto", "numero", "inteiro" ou "moeda" (R$ 1.234,56)
+        width: Largura em pontos (ex.: 4 * cm)
+        align: Alinhamento das células ("LEFT", "CENTER" ou "RIGHT")
+        max_chars: Trunca textos maiores (mantém uma linha por registro)
+        total: Conteúdo da linha de total: "soma" ou um texto, onde "{n}" é
+            substituído pela quantidade de linhas
+    """
+
+    field: str
+    header: Optional[str] = None
+    kind: str = "texto"
+    width: Optional[float] = None
+    align: Optional[str] = None
+    max_chars: Optional[int] = None
+    total: Optional[str] = None
+
+
+def export_pdf(
+    df: pd.DataFrame,
+    columns: Sequence[PdfColumn],
+    title: str,
+    subtitle: Optional[str] = None,
+    pagesize: Tuple[float, float] = landscape(A4),
+) -> bytes:
+    """
+    Gera um relatório PDF com título e a tabela do DataFrame
+
+    O cabeçalho da tabela se repete em todas as páginas, as linhas alternam
+    branco/cinza e, se alguma coluna tiver total, a última linha traz os
+    totais.
+
+    Args:
+        df: Dados do relatório
+        columns: Colunas exibidas, na ordem
+        title: Título da primeira página
+        subtitle: Linha abaixo do título (padrão: data/hora de geração)
+        pagesize: Tamanho da página (padrão: A4 paisagem)
+
+    Returns:
+        bytes: Conteúdo do arquivo PDF
+    """
+    for coluna in columns:
+        if coluna.kind not in _TIPOS:
+            raise ValueError(f"Tipo de coluna inválido: {coluna.kind}")
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=pagesize,
+        rightMargin=1 * cm,
+        leftMargin=1 * cm,
+        topMargin=1.5 * cm,
+        bottomMargin=1 * cm,
+        title=title,
+    )
+
+    styles = getSampleStyleSheet()
+    if subtitle is None:
+        subtitle = f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M')}"
+    elements: List[Any] = [
+        Paragraph(title, styles["Title"]),
+        Paragraph(subtitle, styles["Normal"]),
+        Spacer(1, 0.5 * cm),
+    ]
+
+    linhas = _formatar_linhas(df, columns)
+    tem_total = any(coluna.total for coluna in columns)
+    if tem_total:
+        linhas.append(_linha_total(df, columns))
+
+    # Linhas que cabem em cada página (a primeira divide espaço com o título)
+    disponivel = doc.height - _PADDING_FRAME - ALTURA_CABECALHO
+    por_pagina = max(int(disponivel // ALTURA_LINHA), 1)
+    ocupado = sum(_altura(elemento, doc.width, doc.height) for elemento in elements)
+    primeira_pagina = max(int((disponivel - ocupado) // ALTURA_LINHA), 1)
+
+    cabecalho = [c.header if c.header is not None else c.field for c in columns]
+    larguras = [coluna.width for coluna in columns]
+    inicio = 0
+    paginas = 0
+    while inicio < len(linhas) or paginas == 0:
+        fim = inicio + (primeira_pagina if paginas == 0 else por_pagina)
+        bloco = linhas[inicio:fim]
+        ultimo = fim >= len(linhas)
+        if paginas:
+            elements.append(PageBreak())
+        elements.append(
+            _tabela(cabecalho, bloco, larguras, columns, tem_total and ultimo)
+        )
+        inicio = fim
+        paginas += 1
+
+    doc.build(elements)
+    logger.info(
+        f"PDF export '{title}': {len(df)} rows, {paginas} pages, "
+        f"{buffer.tell() / 1024:.1f} KB"
+    )
+    return buffer.getvalue()
+
+
+def _formatar_coluna(serie: pd.Series, coluna: PdfColumn) -> pd.Series:
+    """Converte a coluna inteira para o texto exibido (vazio para nulos)"""
+    if coluna.kind == "texto":
+        texto = serie.astype(object)
+        vazio = texto.isna()
+        texto = texto.where(vazio, texto.astype(str)).where(~vazio, "")
+        if coluna.max_chars:
+            texto = texto.str.slice(0, coluna.max_chars)
+        return texto
+
+    numeros = converter_para_numerico(serie, padrao=np.nan)
+    return _formatar_numeros(numeros, coluna.kind)
+
+
+def _formatar_numeros(numeros: pd.Series, tipo: str) -> pd.Series:
+    """Formata números no padrão brasileiro (1.234,56), vetorizado"""
+    casas = 0 if tipo == "inteiro" else 2
+    texto = numeros.map(f"{{:,.{casas}f}}".format, na_action="ignore")
+    texto = texto.astype(object).where(numeros.notna(), "").str.translate(_TROCA_BR)
+    if tipo == "moeda":
+        texto = texto.where(numeros.isna(), "R$ " + texto)
+    return texto
+
+
+def _formatar_linhas(df: pd.DataFrame, columns: Sequence[PdfColumn]) -> List[List[str]]:
+    """Formata todas as colunas e devolve as linhas da tabela"""
+    if df.empty:
+        return []
+    colunas = []
+    for coluna in columns:
+        if coluna.field in df.columns:
+            colunas.append(_formatar_coluna(df[coluna.field], coluna).to_numpy())
+        else:
+            colunas.append(np.full(len(df), "", dtype=object))
+    return np.column_stack(colunas).tolist()
+
+
+def _linha_total(df: pd.DataFrame, columns: Sequence[PdfColumn]) -> List[str]:
+    """Monta a linha de total"""
+    linha = []
+    for coluna in columns:
+        if coluna.total == "soma":
+            if coluna.field in df.columns:
+                soma = converter_para_numerico(df[coluna.field]).sum()
+            else:
+                soma = 0.0
+            tipo = coluna.kind if coluna.kind != "texto" else "numero"
+            linha.append(_formatar_numeros(pd.Series([soma]), tipo).iloc[0])
+        elif coluna.total:
+            quantidade = f"{len(df):,}".replace(",", ".")
+            linha.append(coluna.total.replace("{n}", quantidade))
+        else:
+            linha.append("")
+    return linha
+
+
+def _altura(elemento: Any, largura: float, altura: float) -> float:
+    """Altura ocupada por um elemento, incluindo os espaços antes e depois"""
+    _, ocupada = elemento.wrap(largura, altura)
+    return ocupada + elemento.getSpaceBefore() + elemento.getSpaceAfter()
+
+
+def _tabela(
+    cabecalho: List[str],
+    linhas: List[List[str]],
+    larguras: List[Optional[float]],
+    columns: Sequence[PdfColumn],
+    com_total: bool,
+) -> Table:
+    """Cria a tabela de uma página com o estilo padrão dos relatórios do SGR"""
+    alturas = [ALTURA_CABECALHO] + [ALTURA_LINHA] * len(linhas)
+    fim_dados = -2 if com_total else -1
+    comandos: List[Tuple[Any, ...]] = [
+        # Cabeçalho
+        ("BACKGROUND", (0, 0), (-1, 0), _COR_CABECALHO),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 9),
+        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        # Dados
+        ("FONTSIZE", (0, 1), (-1, fim_dados), 8),
+        ("ROWBACKGROUNDS", (0, 1), (-1, fim_dados), [colors.white, _COR_ZEBRA]),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("TOPPADDING", (0, 0), (-1, -1), 4),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+    ]
+    if com_total:
+        comandos += [
+            ("BACKGROUND", (0, -1), (-1, -1), _COR_TOTAL),
+            ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+            ("FONTSIZE", (0, -1), (-1, -1), 8),
+        ]
+    for indice, coluna in enumerate(columns):
+        if coluna.align == "RIGHT":
+            # Números: cabeçalho acompanha o alinhamento dos valores
+            comandos.append(("ALIGN", (indice, 0), (indice, -1), "RIGHT"))
+        elif coluna.align:
+            comandos.append(("ALIGN", (indice, 1), (indice, -1), coluna.align))
+
+    tabela = Table(
+        [cabecalho] + linhas,
+        colWidths=larguras,
+        rowHeights=alturas,
+        repeatRows=1,
+    )
+    tabela.setStyle(TableStyle(comandos))
+    return tabela
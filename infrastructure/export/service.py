@@ -0,0 +1,158 @@
+"""
+Serviço de exportação sob demanda
+Os arquivos são gerados apenas quando pedidos e os bytes ficam em um cache do
+processo, identificados pelo fingerprint dos dados e pelos filtros, até que
+os dados mudem
+"""
+
+import hashlib
+import logging
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+from config.settings import settings
+from core.jobs import Job, job_manager
+from infrastructure.database.query_cache import QueryResultCache
+
+logger = logging.getLogger(__name__)
+
+Builder = Callable[[], Optional[bytes]]
+
+
+def dataframe_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Calcula um identificador do conteúdo do DataFrame
+
+    Usa o hash vetorizado do pandas sobre todas as linhas, mais colunas e
+    dtypes: qualquer alteração nos dados gera outro fingerprint.
+
+    Args:
+        df: DataFrame
+
+    Returns:
+        str: Hash hexadecimal
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((list(df.columns), [str(t) for t in df.dtypes])).encode())
+    if not df.empty:
+        hashes = pd.util.hash_pandas_object(df, index=False)
+        digest.update(hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ExportService:
+    """
+    Gera exportações sob demanda com cache compartilhado entre sessões
+
+    A chave de cada arquivo é (nome, fingerprint dos dados, filtros); enquanto
+    os dados não mudam o mesmo arquivo é servido a todas as sessões.
+    """
+
+    def __init__(self, cache: QueryResultCache):
+        """
+        Inicializa o serviço
+
+        Args:
+            cache: Cache onde os bytes gerados são guardados
+        """
+        self._cache = cache
+
+    def get_cached(
+        self,
+        name: str,
+        df: pd.DataFrame,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Optional[bytes]:
+        """
+        Retorna o arquivo já gerado para os dados atuais, sem gerar
+
+        Args:
+            name: Nome da exportação (ex.: "pedidos_excel")
+            df: Dados exportados
+            filters: Estado de filtros/opções que altera o arquivo
+
+        Returns:
+            Optional[bytes]: Conteúdo ou None se ainda não foi gerado
+        """
+        return self._cache.peek(name, self._params(df, filters), rpa_id=None)
+
+    def get_or_build(
+        self,
+        name: str,
+        df: pd.DataFrame,
+        builder: Builder,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Optional[bytes]:
+        """
+        Retorna o arquivo cacheado ou o gera uma única vez
+
+        Sessões que pedem a mesma exportação ao mesmo tempo aguardam uma
+        única geração.
+
+        Args:
+            name: Nome da exportação
+            df: Dados exportados
+            builder: Função sem argumentos que gera os bytes
+            filters: Estado de filtros/opções que altera o arquivo
+
+        Returns:
+            Optional[bytes]: Conteúdo (None se o builder falhar)
+        """
+        return self._cache.get_or_load(
+            name, self._params(df, filters), builder, rpa_id=None
+        )
+
+    def submit(
+        self,
+        name: str,
+        df: pd.DataFrame,
+        builder: Builder,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Job:
+        """
+        Gera o arquivo em segundo plano (core.jobs)
+
+        Pedidos iguais enquanto a geração está em andamento recebem a mesma
+        tarefa; o resultado vai para o cache e também fica em Job.result().
+
+        Args:
+            name: Nome da exportação
+            df: Dados exportados
+            builder: Função sem argumentos que gera os bytes (sem Streamlit)
+            filters: Estado de filtros/opções que altera o arquivo
+
+        Returns:
+            Job: Tarefa da geração
+        """
+        params = self._params(df, filters)
+        return job_manager.submit(
+            f"export:{name}",
+            self._cache.get_or_load,
+            name,
+            params,
+            builder,
+            rpa_id=None,
+            key=("export", name, params["dados"], repr(params["filtros"])),
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas do cache de exportações"""
+        return self._cache.get_stats()
+
+    def _params(
+        self, df: pd.DataFrame, filters: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Parâmetros que identificam a exportação no cache"""
+        # Recalculado a cada chamada (hash vetorizado, milissegundos): um
+        # fingerprint memorizado não perceberia alterações no próprio objeto
+        return {"dados": dataframe_fingerprint(df), "filtros": filters or {}}
+
+
+# Instância global compartilhada por todas as sessões do processo
+export_service = ExportService(
+    QueryResultCache(
+        ttl=settings.cache.export_ttl,
+        max_bytes=settings.cache.export_max_mb * 1024 * 1024,
+    )
+)
@@ -3,15 +3,19 @@ Componentes reutilizáveis de grade de dados para SGR
 Implementa padrão Component para elementos de UI
 """
 
+import math
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, cast
+from typing import Any, Callable, Dict, List, Optional, Sequence, cast
 
 import pandas as pd
 import streamlit as st
 from st_aggrid import AgGrid, DataReturnMode, GridOptionsBuilder, GridUpdateMode
 
 from core.error_handler import handle_errors
+from presentation.components.grid_filters import GridFilterModel, apply_filter_model
+from presentation.components.grid_totals import GridTotals, grid_totals
 
 
 class SelectionMode(Enum):
@@ -426,3 +430,262 @@ class FilterableDataGrid(StandardDataGrid):
             return cast(Dict[str, Any], super().render(filtered_data, key))
 
         return cast(Dict[str, Any], super().render(data, key))
+
+
+@dataclass(frozen=True, eq=False)
+class PagedGridResult:
+    """
+    Resultado de uma grade paginada
+
+    Attributes:
+        data: Todas as linhas filtradas e ordenadas (servidor), com o índice
+            original; base para totais e exportações
+        page: Linhas enviadas ao navegador
+        filter_model: Filtros e ordenação aplicados
+        page_number: Página exibida (a partir de 1)
+        page_count: Quantidade de páginas
+        total_rows: Linhas antes dos filtros
+        source: Dados completos recebidos pela grade
+        fingerprint: Fingerprint de source (None se nenhum filtro estava
+            ativo e ele não precisou ser calculado)
+    """
+
+    data: pd.DataFrame
+    page: pd.DataFrame
+    filter_model: GridFilterModel
+    page_number: int
+    page_count: int
+    total_rows: int
+    source: pd.DataFrame
+    fingerprint: Optional[str] = None
+
+    def totals(self, sums: Sequence[str] = (), by: Optional[str] = None) -> GridTotals:
+        """
+        Totais das linhas filtradas, pelo serviço grid_totals (com cache)
+
+        Args:
+            sums: Colunas somadas
+            by: Coluna de agrupamento para totais por valor
+
+        Returns:
+            GridTotals: Contagem e somas das linhas filtradas
+        """
+        return grid_totals.get_totals(
+            self.source, self.filter_model, sums, by, fingerprint=self.fingerprint
+        )
+
+
+class PagedDataGrid(StandardDataGrid):
+    """
+    Grade paginada no servidor para conjuntos grandes
+
+    Os dados ficam no servidor: busca, filtros por coluna e ordenação são
+    aplicados com pandas e só a página visível vai para o navegador. A grade
+    não devolve dados (NO_UPDATE), então nada volta pelo websocket; totais
+    vêm de PagedGridResult.totals() e exportações usam PagedGridResult.data.
+    """
+
+    def __init__(
+        self,
+        page_size: int = 100,
+        page_sizes: Sequence[int] = (50, 100, 250, 500),
+        filter_columns: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Inicializa a grade
+
+        Args:
+            page_size: Linhas por página inicial
+            page_sizes: Opções de linhas por página
+            filter_columns: Colunas com filtro próprio (padrão: as visíveis)
+            **kwargs: Configurações de StandardDataGrid
+        """
+        defaults: Dict[str, Any] = {
+            "selection_mode": SelectionMode.DISABLED,
+            "theme": GridTheme.ALPINE,
+            "update_mode": GridUpdateMode.NO_UPDATE,
+        }
+        defaults.update(kwargs)
+        super().__init__(**defaults)
+        self.page_sizes = tuple(page_sizes)
+        self.page_size = page_size if page_size in self.page_sizes else page_sizes[0]
+        self.filter_columns = filter_columns
+
+    def render(  # type: ignore[override]
+        self,
+        data: pd.DataFrame,
+        key: str = "grid",
+        grid_options: Optional[Dict[str, Any]] = None,
+        **aggrid_kwargs: Any,
+    ) -> PagedGridResult:
+        """
+        Renderiza busca, filtros, a página atual e a navegação
+
+        Args:
+            data: Dados completos (ficam no servidor)
+            key: Prefixo das chaves dos widgets
+            grid_options: Opções AG-Grid já montadas (padrão: configure_column);
+                filtros e ordenação do navegador são desativados
+            **aggrid_kwargs: Parâmetros extras do AgGrid
+
+        Returns:
+            PagedGridResult: Dados filtrados, página e estado da navegação
+        """
+        if grid_options is None:
+            grid_options = self._build_grid_options(data.iloc[:0]).build()
+        opcoes = _opcoes_sem_filtro(grid_options)
+        rotulos = {
+            definicao["field"]: definicao.get("headerName") or definicao["field"]
+            for definicao in opcoes.get("columnDefs", [])
+            if "field" in definicao and not definicao.get("hide")
+        }
+
+        # Máscara do filtro em cache: trocar de página ou de ordenação não
+        # filtra de novo
+        modelo = self._render_filter_controls(data, key, rotulos)
+        fingerprint = mascara = None
+        if modelo.filtered:
+            fingerprint = grid_totals.fingerprint(data)
+            mascara = grid_totals.get_mask(data, modelo, fingerprint)
+        filtrado = apply_filter_model(data, modelo, mascara)
+
+        # Estado da navegação: volta à primeira página quando o filtro muda
+        chave_pagina, chave_tamanho = f"{key}_pagina", f"{key}_tamanho"
+        if st.session_state.get(chave_tamanho) not in self.page_sizes:
+            st.session_state[chave_tamanho] = self.page_size
+        tamanho = st.session_state[chave_tamanho]
+        paginas = max(math.ceil(len(filtrado) / tamanho), 1)
+        if st.session_state.get(f"{key}_modelo") != modelo:
+            st.session_state[f"{key}_modelo"] = modelo
+            st.session_state[chave_pagina] = 1
+        pagina = min(max(int(st.session_state.get(chave_pagina, 1)), 1), paginas)
+        st.session_state[chave_pagina] = pagina
+
+        inicio = (pagina - 1) * tamanho
+        pagina_df = filtrado.iloc[inicio : inicio + tamanho]
+
+        if filtrado.empty:
+            st.info("📭 Nenhum registro corresponde aos filtros")
+        AgGrid(
+            pagina_df,
+            gridOptions=opcoes,
+            data_return_mode=DataReturnMode.AS_INPUT,
+            update_mode=self.update_mode,
+            height=self.height,
+            fit_columns_on_grid_load=self.fit_columns_on_grid_load,
+            theme=self.theme.value,
+            enable_enterprise_modules=self.enable_enterprise_modules,
+            allow_unsafe_jscode=True,
+            reload_data=True,
+            key=f"{key}_grid",
+            **aggrid_kwargs,
+        )
+        self._render_pagination(
+            key, inicio, len(pagina_df), len(filtrado), len(data), pagina, paginas
+        )
+
+        return PagedGridResult(
+            data=filtrado,
+            page=pagina_df,
+            filter_model=modelo,
+            page_number=pagina,
+            page_count=paginas,
+            total_rows=len(data),
+            source=data,
+            fingerprint=fingerprint,
+        )
+
+    def _render_filter_controls(
+        self, data: pd.DataFrame, key: str, rotulos: Dict[str, str]
+    ) -> GridFilterModel:
+        """Renderiza busca, ordenação e filtros por coluna"""
+        colunas = [
+            coluna
+            for coluna in (self.filter_columns or list(rotulos))
+            if coluna in data.columns
+        ]
+
+        col_busca, col_ordem, col_sentido = st.columns([3, 2, 1])
+        with col_busca:
+            busca = st.text_input(
+                "🔍 Buscar",
+                key=f"{key}_busca",
+                placeholder="Buscar em todas as colunas",
+            )
+        with col_ordem:
+            ordem = st.selectbox(
+                "Ordenar por",
+                [None] + colunas,
+                format_func=lambda c: "—" if c is None else rotulos.get(c, c),
+                key=f"{key}_ordem",
+            )
+        with col_sentido:
+            st.write("")  # Alinha com os campos ao lado
+            decrescente = st.toggle("Decrescente", key=f"{key}_decrescente")
+
+        filtros = []
+        ativos = any(st.session_state.get(f"{key}_filtro_{c}") for c in colunas)
+        with st.expander("🔎 Filtros por coluna", expanded=ativos):
+            st.caption(
+                "Texto contido no valor; em colunas numéricas, use >, >=, <, <= "
+                "ou = (ex.: >= 100)"
+            )
+            grade = st.columns(min(len(colunas), 4) or 1)
+            for indice, coluna in enumerate(colunas):
+                with grade[indice % len(grade)]:
+                    valor = st.text_input(
+                        rotulos.get(coluna, coluna), key=f"{key}_filtro_{coluna}"
+                    )
+                if valor.strip():
+                    filtros.append((coluna, valor.strip()))
+
+        return GridFilterModel(
+            search=busca.strip(),
+            columns=tuple(filtros),
+            sort_by=ordem,
+            ascending=not decrescente,
+        )
+
+    def _render_pagination(
+        self,
+        key: str,
+        inicio: int,
+        exibidas: int,
+        filtradas: int,
+        total: int,
+        pagina: int,
+        paginas: int,
+    ) -> None:
+        """Renderiza o resumo das linhas e os controles de página"""
+        col_info, col_tamanho, col_pagina = st.columns([4, 1, 1])
+        with col_info:
+            resumo = (
+                f"Linhas {_br(inicio + 1 if exibidas else 0)}–"
+                f"{_br(inicio + exibidas)} de {_br(filtradas)}"
+            )
+            if filtradas != total:
+                resumo += f" (filtradas de {_br(total)})"
+            st.caption(f"{resumo} · página {pagina} de {_br(paginas)}")
+        with col_tamanho:
+            st.selectbox("Linhas por página", self.page_sizes, key=f"{key}_tamanho")
+        with col_pagina:
+            # Sem max_value: o limite muda com os filtros e recriaria o widget;
+            # páginas além da última são ajustadas na próxima execução
+            st.number_input("Página", min_value=1, step=1, key=f"{key}_pagina")
+
+
+def _opcoes_sem_filtro(grid_options: Dict[str, Any]) -> Dict[str, Any]:
+    """Desativa filtros e ordenação do navegador (atuariam só na página)"""
+    desativados = {"filter": False, "floatingFilter": False, "sortable": False}
+    opcoes = dict(grid_options)
+    opcoes["defaultColDef"] = {**opcoes.get("defaultColDef", {}), **desativados}
+    opcoes["columnDefs"] = [
+        {**definicao, **desativados} for definicao in opcoes.get("columnDefs", [])
+    ]
+    return opcoes
+
+
+def _br(numero: int) -> str:
+    """Inteiro com separador de milhar brasileiro"""
+    return f"{numero:,}".replace(",", ".")
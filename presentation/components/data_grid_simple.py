@@ -2,13 +2,15 @@
 Componente simples de grid de dados para vendas
 """
 
-import io
 from datetime import datetime
 from typing import Any, Dict, Optional
 
 import pandas as pd
 import streamlit as st
 
+from infrastructure.export.excel import export_excel
+from presentation.components.downloads import lazy_download_button
+
 
 class DataGrid:
     """Componente simples de grid de dados"""
@@ -68,16 +70,13 @@ class DataGrid:
 
         with col2:
             # Download Excel
-            buffer = io.BytesIO()
-            with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-                df.to_excel(writer, index=False, sheet_name="Dados")
-
-            st.download_button(
+            lazy_download_button(
                 label="📊 Download Excel",
-                data=buffer.getvalue(),
+                name="data_grid_excel",
+                df=df,
+                builder=lambda: export_excel(df, sheet_name="Dados"),
                 file_name=f"{filename_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                mime="application/vnd.ms-excel",
-                use_container_width=True,
+                key=f"{filename_prefix}_excel",
             )
 
 
@@ -108,7 +107,7 @@ class SimpleTable:
 
         # Criar resumo
         summary = (
-            df.groupby(group_by)[value_col]
+            df.groupby(group_by, observed=True)[value_col]
             .agg(["count", "sum", "mean", "min", "max"])
             .round(2)
         )
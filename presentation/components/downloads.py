@@ -0,0 +1,132 @@
+"""
+Botões de download com geração sob demanda
+O arquivo só é gerado quando o usuário pede, em segundo plano (core.jobs):
+a página continua utilizável enquanto um fragmento acompanha a geração.
+Depois disso o botão de download é servido do cache de exportações enquanto
+os dados não mudarem
+"""
+
+from typing import Any, Dict, Optional
+
+import pandas as pd
+import streamlit as st
+
+from core.jobs import JobStatus, job_manager
+from infrastructure.export.excel import MIME_XLSX
+from infrastructure.export.service import Builder, export_service
+
+# Intervalo (s) entre as consultas ao status de uma geração em andamento
+INTERVALO_ACOMPANHAMENTO = 1.0
+
+
+def lazy_download_button(
+    label: str,
+    name: str,
+    df: pd.DataFrame,
+    builder: Builder,
+    file_name: str,
+    mime: str = MIME_XLSX,
+    filters: Optional[Dict[str, Any]] = None,
+    key: Optional[str] = None,
+    help: Optional[str] = None,
+    use_container_width: bool = True,
+) -> bool:
+    """
+    Renderiza um botão que gera o arquivo apenas quando clicado
+
+    Se o arquivo dos dados atuais já estiver no cache, o botão de download é
+    exibido direto. Caso contrário, um botão "gerar" ocupa o lugar; ao ser
+    clicado, o arquivo é gerado em segundo plano (o botão mostra o andamento
+    e cancela a geração se clicado) e depois vira o botão de download.
+
+    Args:
+        label: Texto do botão
+        name: Nome da exportação no cache (ex.: "pedidos_excel")
+        df: Dados exportados (identificam o arquivo pelo fingerprint)
+        builder: Função sem argumentos que gera os bytes; roda em uma thread
+            de core.jobs, então não deve depender do Streamlit
+        file_name: Nome do arquivo baixado
+        mime: Tipo do arquivo
+        filters: Estado de filtros/opções que altera o arquivo
+        key: Chave do widget (padrão: name)
+        help: Dica do botão de download
+        use_container_width: Ocupar a largura da coluna
+
+    Returns:
+        bool: True se o download foi clicado nesta execução
+    """
+    key = key or name
+    chave_job = f"{key}_job"
+    data = export_service.get_cached(name, df, filters)
+
+    espaco = st.empty()
+    if data is None:
+        job = job_manager.get(st.session_state.get(chave_job))
+        if job is None or job.status is JobStatus.CANCELLED:
+            gerar = espaco.button(
+                label,
+                key=f"{key}_gerar",
+                help="Gerar arquivo para download",
+                use_container_width=use_container_width,
+            )
+            if not gerar:
+                return False
+            job = export_service.submit(name, df, builder, filters)
+            st.session_state[chave_job] = job.id
+
+        if job.active:
+            with espaco.container():
+                _acompanhar_geracao(job.id, label, key, use_container_width)
+            return False
+
+        data = job.result() if job.status is JobStatus.DONE else None
+        if data is None:
+            st.session_state.pop(chave_job, None)
+            espaco.button(
+                label,
+                key=f"{key}_indisponivel",
+                disabled=True,
+                help="Não foi possível gerar o arquivo",
+                use_container_width=use_container_width,
+            )
+            return False
+
+    # Arquivo entregue: a próxima mudança nos dados pede nova geração
+    st.session_state.pop(chave_job, None)
+    return espaco.download_button(
+        label=label,
+        data=data,
+        file_name=file_name,
+        mime=mime,
+        key=key,
+        help=help,
+        use_container_width=use_container_width,
+    )
+
+
+def _acompanhar_geracao(
+    job_id: str, label: str, key: str, use_container_width: bool
+) -> None:
+    """
+    Mostra a geração em andamento e consulta o status periodicamente
+
+    Roda como fragmento: apenas ele é reexecutado a cada intervalo. Quando a
+    tarefa termina, a página é reexecutada uma vez para exibir o download.
+    """
+
+    @st.fragment(run_every=INTERVALO_ACOMPANHAMENTO)
+    def acompanhar() -> None:
+        job = job_manager.get(job_id)
+        if job is None or not job.active:
+            st.rerun()
+        cancelar = st.button(
+            f"⏳ {label}",
+            key=f"{key}_gerando",
+            help=f"Gerando arquivo ({job.elapsed:.0f}s)... clique para cancelar",
+            use_container_width=use_container_width,
+        )
+        if cancelar:
+            job.cancel()
+            st.rerun()
+
+    acompanhar()
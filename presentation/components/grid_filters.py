@@ -0,0 +1,161 @@
+"""
+Filtros e ordenação das grades paginadas, aplicados no servidor
+Sem dependência do Streamlit: usado pela grade (data_grid) e pelo serviço de
+totais (grid_totals)
+"""
+
+import operator
+import re
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Filtro de coluna numérica: operador opcional e número (ex.: ">= 1.500,00")
+_FILTRO_NUMERICO = re.compile(r"^\s*(>=|<=|>|<|=)?\s*(-?[\d.,]+)\s*$")
+
+# Número sem vírgula cujos pontos separam grupos de 3 dígitos (ex.: "1.500")
+_MILHAR_SEM_DECIMAL = re.compile(r"^-?[1-9]\d{0,2}(\.\d{3})+$")
+
+_OPERADORES = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "=": operator.eq,
+}
+
+
+@dataclass(frozen=True)
+class GridFilterModel:
+    """
+    Filtros e ordenação de uma grade paginada, aplicados no servidor
+
+    Imutável e hashable: identifica o recorte dos dados exibido na grade.
+
+    Attributes:
+        search: Texto procurado em todas as colunas
+        columns: Pares (coluna, expressão); a expressão é um texto contido no
+            valor ou, em colunas numéricas, uma comparação (ex.: ">= 100")
+        sort_by: Coluna de ordenação (None mantém a ordem original)
+        ascending: Ordem crescente
+    """
+
+    search: str = ""
+    columns: Tuple[Tuple[str, str], ...] = ()
+    sort_by: Optional[str] = None
+    ascending: bool = True
+
+    @property
+    def filtered(self) -> bool:
+        """Indica se algum filtro está ativo"""
+        return bool(self.search or self.columns)
+
+
+def filter_mask(data: pd.DataFrame, model: GridFilterModel) -> np.ndarray:
+    """
+    Calcula as linhas que atendem aos filtros do modelo (vetorizado)
+
+    Args:
+        data: Dados completos da grade
+        model: Filtros aplicados
+
+    Returns:
+        np.ndarray: Máscara booleana com uma posição por linha
+    """
+    mascara = np.ones(len(data), dtype=bool)
+    for coluna, expressao in model.columns:
+        if coluna in data.columns:
+            mascara &= _mascara_coluna(data[coluna], expressao)
+
+    if model.search:
+        # Busca só nas linhas que passaram pelos filtros de coluna
+        candidatas = np.flatnonzero(mascara)
+        recorte = data.iloc[candidatas]
+        busca = np.zeros(len(candidatas), dtype=bool)
+        for coluna in recorte.columns:
+            busca |= _contem(recorte[coluna], model.search)
+        mascara[candidatas] = busca
+    return mascara
+
+
+def apply_filter_model(
+    data: pd.DataFrame, model: GridFilterModel, mask: Optional[np.ndarray] = None
+) -> pd.DataFrame:
+    """
+    Aplica filtros e ordenação do modelo, preservando o índice original
+
+    Args:
+        data: Dados completos da grade
+        model: Filtros e ordenação
+        mask: Máscara já calculada para o modelo (ex.: do cache de
+            grid_totals); se None, é calculada aqui
+
+    Returns:
+        pd.DataFrame: Linhas filtradas, na ordem pedida
+    """
+    if model.filtered:
+        resultado = data[filter_mask(data, model) if mask is None else mask]
+    else:
+        resultado = data
+    if model.sort_by in resultado.columns:
+        resultado = resultado.sort_values(
+            model.sort_by, ascending=model.ascending, kind="stable", key=_chave_ordem
+        )
+    return resultado
+
+
+def _chave_ordem(serie: pd.Series) -> pd.Series:
+    """Ordena textos sem diferenciar maiúsculas"""
+    if pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie):
+        return serie.astype(str).str.lower().where(serie.notna())
+    return serie
+
+
+def _contem(serie: pd.Series, texto: str) -> np.ndarray:
+    """Linhas cujo valor contém o texto (sem diferenciar maiúsculas)"""
+    return (
+        serie.astype(str)
+        .str.contains(texto, case=False, regex=False, na=False)
+        .to_numpy(dtype=bool)
+    )
+
+
+def _mascara_coluna(serie: pd.Series, expressao: str) -> np.ndarray:
+    """Máscara do filtro de uma coluna (comparação em colunas numéricas)"""
+    numerica = pd.api.types.is_numeric_dtype(serie) and not (
+        pd.api.types.is_bool_dtype(serie)
+    )
+    casamento = _FILTRO_NUMERICO.match(expressao) if numerica else None
+    if casamento is None:
+        return _contem(serie, expressao)
+
+    valor = _numero_filtro(casamento.group(2))
+    if valor is None:
+        return _contem(serie, expressao)
+
+    numeros = serie.to_numpy(dtype=float, na_value=np.nan)
+    with np.errstate(invalid="ignore"):
+        return _OPERADORES[casamento.group(1) or "="](numeros, valor)
+
+
+def _numero_filtro(texto: str) -> Optional[float]:
+    """
+    Converte o número digitado no filtro (formato brasileiro ou com ponto)
+
+    Com vírgula, ela é o separador decimal e os pontos são de milhar
+    ("1.500,75"). Sem vírgula, pontos seguidos de exatamente 3 dígitos são de
+    milhar ("1.500" = 1500); nos demais casos o ponto é decimal ("1.5").
+
+    Returns:
+        Optional[float]: Número, ou None se o texto não for um número válido
+    """
+    if "," in texto:
+        texto = texto.replace(".", "").replace(",", ".")
+    elif _MILHAR_SEM_DECIMAL.match(texto):
+        texto = texto.replace(".", "")
+    try:
+        return float(texto)
+    except ValueError:
+        return None
@@ -0,0 +1,226 @@
+"""
+Totais das grades calculados no servidor a partir do filtro ativo
+Somas e contagens usam máscaras vetorizadas sobre os dados de origem, em vez
+de reconstruir um DataFrame com o que a grade devolve e converter célula a
+célula. Máscaras e totais ficam em cache por (fingerprint dos dados,
+filtros): trocar de página ou de ordenação não recalcula nada
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config.settings import settings
+from infrastructure.database.query_cache import QueryResultCache
+from infrastructure.export.service import dataframe_fingerprint
+from presentation.components.grid_filters import GridFilterModel, filter_mask
+from utils.numeric import converter_para_numerico
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class GridTotals:
+    """
+    Totais das linhas que atendem aos filtros
+
+    Attributes:
+        count: Quantidade de linhas
+        sums: Soma de cada coluna pedida (nulos e inválidos contam como 0)
+        groups: Totais por valor da coluna de agrupamento (apenas valores
+            presentes nas linhas filtradas)
+    """
+
+    count: int
+    sums: Dict[str, float] = field(default_factory=dict)
+    groups: Dict[Hashable, "GridTotals"] = field(default_factory=dict)
+
+    def group(self, value: Hashable) -> "GridTotals":
+        """
+        Retorna os totais de um grupo (zerados se o valor não aparece)
+
+        Args:
+            value: Valor da coluna de agrupamento (ex.: "C" em "D/C")
+
+        Returns:
+            GridTotals: Totais do grupo
+        """
+        vazio = GridTotals(0, {coluna: 0.0 for coluna in self.sums})
+        return self.groups.get(value, vazio)
+
+
+class GridTotalsService:
+    """
+    Calcula máscaras de filtro e totais das grades com cache compartilhado
+
+    Com filtros ativos, a chave é (fingerprint dos dados, filtros); a
+    ordenação não faz parte dela. Sem filtros e sem fingerprint informado,
+    os totais são calculados direto: somar colunas inteiras custa menos que
+    calcular o fingerprint.
+
+    Os valores cacheados são compartilhados: máscaras são somente leitura e
+    os totais não devem ser alterados.
+    """
+
+    def __init__(self, cache: QueryResultCache):
+        """
+        Inicializa o serviço
+
+        Args:
+            cache: Cache onde máscaras e totais são guardados
+        """
+        self._cache = cache
+
+    def fingerprint(self, data: pd.DataFrame) -> str:
+        """
+        Identificador do conteúdo dos dados (ver dataframe_fingerprint)
+
+        Calcule uma vez por execução e repasse em get_mask/get_totals.
+        """
+        return dataframe_fingerprint(data)
+
+    def get_mask(
+        self,
+        data: pd.DataFrame,
+        model: GridFilterModel,
+        fingerprint: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Retorna as linhas que atendem aos filtros do modelo
+
+        Args:
+            data: Dados completos da grade
+            model: Filtros aplicados
+            fingerprint: Fingerprint de data, se já calculado
+
+        Returns:
+            np.ndarray: Máscara booleana somente leitura
+        """
+        if not model.filtered:
+            return np.ones(len(data), dtype=bool)
+
+        fingerprint = fingerprint or self.fingerprint(data)
+        return self._cache.get_or_load(
+            "grid_mask",
+            self._params(fingerprint, model),
+            lambda: _somente_leitura(filter_mask(data, model)),
+            rpa_id=None,
+        )
+
+    def get_totals(
+        self,
+        data: pd.DataFrame,
+        model: Optional[GridFilterModel] = None,
+        sums: Sequence[str] = (),
+        by: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+    ) -> GridTotals:
+        """
+        Calcula contagem e somas das linhas que atendem aos filtros
+
+        Args:
+            data: Dados completos da grade (não as linhas devolvidas por ela)
+            model: Filtros aplicados (None: todas as linhas)
+            sums: Colunas somadas (as ausentes em data são ignoradas)
+            by: Coluna de agrupamento para totais por valor (ex.: "D/C")
+            fingerprint: Fingerprint de data, se já calculado
+
+        Returns:
+            GridTotals: Totais das linhas filtradas
+        """
+        model = model or GridFilterModel()
+        colunas = tuple(coluna for coluna in sums if coluna in data.columns)
+        grupo = by if by in data.columns else None
+
+        if fingerprint is None and not model.filtered:
+            return _calcular_totais(data, None, colunas, grupo)
+
+        fingerprint = fingerprint or self.fingerprint(data)
+
+        def calcular() -> GridTotals:
+            mascara = self.get_mask(data, model, fingerprint)
+            return _calcular_totais(data, mascara, colunas, grupo)
+
+        params = self._params(fingerprint, model)
+        params.update({"somas": colunas, "grupo": grupo})
+        return self._cache.get_or_load("grid_totals", params, calcular, rpa_id=None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estatísticas do cache de máscaras e totais"""
+        return self._cache.get_stats()
+
+    def _params(self, fingerprint: str, model: GridFilterModel) -> Dict[str, Any]:
+        """Parâmetros que identificam o recorte no cache (sem a ordenação)"""
+        # Filtros como dict: pares (coluna, expressão) não podem ser
+        # normalizados como listas, que o cache ordena
+        return {
+            "dados": fingerprint,
+            "busca": model.search,
+            "colunas": dict(model.columns),
+        }
+
+
+def _calcular_totais(
+    data: pd.DataFrame,
+    mask: Optional[np.ndarray],
+    colunas: Sequence[str],
+    grupo: Optional[str],
+) -> GridTotals:
+    """Soma as colunas nas linhas da máscara (None: todas), vetorizado"""
+    inicio = time.perf_counter()
+    valores = {
+        coluna: converter_para_numerico(data[coluna]).to_numpy(dtype=float)
+        for coluna in colunas
+    }
+    if mask is not None:
+        valores = {coluna: serie[mask] for coluna, serie in valores.items()}
+    quantidade = len(data) if mask is None else int(np.count_nonzero(mask))
+
+    grupos: Dict[Hashable, GridTotals] = {}
+    if grupo is not None:
+        codigos, unicos = pd.factorize(data[grupo])
+        if mask is not None:
+            codigos = codigos[mask]
+        # Código -1 (nulo) não entra em nenhum grupo
+        validos = codigos >= 0
+        codigos = codigos[validos]
+        contagens = np.bincount(codigos, minlength=len(unicos))
+        somas = {
+            coluna: np.bincount(codigos, weights=serie[validos], minlength=len(unicos))
+            for coluna, serie in valores.items()
+        }
+        for posicao in np.flatnonzero(contagens):
+            grupos[unicos[posicao]] = GridTotals(
+                int(contagens[posicao]),
+                {coluna: float(somas[coluna][posicao]) for coluna in valores},
+            )
+
+    totais = GridTotals(
+        quantidade,
+        {coluna: float(serie.sum()) for coluna, serie in valores.items()},
+        grupos,
+    )
+    logger.debug(
+        f"Grid totals for {quantidade} row(s) computed in "
+        f"{time.perf_counter() - inicio:.4f}s"
+    )
+    return totais
+
+
+def _somente_leitura(mascara: np.ndarray) -> np.ndarray:
+    """Impede que a máscara compartilhada pelo cache seja alterada"""
+    mascara.flags.writeable = False
+    return mascara
+
+
+# Instância global compartilhada por todas as sessões do processo
+grid_totals = GridTotalsService(
+    QueryResultCache(
+        ttl=settings.cache.grid_ttl,
+        max_bytes=settings.cache.grid_max_mb * 1024 * 1024,
+    )
+)
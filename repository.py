@@ -1,5 +1,5 @@
 import time
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, ContextManager, Dict, List, Optional, Tuple
 
 import pandas as pd
 import psycopg2
@@ -7,7 +7,9 @@ import psycopg2.extensions
 from psycopg2 import sql
 from sqlalchemy import create_engine
 
+from config.settings import settings
 from core.logging_config import get_logger
+from infrastructure.database.pool import ConnectionPool, get_pool
 
 logger = get_logger(__name__)
 
@@ -35,29 +37,34 @@ def _conectar_com_retry(db_config: Dict[str, Any]) -> psycopg2.extensions.connec
     )
 
 
+def _pool(db_config: Dict[str, Any]) -> ConnectionPool:
+    """Pool do processo para esta configuração; o retry só ocorre ao abrir
+    conexões novas, as demais são reaproveitadas (com pre-ping)."""
+    nome = "legacy:{user}@{host}:{port}/{dbname}".format(
+        user=db_config.get("user"),
+        host=db_config.get("host"),
+        port=db_config.get("port"),
+        dbname=db_config.get("dbname"),
+    )
+    return get_pool(nome, lambda: _conectar_com_retry(db_config))
+
+
 class UserRepository:
     def __init__(self, db_config):
         self.db_config = db_config
 
     def connect(self):
-        return _conectar_com_retry(self.db_config)
+        return _pool(self.db_config).connection()
 
     def get_user(self, username):
-        conn = self.connect()
-        try:
-            cursor = conn.cursor()
+        with self.connect() as conn, conn.cursor() as cursor:
             query = sql.SQL("SELECT * FROM auth_user WHERE username = %s")
             cursor.execute(query, (username,))
             user = cursor.fetchone()
             return user
-        finally:
-            cursor.close()
-            conn.close()
 
     def get_user_permissions(self, user_id):
-        conn = self.connect()
-        try:
-            cursor = conn.cursor()
+        with self.connect() as conn, conn.cursor() as cursor:
             query = sql.SQL(
                 """
                 SELECT permission.codename
@@ -79,9 +86,6 @@ class UserRepository:
             return [
                 perm[0] for perm in permissions
             ]  # Retornar apenas os nomes das permissões
-        finally:
-            cursor.close()
-            conn.close()
 
 
 class DatabaseRepository:
@@ -96,6 +100,9 @@ class DatabaseRepository:
                 f'postgresql://{self.db_config["user"]}:{self.db_config["password"]}@'
                 f'{self.db_config["host"]}/{self.db_config["dbname"]}',
                 connect_args={"connect_timeout": CONNECT_TIMEOUT},
+                # Testa a conexão na retirada e recicla as antigas
+                pool_pre_ping=True,
+                pool_recycle=int(settings.database.pool_max_lifetime),
             )
             return engine
         except Exception as e:
@@ -118,17 +125,14 @@ class ExtratoRepository:
         self.db_config = db_config
 
     def connect(self):
-        return _conectar_com_retry(self.db_config)
+        return _pool(self.db_config).connection()
 
     def get_extratos_filtrados(
         self, data_inicial, data_final, empresas=None, centros_custo=None
     ):
-        conn = self.connect()
-        try:
+        with self.connect() as conn, conn.cursor() as cursor:
             # data_inicial += ' 00:00:00'
             # data_final += ' 23:59:59'
-
-            cursor = conn.cursor()
             query = sql.SQL(
                 """
                 SELECT b.descricao AS Banco, e.agencia, e.conta_corrente, e."data", 
@@ -159,9 +163,6 @@ class ExtratoRepository:
 
             # Retornar um DataFrame
             return pd.DataFrame(extratos, columns=colunas)
-        finally:
-            cursor.close()
-            conn.close()
 
 
 class BoletoRepository:
@@ -169,15 +170,12 @@ class BoletoRepository:
         self.db_config = db_config
 
     def connect(self):
-        return _conectar_com_retry(self.db_config)
+        return _pool(self.db_config).connection()
 
     def get_boletos_filtrados(self, data_inicial, data_final):
-        conn = self.connect()
-        try:
+        with self.connect() as conn, conn.cursor() as cursor:
             data_inicial += " 00:00:00"
             data_final += " 23:59:59"
-
-            cursor = conn.cursor()
             query = sql.SQL(
                 """
                 select "Nome", "Boleto", "Vencimento", "DataHoraEnvio" as Envio, "Status" 
@@ -196,23 +194,19 @@ class BoletoRepository:
 
             # Retornar um DataFrame
             return pd.DataFrame(extratos, columns=colunas)
-        finally:
-            cursor.close()
-            conn.close()
 
 
 class ClienteRepository:
     def __init__(self, db_config: Dict[str, Any]) -> None:
         self.db_config = db_config
 
-    def connect(self) -> psycopg2.extensions.connection:
-        """Establish database connection"""
-        return cast(psycopg2.extensions.connection, _conectar_com_retry(self.db_config))
+    def connect(self) -> ContextManager[psycopg2.extensions.connection]:
+        """Borrow a pooled database connection"""
+        return _pool(self.db_config).connection()
 
     def get_clientes(self) -> pd.DataFrame:
         """Get all client data"""
-        conn = self.connect()
-        try:
+        with self.connect() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(
                     """
@@ -226,5 +220,3 @@ class ClienteRepository:
                 clientes = cursor.fetchall()
                 colunas = [desc[0] for desc in cursor.description]
                 return pd.DataFrame(clientes, columns=colunas)
-        finally:
-            conn.close()
@@ -0,0 +1,50 @@
+"""
+Testes dos filtros das grades paginadas (presentation.components.grid_filters)
+"""
+
+import pandas as pd
+import pytest
+
+from presentation.components.grid_filters import (
+    GridFilterModel,
+    _numero_filtro,
+    apply_filter_model,
+    filter_mask,
+)
+
+
+@pytest.mark.parametrize(
+    "texto, esperado",
+    [
+        ("1.500", 1500.0),
+        ("1.500.000", 1500000.0),
+        ("-12.345", -12345.0),
+        ("1.500,75", 1500.75),
+        ("1500,5", 1500.5),
+        ("1.5", 1.5),
+        ("0.500", 0.5),
+        ("1.50", 1.5),
+        ("1500", 1500.0),
+        ("1.2.3", None),
+    ],
+)
+def test_numero_filtro(texto, esperado):
+    assert _numero_filtro(texto) == esperado
+
+
+def test_filtro_numerico_com_milhar():
+    df = pd.DataFrame({"Valor": [1.5, 999.0, 1500.0, 2000.0]})
+
+    model = GridFilterModel(columns=(("Valor", ">= 1.500"),))
+
+    assert filter_mask(df, model).tolist() == [False, False, True, True]
+
+
+def test_filtro_numerico_decimal():
+    df = pd.DataFrame({"Valor": [1.4, 1.5, 1500.0]})
+
+    igual = GridFilterModel(columns=(("Valor", "= 1,5"),))
+    menor = GridFilterModel(columns=(("Valor", "< 1.5"),))
+
+    assert filter_mask(df, igual).tolist() == [False, True, False]
+    assert apply_filter_model(df, menor)["Valor"].tolist() == [1.4]
@@ -0,0 +1,73 @@
+"""
+Compactação de DataFrames guardados por sessão e medição de memória
+Todas as sessões compartilham a RAM de um único processo (replicas: 1), então
+colunas de texto muito repetidas viram category e inteiros são reduzidos
+"""
+
+from typing import Iterable, Optional
+
+import pandas as pd
+
+# Colunas de texto com poucos valores distintos nos dados de vendas/pedidos
+COLUNAS_CATEGORICAS = (
+    "VendedorNome",
+    "SituacaoNome",
+    "Origem",
+    "NomeCanalVenda",
+    "CondicaoPagamento",
+    "NomeGrupo",
+)
+
+
+def compactar_dataframe(
+    df: pd.DataFrame,
+    colunas_categoricas: Optional[Iterable[str]] = None,
+    max_proporcao_unicos: float = 0.5,
+) -> pd.DataFrame:
+    """
+    Reduz a memória do DataFrame sem alterar os valores
+
+    Colunas de texto informadas viram category quando a proporção de valores
+    distintos é baixa; colunas inteiras são reduzidas ao menor tipo que
+    comporta os valores. Colunas float (valores monetários) são mantidas em
+    float64 para não perder precisão.
+
+    Args:
+        df: DataFrame alterado no próprio objeto
+        colunas_categoricas: Colunas candidatas a category (padrão:
+            COLUNAS_CATEGORICAS; as ausentes são ignoradas)
+        max_proporcao_unicos: Máximo de distintos / linhas para converter
+
+    Returns:
+        pd.DataFrame: O mesmo DataFrame, para encadeamento
+    """
+    if df.empty:
+        return df
+
+    if colunas_categoricas is None:
+        colunas_categoricas = COLUNAS_CATEGORICAS
+
+    for col in colunas_categoricas:
+        if col not in df.columns or df[col].dtype != object:
+            continue
+        if df[col].nunique(dropna=True) <= max_proporcao_unicos * len(df):
+            df[col] = df[col].astype("category")
+
+    for col in df.select_dtypes(include="integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+
+    return df
+
+
+def tamanho_dataframe(df: pd.DataFrame) -> int:
+    """Retorna os bytes ocupados pelo DataFrame, incluindo strings"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def formatar_bytes(tamanho: float) -> str:
+    """Formata bytes em unidade legível (ex.: 12.3 MB)"""
+    for unidade in ("B", "KB", "MB"):
+        if abs(tamanho) < 1024:
+            return f"{tamanho:.1f} {unidade}"
+        tamanho /= 1024
+    return f"{tamanho:.1f} GB"
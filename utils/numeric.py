@@ -0,0 +1,83 @@
+"""
+Conversão vetorizada de valores numéricos vindos do banco ou já formatados
+Usa operações de string do pandas e pd.to_numeric sobre os valores distintos
+em vez de limpar célula a célula com .apply
+"""
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+# Caracteres descartados antes da conversão: tuplas "('10.00',)", aspas,
+# símbolo de moeda e espaços
+_CARACTERES_REMOVIDOS = r"[()'\"\s]|R\$"
+
+
+def converter_para_numerico(serie: pd.Series, padrao: float = 0.0) -> pd.Series:
+    """
+    Converte uma série para float aceitando os formatos encontrados no sistema
+
+    Formatos suportados: números, Decimal, None/NaN, strings no formato
+    "('10.00',)", "10.00", "10,5", "R$ 1.500,00" e "1 500,00". Quando há
+    vírgula, ela é o separador decimal e os pontos são de milhar. Valores que
+    não puderem ser convertidos recebem o valor padrão.
+
+    Args:
+        serie: Série a converter
+        padrao: Valor usado para nulos e valores inválidos
+
+    Returns:
+        pd.Series: Série float64 com o mesmo índice
+    """
+    if pd.api.types.is_bool_dtype(serie) or pd.api.types.is_numeric_dtype(serie):
+        return serie.astype(float).fillna(padrao)
+
+    # Caminho rápido: números, Decimal, None e strings já no formato "10.00"
+    try:
+        return serie.astype(float).fillna(padrao)
+    except (TypeError, ValueError):
+        pass
+
+    # Colunas monetárias repetem muitos valores: limpar apenas os distintos
+    codigos, unicos = pd.factorize(serie)
+    convertidos = _converter_textos(pd.Series(unicos, dtype=object))
+    # Código -1 (nulo) aponta para o NaN acrescentado ao final
+    tabela = np.append(convertidos, np.nan)
+    return pd.Series(tabela[codigos], index=serie.index, name=serie.name).fillna(padrao)
+
+
+def _converter_textos(valores: pd.Series) -> np.ndarray:
+    """Limpa a representação em texto dos valores e converte para float"""
+    texto = (
+        valores.astype(str)
+        .str.replace(_CARACTERES_REMOVIDOS, "", regex=True)
+        .str.rstrip(",")
+    )
+    brasileiro = texto.str.contains(",", regex=False)
+    if brasileiro.any():
+        texto = texto.where(
+            ~brasileiro,
+            texto.str.replace(".", "", regex=False).str.replace(",", ".", regex=False),
+        )
+    return pd.to_numeric(texto, errors="coerce").astype(float).to_numpy()
+
+
+def converter_colunas_numericas(
+    df: pd.DataFrame, colunas: Iterable[str], padrao: float = 0.0
+) -> pd.DataFrame:
+    """
+    Converte as colunas informadas (as ausentes são ignoradas)
+
+    Args:
+        df: DataFrame alterado no próprio objeto
+        colunas: Colunas a converter
+        padrao: Valor usado para nulos e valores inválidos
+
+    Returns:
+        pd.DataFrame: O mesmo DataFrame, para encadeamento
+    """
+    for col in colunas:
+        if col in df.columns:
+            df[col] = converter_para_numerico(df[col], padrao)
+    return df